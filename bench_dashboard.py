@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+╔══════════════════════════════════════════════════════════════════╗
+║       KONAN DASHBOARD BENCH - SYNC PIPELINE BENCHMARK            ║
+╠══════════════════════════════════════════════════════════════════╣
+║  Données synthétiques (CRM, CCPRO, KONAN, bot.log, faux MT5)      ║
+║  Temps et pic mémoire: collecteurs, sérialisation, sync complète  ║
+╚══════════════════════════════════════════════════════════════════╝
+
+Usage:
+    python bench_dashboard.py --sizes 1000,10000 --output bench_report.json
+    python bench_dashboard.py --sizes 1000,10000 --baseline bench_baseline.json
+
+Chaque taille est mesurée dans un processus séparé (caches et état neufs):
+une passe de chronométrage, puis une passe mémoire sous tracemalloc.
+"""
+
+import sys
+import io
+import json
+import random
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+REPO_DIR = Path(__file__).resolve().parent
+
+# ═══════════════════════════════════════════════════════════════════
+#                         CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════
+
+BENCH_SIZES = (1_000, 10_000)
+BENCH_REPEAT = 3  # Mesures à chaud: meilleur temps sur N exécutions
+BENCH_SEED = 42
+BENCH_OUTPUT = Path("bench_report.json")
+
+# Nombre d'enregistrements par fichier, en proportion de la taille demandée
+BENCH_RATIOS = {
+    "clients": 1.0, "deals": 1.0, "rdv": 1.0, "alertes": 0.01,
+    "signals": 1.0, "subscribers": 0.1, "log_lines": 1.0, "mt5_deals": 0.1,
+}
+
+# Régression: métrique plus lente/lourde de plus de X % et d'au moins la valeur absolue indiquée
+REGRESSION_THRESHOLD = 0.25
+REGRESSION_MIN_SECONDS = 0.005
+REGRESSION_MIN_MB = 1.0
+
+CLIENT_TYPES = ("actif", "prospect", "inactif")
+DEAL_STAGES = ("qualification", "proposal", "negotiation", "closing", "won", "lost")
+SIGNAL_STATUSES = ("win", "loss", "pending", "closed", "active")
+
+# ═══════════════════════════════════════════════════════════════════
+#                         SYNTHETIC DATA
+# ═══════════════════════════════════════════════════════════════════
+
+FAKE_MT5_SOURCE = '''"""Faux module MetaTrader5 pour le benchmark (généré par bench_dashboard.py)."""
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+AccountInfo = namedtuple("AccountInfo", "balance equity")
+TradeDeal = namedtuple("TradeDeal", "ticket time profit")
+
+_rng = random.Random({seed})
+_now = datetime.now()
+DEALS = [TradeDeal(i, int((_now - timedelta(minutes=_rng.randint(0, 60 * 24 * 40))).timestamp()),
+                   round(_rng.uniform(-80, 100), 2)) for i in range(1, {count} + 1)]
+POSITIONS = tuple(range({positions}))
+
+
+def initialize():
+    return True
+
+
+def shutdown():
+    pass
+
+
+def last_error():
+    return (1, "Success")
+
+
+def account_info():
+    return AccountInfo(10000.0, 9875.5)
+
+
+def positions_get():
+    return POSITIONS
+
+
+def history_deals_get(date_from, date_to):
+    start, end = date_from.timestamp(), date_to.timestamp()
+    return tuple(d for d in DEALS if start <= d.time <= end)
+'''
+
+
+def _count(size: int, kind: str) -> int:
+    return max(1, int(size * BENCH_RATIOS[kind]))
+
+
+def _write_json(path: Path, data: Any):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def generate_dataset(root: Path, size: int, seed: int = BENCH_SEED) -> Dict[str, int]:
+    """Écrit un jeu de données synthétique sous `root`; retourne le nombre d'enregistrements par fichier."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    day = lambda back: (now - timedelta(days=back)).strftime("%Y-%m-%d")
+    counts = {kind: _count(size, kind) for kind in BENCH_RATIOS}
+
+    clients = [{
+        "id": f"cli_{i:07d}", "name": f"CLIENT {i}", "type": rng.choice(CLIENT_TYPES),
+        "sector": rng.choice(("Textile", "BTP", "IT", "Commerce", "Pharmacie")), "score": rng.randint(40, 100),
+        "dernier_contact": day(rng.randint(0, 120)) if rng.random() > 0.05 else None,
+    } for i in range(counts["clients"])]
+    _write_json(root / "crm" / "clients.json", {"clients": clients})
+
+    deals = [{
+        "id": f"deal_{i:07d}", "title": f"Dossier {i}", "client": f"cli_{rng.randrange(counts['clients']):07d}",
+        "value": rng.randint(10, 10_000) * 1000, "stage": rng.choice(DEAL_STAGES),
+    } for i in range(counts["deals"])]
+    _write_json(root / "crm" / "deals.json", {"deals": deals})
+
+    rdv = [{
+        "client": f"cli_{rng.randrange(counts['clients']):07d}", "date": day(rng.randint(-30, 365)),
+        "heure": f"{rng.randint(8, 18):02d}:00", "objet": "Suivi",
+    } for _ in range(counts["rdv"])]
+    for r in rdv[:max(1, len(rdv) // 365)]:
+        r["date"] = today
+    _write_json(root / "ccpro" / "rdv.json", {"rdv": rdv})
+
+    alertes = [{
+        "id": f"alerte_{i}", "type": "manuel", "priorite": rng.choice(("haute", "moyenne", "basse")),
+        "client": f"CLIENT {i}", "message": "Relance manuelle", "date_creation": day(rng.randint(0, 30)),
+        "traitee": rng.random() < 0.5,
+    } for i in range(counts["alertes"])]
+    _write_json(root / "ccpro" / "alertes.json", {"alertes": alertes})
+
+    months = [(now.replace(day=1) - timedelta(days=31 * k)).strftime("%Y-%m") for k in range(24)]
+    _write_json(root / "ccpro" / "objectifs.json", {m: {
+        "pnb_mensuel": {"cible": 50000, "realise": rng.randint(0, 60000), "unite": "MAD"},
+        "rdv_clients": {"cible": 20, "realise": rng.randint(0, 25), "unite": "RDV"},
+    } for m in months})
+
+    signals = []
+    for i in range(counts["signals"]):
+        status = rng.choice(SIGNAL_STATUSES)
+        signals.append({
+            "id": f"sig_{i}", "pair": rng.choice(("EURUSD", "XAUUSD", "GBPJPY")), "status": status,
+            "pnl": round(rng.uniform(-60, 90), 2) if status not in ("pending", "active") else None,
+            "published_at": (now - timedelta(minutes=counts["signals"] - i)).isoformat(timespec="seconds"),
+        })
+    _write_json(root / "konan" / "performance.json", {"signals": signals})
+
+    subscribers = [{
+        "telegram_id": str(100000 + i), "name": f"Trader {i}" if i % 3 else None, "username": f"user{i}",
+        "status": "active" if rng.random() < 0.7 else "expired", "plan": rng.choice(("monthly", "vip")),
+        "expires_at": (now + timedelta(days=rng.randint(-30, 60))).isoformat(timespec="seconds"),
+        "access_code": f"KONAN-{i:06d}",
+        "login_code": f"L{i:06d}" if i % 4 == 0 else None,
+        "login_code_expires": (now + timedelta(hours=rng.randint(-12, 24))).isoformat(timespec="seconds"),
+    } for i in range(counts["subscribers"])]
+    _write_json(root / "konan" / "subscribers.json", {"subscribers": subscribers, "stats": {"total_revenue": 1234}})
+
+    (root / "mt5").mkdir(parents=True, exist_ok=True)
+    start = now - timedelta(seconds=counts["log_lines"])
+    with open(root / "mt5" / "bot.log", "w", encoding="utf-8") as f:
+        for i in range(counts["log_lines"]):
+            stamp = (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")
+            if i % 20 == 0:
+                f.write(f"{stamp} INFO SIGNAL {rng.choice(('BUY', 'SELL'))} EURUSD @ {rng.uniform(1, 2):.5f}\n")
+            else:
+                f.write(f"{stamp} DEBUG tick EURUSD {rng.uniform(1, 2):.5f}\n")
+
+    for name in ("konan-signals", "ccpro", "crm", "wave-catcher"):
+        (root / "skills" / name).mkdir(parents=True, exist_ok=True)
+
+    fake = root / "fake_mt5" / "MetaTrader5.py"
+    fake.parent.mkdir(parents=True, exist_ok=True)
+    fake.write_text(FAKE_MT5_SOURCE.format(seed=seed, count=counts["mt5_deals"], positions=5), encoding="utf-8")
+    return counts
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         MEASUREMENT (WORKER)
+# ═══════════════════════════════════════════════════════════════════
+
+def configure(sd, root: Path):
+    """Redirige tous les chemins de sync_dashboard vers le jeu de données."""
+    dash = root / "dashboard"
+    sd.DASHBOARD_DIR = dash
+    sd.DATA_FILE = dash / "public" / "data.json"
+    sd.SECTIONS_DIR = dash / "public" / "sections"
+    sd.MANIFEST_FILE = dash / "public" / "manifest.json"
+    sd.DELTA_FILE = dash / "public" / "delta.json"
+    sd.LOGIN_INDEX_FILE = dash / "data" / "login_index.json"
+    sd.SKILLS_DIR = root / "skills"
+    sd.CCPRO_DATA = root / "ccpro"
+    sd.CRM_DATA = root / "crm"
+    sd.MT5_DATA = root / "mt5"
+    sd.KONAN_SIGNALS_DIR = root / "konan"
+    sd.STATE_DIR = root / "state"
+    sd.PUBLISH_BACKEND = "directory"
+    sd.PUBLISH_TARGET = str(root / "published")
+    sd.COLLECTOR_TIMEOUT = 600.0
+    for c in sd.COLLECTORS:
+        c.timeout = 600.0
+    (dash / "public").mkdir(parents=True, exist_ok=True)
+    sys.path.insert(0, str(root / "fake_mt5"))
+
+
+def _timed(func: Callable[[], Any], repeat: int = 1):
+    """Meilleur temps (s) sur `repeat` exécutions et résultat de la dernière."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak(func: Callable[[], Any]):
+    """Pic mémoire (Mo) pendant `func` (tracemalloc doit être actif) et résultat."""
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = func()
+    return round((tracemalloc.get_traced_memory()[1] - base) / 1e6, 3), result
+
+
+def _touch_clients(sd):
+    """Modifie un client pour mesurer une sync avec changement de source."""
+    path = sd.CRM_DATA / "clients.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["clients"][0]["score"] = (data["clients"][0].get("score") or 0) + 1
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def run_worker(root: Path, repeat: int, memory: bool, store: bool = False) -> Dict[str, Any]:
+    """Mesure une taille dans un processus neuf: collecteurs (à froid et à chaud), sérialisation, sync."""
+    sys.path.insert(0, str(REPO_DIR))
+    import sync_dashboard as sd
+    configure(sd, root)
+    if store:
+        sd.STORE_FILE = root / "state" / "bench.sqlite3"
+        sd.get_store(ready=False).import_sources()
+    measure = _peak if memory else _timed
+    if memory:
+        tracemalloc.start()
+    key = "peak_mb" if memory else "seconds"
+    report: Dict[str, Any] = {"collectors": {}, "serialize": {}, "sync": {}}
+
+    # Collecteurs, dans l'ordre des dépendances
+    results: Dict[str, Any] = {}
+    for c in sd.COLLECTORS:
+        call = lambda c=c: c.func(*(results[d] for d in c.deps))
+        cold, results[c.name] = measure(call)
+        entry = {f"cold_{key}": cold}
+        if not memory:
+            entry[f"warm_{key}"], results[c.name] = _timed(call, repeat)
+        report["collectors"][c.name] = entry
+
+    # Sérialisation: assemblage, JSON complet (+ compression), sections/manifest
+    status = {name: {"status": "ok"} for name in results}
+    all_alerts, alerts_delta = sd.get_alert_store().update(results["alerts"], results["smart_alerts"])
+    report["serialize"][f"build_{key}"], data = measure(
+        lambda: sd.build_dashboard_data(results, status, all_alerts, alerts_delta))
+    out = root / "bench_data.json"
+    report["serialize"][f"save_json_{key}"], _ = measure(lambda: sd.save_json(out, data, compress=sd.COMPRESS_OUTPUT))
+    report["serialize"][f"sections_{key}"], _ = measure(lambda: sd.write_sections(data))
+    report["serialize"]["data_json_bytes"] = out.stat().st_size
+
+    # Sync complète: première, sans changement, puis après modification d'une source
+    sd._LAST_GOOD.clear()
+    report["sync"][f"first_{key}"], _ = measure(lambda: sd.sync_dashboard(verbose=False))
+    if memory:
+        report["sync"][f"unchanged_{key}"], _ = measure(lambda: sd.sync_dashboard(verbose=False))
+    else:
+        report["sync"][f"unchanged_{key}"], _ = _timed(lambda: sd.sync_dashboard(verbose=False), repeat)
+    _touch_clients(sd)
+    report["sync"][f"changed_{key}"], _ = measure(lambda: sd.sync_dashboard(verbose=False))
+    if memory:
+        report["process_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 3)
+        tracemalloc.stop()
+    return report
+
+
+def _merge(timing: Dict[str, Any], memory: Dict[str, Any]) -> Dict[str, Any]:
+    """Fusionne récursivement les passes temps et mémoire."""
+    merged = dict(timing)
+    for k, v in memory.items():
+        merged[k] = _merge(merged.get(k, {}), v) if isinstance(v, dict) else v
+    return merged
+
+
+def run_size(size: int, workdir: Path, repeat: int, seed: int, store: bool = False,
+             verbose: bool = True) -> Dict[str, Any]:
+    """Génère le jeu de données d'une taille puis lance les passes temps et mémoire."""
+    root = workdir / f"size_{size}"
+    if root.exists():
+        shutil.rmtree(root)
+    if verbose:
+        print(f"🧪 Taille {size:,}: génération des données...")
+    start = time.perf_counter()
+    counts = generate_dataset(root / "data", size, seed)
+    generated = round(time.perf_counter() - start, 3)
+    passes = {}
+    for mode in ("timing", "memory"):
+        if verbose:
+            print(f"   ⏱️ Passe {mode}...")
+        data_root = root / mode
+        shutil.copytree(root / "data", data_root)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", str(data_root), "--repeat", str(repeat)]
+            + (["--memory"] if mode == "memory" else []) + (["--store"] if store else []),
+            capture_output=True, text=True, encoding="utf-8"
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Worker {mode} en échec (taille {size}):\n{proc.stderr}")
+        passes[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return dict(_merge(passes["timing"], passes["memory"]), records=counts, generated_in=generated)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         REPORT & COMPARISON
+# ═══════════════════════════════════════════════════════════════════
+
+def _metrics(node: Any, prefix: str = "") -> Dict[str, float]:
+    """Métriques comparables (secondes et Mo) à plat: {"10000.collectors.clients.cold_seconds": 0.12}."""
+    flat = {}
+    if isinstance(node, dict):
+        for k, v in node.items():
+            flat.update(_metrics(v, f"{prefix}.{k}" if prefix else str(k)))
+    elif isinstance(node, (int, float)) and prefix.endswith(("_seconds", "_mb")):
+        flat[prefix] = float(node)
+    return flat
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """Métriques en régression par rapport à la référence."""
+    now, ref = _metrics(current["runs"]), _metrics(baseline.get("runs", {}))
+    regressions = []
+    for name, value in sorted(now.items()):
+        old = ref.get(name)
+        if old is None:
+            continue
+        minimum = REGRESSION_MIN_SECONDS if name.endswith("_seconds") else REGRESSION_MIN_MB
+        if value > old * (1 + threshold) and value - old >= minimum:
+            regressions.append({"metric": name, "baseline": old, "current": value,
+                                "ratio": round(value / old, 2) if old else None})
+    return regressions
+
+
+def print_summary(report: Dict[str, Any]):
+    for size, run in report["runs"].items():
+        sync = run["sync"]
+        print(f"\n📊 {int(size):,} enregistrements")
+        print(f"   • Sync: première {sync['first_seconds']:.3f}s | sans changement {sync['unchanged_seconds']:.3f}s"
+              f" | après modification {sync['changed_seconds']:.3f}s | pic {run.get('process_peak_mb', 0):.1f} Mo")
+        print(f"   • Sérialisation: data.json {run['serialize']['save_json_seconds']:.3f}s"
+              f" ({run['serialize']['data_json_bytes'] / 1e6:.1f} Mo), sections {run['serialize']['sections_seconds']:.3f}s")
+        slowest = sorted(run["collectors"].items(), key=lambda kv: kv[1].get("cold_seconds", 0), reverse=True)[:5]
+        for name, m in slowest:
+            print(f"   • {name}: à froid {m.get('cold_seconds', 0):.3f}s | à chaud {m.get('warm_seconds', 0):.3f}s"
+                  f" | pic {m.get('cold_peak_mb', 0):.1f} Mo")
+
+
+def run_bench(sizes: List[int], repeat: int = BENCH_REPEAT, seed: int = BENCH_SEED, store: bool = False,
+              workdir: Optional[Path] = None, verbose: bool = True) -> Dict[str, Any]:
+    """Mesure chaque taille et retourne le rapport complet."""
+    cleanup = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="konan-bench-")) if workdir is None else workdir
+    try:
+        runs = {str(size): run_size(size, workdir, repeat, seed, store, verbose) for size in sizes}
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+    modules = {}
+    for name in ("numpy", "brotli"):
+        try:
+            __import__(name)
+            modules[name] = True
+        except ImportError:
+            modules[name] = False
+    return {
+        "version": 1,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "optional_modules": modules,
+        "repeat": repeat,
+        "seed": seed,
+        "store": store,
+        "runs": runs,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                              CLI
+# ═══════════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline de sync du dashboard")
+    parser.add_argument("--sizes", default=",".join(map(str, BENCH_SIZES)),
+                        help="Tailles (enregistrements), séparées par des virgules (ex: 1000,100000,1000000)")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="Exécutions pour les mesures à chaud")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED, help="Graine du générateur")
+    parser.add_argument("--output", "-o", type=Path, default=BENCH_OUTPUT, help="Rapport JSON")
+    parser.add_argument("--baseline", "-b", type=Path, help="Rapport de référence: code de sortie 1 en cas de régression")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Tolérance de régression (0.25 = +25 %%)")
+    parser.add_argument("--store", action="store_true", help="Mesurer avec le store SQLite (STORE_FILE)")
+    parser.add_argument("--workdir", type=Path, help="Dossier de travail conservé (sinon temporaire)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Mode silencieux")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Processus de mesure: sync_dashboard réencode stdout, le rapport part sur la dernière ligne
+        result = run_worker(args.worker, args.repeat, args.memory, args.store)
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+        sys.exit(0)
+
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    verbose = not args.quiet
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_bench(sizes, args.repeat, args.seed, args.store, args.workdir, verbose)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    if verbose:
+        print_summary(report)
+        print(f"\n✅ Rapport: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_reports(report, baseline, args.threshold)
+        report["regressions"] = regressions
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) vs {args.baseline}:")
+            for r in regressions:
+                print(f"   • {r['metric']}: {r['baseline']:.3f} -> {r['current']:.3f} (x{r['ratio']})")
+            sys.exit(1)
+        if verbose:
+            print(f"\n✅ Aucune régression vs {args.baseline} (tolérance +{args.threshold:.0%})")
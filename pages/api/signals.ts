@@ -38,7 +38,9 @@ export default function handler(
   res: NextApiResponse<SignalsResponse>
 ) {
   try {
-    const dataPath = path.join(process.cwd(), 'public', 'data.json');
+    // Section dédiée si disponible, sinon snapshot complet
+    const sectionPath = path.join(process.cwd(), 'public', 'sections', 'konan_signals.json');
+    const dataPath = fs.existsSync(sectionPath) ? sectionPath : path.join(process.cwd(), 'public', 'data.json');
     
     if (!fs.existsSync(dataPath)) {
       return res.status(500).json({ success: false, error: 'Data not available' });
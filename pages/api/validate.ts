@@ -1,15 +1,21 @@
 import type { NextApiRequest, NextApiResponse } from 'next';
+import crypto from 'crypto';
 import fs from 'fs';
 import path from 'path';
 
-interface LoginCode {
+interface IndexedCode {
   telegram_id: string;
-  code: string;
   expires: string;
   name: string;
   plan: string;
 }
 
+interface LoginIndex {
+  version: number;
+  next_expiry: string | null;
+  codes: Record<string, IndexedCode>;
+}
+
 interface ValidateResponse {
   valid: boolean;
   error?: string;
@@ -20,6 +26,23 @@ interface ValidateResponse {
   };
 }
 
+// Index chargé une fois par instance, rechargé seulement si le fichier change
+const indexPath = path.join(process.cwd(), 'data', 'login_index.json');
+let cachedIndex: LoginIndex | null = null;
+let cachedMtime = 0;
+
+function loadIndex(): LoginIndex | null {
+  if (!fs.existsSync(indexPath)) {
+    return null;
+  }
+  const mtime = fs.statSync(indexPath).mtimeMs;
+  if (!cachedIndex || mtime !== cachedMtime) {
+    cachedIndex = JSON.parse(fs.readFileSync(indexPath, 'utf-8')) as LoginIndex;
+    cachedMtime = mtime;
+  }
+  return cachedIndex;
+}
+
 export default function handler(
   req: NextApiRequest,
   res: NextApiResponse<ValidateResponse>
@@ -38,21 +61,15 @@ export default function handler(
   const normalizedCode = code.toUpperCase().trim();
 
   try {
-    // Read login codes from public data
-    const dataPath = path.join(process.cwd(), 'public', 'data.json');
-    
-    if (!fs.existsSync(dataPath)) {
+    const index = loadIndex();
+
+    if (!index) {
       return res.status(500).json({ valid: false, error: 'Data not available' });
     }
 
-    const data = JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
-    const loginCodes: LoginCode[] = data.login_codes || [];
-
-    // Find matching code
-    const match = loginCodes.find((lc) => {
-      // Check both login_code and access_code
-      return lc.code === normalizedCode;
-    });
+    // Lookup by hashed code (access_code or login_code)
+    const key = crypto.createHash('sha256').update(normalizedCode).digest('hex');
+    const match = index.codes[key];
 
     if (!match) {
       return res.status(401).json({ valid: false, error: 'Invalid code' });
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import Head from 'next/head';
 
 // ═══════════════════════════════════════════════════════════════════
@@ -20,12 +20,23 @@ interface TradingData {
   bot: {
     status: string;
     last_signal: string;
+    events?: Array<{ time: string | null; kind: string; message: string }>;
+    processes?: ProcessInfo[];
     last_check: string;
   };
   wave_catcher: {
     status: string;
     last_signal: string;
+    processes?: ProcessInfo[];
   };
+  services?: Record<string, { status: string; processes: ProcessInfo[] }>;
+}
+
+interface ProcessInfo {
+  pid: number;
+  uptime: number;
+  cpu_percent: number;
+  rss: number;
 }
 
 interface KPI {
@@ -42,6 +53,7 @@ interface Alert {
   message: string;
   date_creation: string;
   auto?: boolean;
+  first_seen?: string;
 }
 
 interface RDV {
@@ -87,6 +99,7 @@ interface Prediction {
 interface DashboardData {
   trading: TradingData;
   alerts: Alert[];
+  alerts_delta?: { new: Alert[]; changed: Alert[]; resolved: string[] };
   kpis: Record<string, KPI>;
   planning: {
     rdv_today: RDV[];
@@ -96,6 +109,7 @@ interface DashboardData {
   clients: Client[];
   deals: Deal[];
   skills: Array<{ name: string }>;
+  history?: MetricHistory;
   stats: {
     skillsCount: number;
     clientsCount: number;
@@ -109,11 +123,91 @@ interface DashboardData {
   };
 }
 
+interface HistoryRange {
+  start: number;
+  step: number;
+  values: Record<string, Array<number | null>>;
+}
+
+interface MetricHistory {
+  updated: string | null;
+  ranges: Record<string, HistoryRange>;
+}
+
+interface SectionManifest {
+  version: number;
+  generated: string;
+  sections: Record<string, { file: string; hash: string; version: number; bytes: number }>;
+}
+
+interface PatchOp {
+  op: 'add' | 'replace' | 'remove';
+  path: string;
+  value?: unknown;
+}
+
+interface LiveMessage {
+  version: number;
+  sections: Record<string, { ops?: PatchOp[]; value?: Partial<DashboardData> }>;
+}
+
 interface CryptoData {
   bitcoin: { usd: number; usd_24h_change: number };
   ethereum: { usd: number; usd_24h_change: number };
 }
 
+// ═══════════════════════════════════════════════════════════════════
+//                         LIVE FEED
+// ═══════════════════════════════════════════════════════════════════
+
+// Flux SSE de `sync_dashboard.py --serve` (ex: http://127.0.0.1:8765/events)
+const LIVE_FEED_URL = process.env.NEXT_PUBLIC_LIVE_FEED_URL;
+
+// Applique un JSON Patch (add/replace/remove) en copiant les objets traversés
+function applyPatch<T>(doc: T, ops: PatchOp[]): T {
+  let root: any = doc;
+  for (const { op, path, value } of ops) {
+    if (path === '') { root = value; continue; }
+    const keys = path.slice(1).split('/').map(k => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+    root = Array.isArray(root) ? [...root] : { ...root };
+    let node = root;
+    for (const key of keys.slice(0, -1)) {
+      node[key] = Array.isArray(node[key]) ? [...node[key]] : { ...node[key] };
+      node = node[key];
+    }
+    const last = keys[keys.length - 1];
+    if (op === 'remove') {
+      if (Array.isArray(node)) node.splice(Number(last), 1); else delete node[last];
+    } else {
+      node[last] = value;
+    }
+  }
+  return root;
+}
+
+function applyLive(prev: DashboardData | null, message: LiveMessage): DashboardData | null {
+  return Object.values(message.sections).reduce<DashboardData | null>((acc, section) => {
+    if (section.value) return { ...acc, ...section.value } as DashboardData;
+    return acc && section.ops ? applyPatch(acc, section.ops) : acc;
+  }, prev);
+}
+
+// Courbe SVG d'une série sous-échantillonnée (les trous restent vides)
+function Sparkline({ values }: { values?: Array<number | null> }) {
+  const points = (values || []).map((v, i) => [i, v] as const).filter((p): p is readonly [number, number] => p[1] !== null);
+  if (points.length < 2) return null;
+  const ys = points.map(p => p[1]);
+  const min = Math.min(...ys);
+  const span = Math.max(...ys) - min || 1;
+  const last = (values || []).length - 1 || 1;
+  const path = points.map(([i, v], k) => `${k ? 'L' : 'M'}${(i / last * 100).toFixed(1)},${(30 - (v - min) / span * 28 - 1).toFixed(1)}`).join(' ');
+  return (
+    <svg viewBox="0 0 100 30" preserveAspectRatio="none" style={{ display: 'block', width: '100%', height: 30, marginTop: 8 }}>
+      <path d={path} fill="none" stroke="#00d4ff" strokeWidth="1.5" vectorEffect="non-scaling-stroke" />
+    </svg>
+  );
+}
+
 // ═══════════════════════════════════════════════════════════════════
 //                         COMPONENT
 // ═══════════════════════════════════════════════════════════════════
@@ -125,6 +219,8 @@ export default function KonanDashboard() {
   const [crypto, setCrypto] = useState<CryptoData | null>(null);
   const [data, setData] = useState<DashboardData | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [live, setLive] = useState(false);
+  const liveRef = useRef(false);
 
   // Boot animation
   useEffect(() => {
@@ -138,13 +234,36 @@ export default function KonanDashboard() {
     return () => clearInterval(interval);
   }, []);
 
-  // Data fetch
+  // Data fetch (manifest: seules les sections modifiées sont téléchargées)
   useEffect(() => {
-    const fetchData = () => {
-      fetch('/data.json')
+    const sectionVersions: Record<string, number> = {};
+
+    const fetchSections = () =>
+      fetch('/manifest.json', { cache: 'no-store' })
         .then(r => r.json())
-        .then(d => setData(d))
-        .catch(() => {});
+        .then((manifest: SectionManifest) => Promise.all(
+          Object.entries(manifest.sections)
+            .filter(([name, section]) => sectionVersions[name] !== section.version)
+            .map(([name, section]) =>
+              fetch(`/${section.file}?v=${section.version}`)
+                .then(r => r.json())
+                .then(part => ({ name, version: section.version, part }))
+            )
+        ))
+        .then(parts => {
+          if (!parts.length) return;
+          setData(prev => Object.assign({}, prev, ...parts.map(p => p.part)));
+          parts.forEach(p => { sectionVersions[p.name] = p.version; });
+        });
+
+    const fetchData = () => {
+      // Flux live connecté: les sections arrivent déjà en temps réel
+      if (!liveRef.current) fetchSections().catch(() =>
+        fetch('/data.json')
+          .then(r => r.json())
+          .then(d => setData(d))
+          .catch(() => {})
+      );
       
       fetch('https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true')
         .then(r => r.json())
@@ -157,6 +276,22 @@ export default function KonanDashboard() {
     return () => clearInterval(interval);
   }, []);
 
+  // Flux live (optionnel): snapshot à la connexion puis deltas par section, reprise via Last-Event-ID
+  useEffect(() => {
+    if (!LIVE_FEED_URL || typeof EventSource === 'undefined') return;
+    const source = new EventSource(LIVE_FEED_URL);
+    const onMessage = (e: MessageEvent) => {
+      const message: LiveMessage = JSON.parse(e.data);
+      liveRef.current = true;
+      setLive(true);
+      setData(prev => applyLive(prev, message));
+    };
+    source.addEventListener('snapshot', onMessage as EventListener);
+    source.addEventListener('update', onMessage as EventListener);
+    source.onerror = () => { liveRef.current = false; setLive(false); };
+    return () => source.close();
+  }, []);
+
   const formatTime = () => time.toLocaleTimeString('fr-FR', { hour: '2-digit', minute: '2-digit', second: '2-digit' });
   const formatDate = () => time.toLocaleDateString('fr-FR', { weekday: 'long', day: 'numeric', month: 'long', year: 'numeric' });
 
@@ -215,6 +350,7 @@ export default function KonanDashboard() {
   const clients = data?.clients || [];
   const deals = data?.deals || [];
   const stats = data?.stats;
+  const equityHistory = data?.history?.ranges?.['24h']?.values?.['mt5.equity'];
 
   const pipelineTotal = stats?.pipelineTotal || 0;
 
@@ -496,6 +632,7 @@ export default function KonanDashboard() {
                     <div className="perf-item">
                       <span className="perf-label">Equity</span>
                       <span className="perf-value">${trading?.mt5?.equity?.toLocaleString() || '0'}</span>
+                      <Sparkline values={equityHistory} />
                     </div>
                     <div className="perf-item">
                       <span className="perf-label">P&L Jour</span>
@@ -614,7 +751,7 @@ export default function KonanDashboard() {
         <footer className="hud-bottom">
           <span className="version">KONAN v4.0 | CCPRO EDITION</span>
           <span className="last-update">Dernière sync: {stats?.lastUpdate ? new Date(stats.lastUpdate).toLocaleTimeString('fr-FR') : 'N/A'}</span>
-          <span className="refresh-info">Auto-refresh: 30s</span>
+          <span className="refresh-info">{live ? 'Live' : 'Auto-refresh: 30s'}</span>
         </footer>
       </div>
 
@@ -12,12 +12,51 @@
 import sys
 import io
 import os
+import re
 import json
+import gzip
+import hashlib
+import codecs
+import hmac
+import mmap
+import tempfile
+import threading
+import struct
 import subprocess
 import argparse
-from datetime import datetime, timedelta
+import asyncio
+import atexit
+import cProfile
+import pstats
+import tracemalloc
+import fnmatch
+import heapq
+import operator
+import time
+import urllib.parse
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple, NamedTuple
+
+try:
+    import brotli  # Optionnel: copies .br précompressées
+except ImportError:
+    brotli = None
+
+try:
+    import numpy as np  # Optionnel: évaluation vectorisée des règles d'alertes
+except ImportError:
+    np = None
+
+try:
+    import sqlite3  # Optionnel: store local indexé (STORE_FILE)
+except ImportError:
+    sqlite3 = None
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
@@ -32,27 +71,2099 @@ SKILLS_DIR = Path(r"D:\clawdbot\moltbot\skills")
 CCPRO_DATA = Path.home() / ".openclaw" / "ccpro"
 CRM_DATA = Path.home() / ".openclaw" / "crm"
 MT5_DATA = Path.home() / ".openclaw" / "mt5"
+KONAN_SIGNALS_DIR = Path(r"C:\Users\solan\clawd\skills\konan-signals")
+STATE_DIR = Path.home() / ".openclaw" / "dashboard"  # Caches et état local de la sync
+
+# Index des codes de connexion (hors de public/: lu uniquement par /api/validate)
+LOGIN_INDEX_FILE = DASHBOARD_DIR / "data" / "login_index.json"
+
+# KONAN Signals: signaux récents affichés et statuts considérés comme non clôturés
+KONAN_RECENT_SIGNALS = 10
+KONAN_OPEN_STATUSES = {None, "", "pending", "active", "open", "published", "running"}
+
+# Règles d'alertes automatiques: évaluées en lot sur la vue colonnaire clients/deals/MT5.
+# Conditions (colonne, opérateur, valeur); la première priorité dont les conditions
+# sont remplies s'applique; les SMART_ALERTS_LIMIT alertes les plus prioritaires sont gardées.
+# "precedence" (0 d'abord, 1 par défaut) départage les règles avant la priorité: un incident
+# passe devant n'importe quel nombre d'alertes client.
+ALERT_RULES = [
+    {
+        "table": "clients", "type": "relance", "id": "auto_client_{id}",
+        "when": [("days_since_contact", ">", 14)],
+        "priority": [("haute", [("days_since_contact", ">", 21)]), ("moyenne", [])],
+        "order": "days_since_contact",
+        "client": "{name}", "message": "Pas de contact depuis {days_since_contact:.0f} jours",
+    },
+    {
+        "table": "deals", "type": "opportunite", "id": "auto_deal_{id}",
+        "when": [("stage", "in", ("proposal", "negotiation"))],
+        "priority": [("moyenne", [])],
+        "order": "value",
+        "client": "{client}", "message": "Deal '{title!s:.30}' en attente",
+    },
+    {
+        "table": "mt5", "type": "incident", "id": "auto_mt5_loss", "precedence": 0,
+        "when": [("profit_today", "<", -100)],
+        "priority": [("haute", [])],
+        "client": "MT5 Trading", "message": "Perte importante: {profit_today:.2f}$",
+    },
+]
+ALERT_PRIORITIES = ("haute", "moyenne", "basse")
+SMART_ALERTS_LIMIT = 10
+
+# Cycle de vie des alertes: conservation des alertes résolues (jours) et report dans alertes.json
+ALERT_RESOLVED_TTL_DAYS = 7
+ALERTS_WRITE_BACK = True
+# Collecteurs qui doivent être ok (ou en cache) pour résoudre les alertes disparues
+ALERT_RESOLVE_REQUIRES = ("alerts", "smart_alerts", "clients", "deals", "crm_frame", "mt5")
+
+# Sorties par section pour le frontend (public/sections/*.json + manifest + delta)
+SECTIONS_DIR = DASHBOARD_DIR / "public" / "sections"
+MANIFEST_FILE = DASHBOARD_DIR / "public" / "manifest.json"
+DELTA_FILE = DASHBOARD_DIR / "public" / "delta.json"
+DASHBOARD_SECTIONS = {
+    "trading": ("trading",),
+    "konan_signals": ("konan_signals",),
+    "crm": ("clients", "deals"),
+    "alerts": ("alerts",),
+    "alerts_delta": ("alerts_delta",),
+    "kpis": ("kpis",),
+    "planning": ("planning",),
+    "predictions": ("predictions",),
+    "skills": ("skills",),
+    "history": ("history",),
+    "stats": ("stats",),
+    "meta": ("meta",),
+}
+
+# Écriture des sorties: JSON compact (indenté en debug) et copies .gz/.br
+PRETTY_JSON = False
+COMPRESS_OUTPUT = True
+# Champs ignorés pour décider si une sync a changé quelque chose
+VOLATILE_KEYS = {"lastUpdate", "last_update", "last_check", "generated", "uptime", "cpu_percent", "rss"}
+# Sections réécrites quand une autre section change, sans déclencher à elles seules de nouvelle version
+PASSIVE_SECTIONS = {"alerts_delta", "meta"}
+
+# Publication (--push): backend git | directory | http | object_store, intervalle minimal et reprises
+PUBLISH_BACKEND = "git"
+PUBLISH_TARGET = ""  # Dossier, URL ou racine du store selon le backend
+PUBLISH_MIN_INTERVAL = 300.0
+PUBLISH_RETRIES = 3
+PUBLISH_BACKOFF = 2.0
+# Backend git: committer aussi les copies .gz/.br et delta.json (seulement si la cible les sert)
+PUBLISH_GIT_EXTRAS = False
+
+# Budget temps par défaut d'un collecteur (secondes)
+COLLECTOR_TIMEOUT = 10.0
+
+# Export des mesures par collecteur: fichier texte Prometheus et trace JSON-lines (None = désactivé)
+METRICS_FILE: Optional[Path] = None  # ex: STATE_DIR / "konan_dashboard.prom" (textfile collector)
+TRACE_FILE: Optional[Path] = None  # ex: STATE_DIR / "sync_trace.jsonl"
+TRACE_MAX_BYTES = 16 * 1024 * 1024  # Rotation en .1 au-delà
+PROFILE_TOP = 25  # Lignes affichées par --profile
+
+# Flux live (--serve): serveur SSE local, tampon de reprise et rafraîchissement rapide de MT5
+LIVE_HOST = "127.0.0.1"  # "0.0.0.0" pour le réseau local
+LIVE_PORT = 8765
+# Origines (pages web) autorisées à lire le flux; "*" ouvre les données CRM à toute page du navigateur
+LIVE_ALLOW_ORIGINS = {"http://localhost:3000", "http://127.0.0.1:3000"}
+LIVE_TOKEN = ""  # Si non vide, /events et /snapshot exigent ?token=<LIVE_TOKEN>
+LIVE_REPLAY_EVENTS = 256
+LIVE_REPLAY_BYTES = 8 * 1024 * 1024
+LIVE_MAX_OPS = 500  # Au-delà, la section est envoyée en entier plutôt qu'en JSON Patch
+LIVE_KEEPALIVE = 15.0
+LIVE_CLIENT_TIMEOUT = 30.0  # Client abandonné si un envoi reste bloqué plus longtemps
+LIVE_FAST_COLLECTORS = {"mt5"}
+LIVE_FAST_INTERVAL = 1.0
+
+# Mode --watch: scrutation des sources, anti-rebond et rafraîchissement live (secondes)
+WATCH_POLL_INTERVAL = 0.25
+WATCH_DEBOUNCE = 0.3
+WATCH_MAX_DELAY = 2.0
+WATCH_LIVE_INTERVAL = 60.0
+
+# Cache des fichiers JSON parsés (LRU) et persistance entre deux exécutions
+PARSE_CACHE_MAX_ENTRIES = 64
+PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARSE_CACHE_HASH_CONTENT = True
+PARSE_CACHE_PERSIST = True
+
+# Store SQLite local (CRM, CCPRO, signaux) interrogé par requêtes indexées; None = fichiers JSON seuls
+STORE_FILE: Optional[Path] = None  # ex: STATE_DIR / "dashboard.sqlite3"
+
+# Lecture de bot.log par la fin: taille de bloc, limite de relecture et événements conservés
+LOG_BLOCK_SIZE = 64 * 1024
+LOG_MAX_BACKSCAN = 8 * 1024 * 1024
+BOT_LOG_EVENTS = 20
+
+# Processus python surveillés: motifs (style -like PowerShell) sur la ligne de commande
+PROCESS_PATTERNS = {"bot": ["*mt5*", "*bot*"], "wave_catcher": ["*wave*"]}
+EXTRA_SERVICES: Dict[str, List[str]] = {}  # ex: {"telegram": ["*konan-signals*"]}
+PROCESS_SNAPSHOT_TTL = 2.0
+
+# Historique des métriques MT5/KPI: écart minimal entre deux points (s), rétention par niveau (s),
+# plages publiées dans la section `history` (niveau source, durée) et points par plage
+HISTORY_MIN_INTERVAL = 55.0
+HISTORY_RETENTION = {"1m": 2 * 86400, "1h": 90 * 86400, "1d": 5 * 365 * 86400}
+HISTORY_RANGES = {"24h": ("1m", 86400), "30d": ("1h", 30 * 86400), "1y": ("1d", 365 * 86400)}
+HISTORY_POINTS = 96
+HISTORY_MT5_FIELDS = ("balance", "equity", "drawdown", "profit_today", "winrate", "open_positions")
+
+# Historique local des deals MT5: recouvrement (s) lors de la récupération incrémentale
+MT5_LEDGER_OVERLAP = 300
+
+# Session MT5 persistante: durée de vie du cache des requêtes et délai de reconnexion (s, doublé à chaque échec)
+MT5_CACHE_TTL = 2.0
+MT5_RECONNECT_BACKOFF = 1.0
+MT5_RECONNECT_MAX_DELAY = 60.0
+
+# ═══════════════════════════════════════════════════════════════════
+#                         INSTRUMENTATION
+# ═══════════════════════════════════════════════════════════════════
+
+_PROBE = threading.local()
+
+
+class CollectorProbe:
+    """Mesures d'une exécution de collecteur, alimentées par les helpers de lecture du thread."""
+
+    __slots__ = ("cpu", "bytes_read", "cache_hits", "cache_misses", "mtimes", "errors")
+
+    def __init__(self):
+        self.cpu = 0.0
+        self.bytes_read = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.mtimes: Dict[str, float] = {}
+        self.errors: List[Tuple[str, str]] = []
+
+    def to_dict(self, sources: List[Path] = ()) -> Dict[str, Any]:
+        """Champs publiés dans meta.collectors (dernière modification des sources lues ou surveillées)."""
+        mtimes = list(self.mtimes.values())
+        for path in sources:
+            try:
+                mtimes.append(path.stat().st_mtime)
+            except OSError:
+                pass
+        out = {
+            "cpu": round(self.cpu, 4), "bytes_read": self.bytes_read,
+            "cache_hits": self.cache_hits, "cache_misses": self.cache_misses,
+            "source_mtime": datetime.fromtimestamp(max(mtimes)).isoformat(timespec="seconds") if mtimes else None,
+        }
+        if self.errors:
+            out["exception"], out["error"] = self.errors[0]
+            if len(self.errors) > 1:
+                out["errors"] = len(self.errors)
+        return out
+
+
+def current_probe() -> Optional[CollectorProbe]:
+    """Sonde du collecteur en cours dans ce thread (None hors collecteur)."""
+    return getattr(_PROBE, "current", None)
+
+
+def record_read(path: Path, nbytes: int = 0, cached: Optional[bool] = None, mtime: Optional[float] = None):
+    """Comptabilise une lecture (octets, succès/échec de cache, date du fichier) pour le collecteur courant."""
+    probe = current_probe()
+    if probe is None:
+        return
+    probe.bytes_read += nbytes
+    if cached is True:
+        probe.cache_hits += 1
+    elif cached is False:
+        probe.cache_misses += 1
+    if mtime is not None:
+        probe.mtimes[str(path)] = mtime
+
+
+def record_error(error: BaseException):
+    """Enregistre une erreur absorbée par le collecteur courant (statut `degraded`)."""
+    probe = current_probe()
+    if probe is not None:
+        probe.errors.append((type(error).__name__, f"{type(error).__name__}: {error}"[:300]))
+
+
+# Profils cProfile des threads collecteurs (None hors --profile)
+_PROFILES: Optional[List[cProfile.Profile]] = None
+
+
+def run_probed(probe: CollectorProbe, func: Callable[..., Any], *args) -> Any:
+    """Exécute `func` avec `probe` comme sonde du thread (temps CPU, profil en mode --profile)."""
+    _PROBE.current = probe
+    profiler = cProfile.Profile() if _PROFILES is not None else None
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+: un seul profileur actif, celui du thread principal couvre déjà les threads
+            profiler = None
+    cpu = time.thread_time()
+    try:
+        return func(*args)
+    finally:
+        probe.cpu = time.thread_time() - cpu
+        _PROBE.current = None
+        if profiler is not None:
+            profiler.disable()
+            _PROFILES.append(profiler)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         HELPER FUNCTIONS
+# ═══════════════════════════════════════════════════════════════════
+
+# Records restaurables depuis le cache persisté, par nom de classe (remplis par _Record)
+_RECORD_TYPES: Dict[str, type] = {}
+
+
+def _cache_default(value: Any) -> Any:
+    """Encodeur JSON du cache persisté: records, dates et tuples sous forme étiquetée."""
+    if _RECORD_TYPES.get(type(value).__name__) is type(value):
+        return {"__r": type(value).__name__, "f": [_cache_tuple(v) for v in value.__reduce__()[1]]}
+    if isinstance(value, datetime):
+        return {"__t": value.isoformat()}
+    if isinstance(value, date):
+        return {"__d": value.isoformat()}
+    raise TypeError(f"Type non persistable: {type(value).__name__}")
+
+
+def _cache_tuple(value: Any) -> Any:
+    return {"__u": list(value)} if isinstance(value, tuple) else value
+
+
+def _cache_hook(obj: Dict[str, Any]) -> Any:
+    """Décodeur du cache persisté: seuls les types de _RECORD_TYPES sont reconstruits (ValueError sinon)."""
+    if len(obj) == 1:
+        if "__u" in obj:
+            return tuple(obj["__u"])
+        if "__d" in obj:
+            return date.fromisoformat(obj["__d"])
+        if "__t" in obj:
+            return datetime.fromisoformat(obj["__t"])
+    elif len(obj) == 2 and "__r" in obj and "f" in obj:
+        cls = _RECORD_TYPES.get(obj["__r"])
+        if cls is None or not isinstance(obj["f"], list):
+            raise ValueError(f"Record inconnu dans le cache: {obj['__r']!r}")
+        return cls(*obj["f"])
+    return obj
+
+
+class FileCache:
+    """Cache LRU d'objets parsés, indexé par (chemin, mtime_ns, taille).
+
+    Si la signature change mais que `hash_content` est actif, le contenu est
+    comparé par empreinte SHA-1 avant de re-parser. Les objets retournés sont
+    partagés entre appelants: ne jamais les modifier en place. La persistance
+    est un dossier JSON (un fichier par entrée, seules les entrées modifiées
+    sont réécrites); aucun code n'est exécuté au chargement.
+    """
+
+    def __init__(self, max_entries: int = PARSE_CACHE_MAX_ENTRIES, max_bytes: int = PARSE_CACHE_MAX_BYTES,
+                 hash_content: bool = PARSE_CACHE_HASH_CONTENT):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self._entries: "OrderedDict[str, Tuple[int, int, Optional[str], Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._dirty: set = set()
+        self._evicted: set = set()
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filepath: Path, parser: Callable[[str], Any] = json.loads) -> Any:
+        """Retourne le contenu parsé de `filepath` (lève OSError / ValueError).
+
+        Chaque parser a sa propre entrée: un même fichier peut être lu en JSON
+        brut et en records typés.
+        """
+        key = str(filepath) if parser is json.loads else f"{filepath}#{parser.__name__}"
+        st = filepath.stat()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_read(filepath, 0, True, st.st_mtime)
+                return entry[3]
+        raw = filepath.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest() if self.hash_content else None
+        if entry and digest is not None and entry[2] == digest:
+            value = entry[3]
+            self.hits += 1
+            record_read(filepath, len(raw), True, st.st_mtime)
+        else:
+            record_read(filepath, len(raw), False, st.st_mtime)
+            value = parser(raw.decode("utf-8"))
+            self.misses += 1
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+            self._entries[key] = (st.st_mtime_ns, len(raw), digest, value)
+            self._bytes += len(raw)
+            self._dirty.add(key)
+            self._evicted.discard(key)
+            self._evict()
+        return value
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, old = self._entries.popitem(last=False)
+            self._bytes -= old[1]
+            self._dirty.discard(key)
+            self._evicted.add(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs du cache."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+    @staticmethod
+    def _entry_file(directory: Path, key: str) -> Path:
+        return directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, directory: Path):
+        """Recharge un cache persisté (démarrage à chaud); les entrées illisibles ou mal formées sont ignorées."""
+        self.loaded = True
+        entries = []
+        for path in sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime_ns):
+            try:
+                doc = json.loads(path.read_bytes().decode("utf-8"), object_hook=_cache_hook)
+                key, mtime_ns, size, digest = doc["key"], doc["mtime_ns"], doc["size"], doc["digest"]
+                if not (isinstance(key, str) and isinstance(mtime_ns, int) and isinstance(size, int)
+                        and (digest is None or isinstance(digest, str))):
+                    continue
+                entries.append((key, (mtime_ns, size, digest, doc["value"])))
+            except (OSError, ValueError, TypeError, KeyError):
+                continue
+        with self._lock:
+            for key, entry in entries:
+                if key not in self._entries:
+                    self._entries[key] = entry
+                    self._bytes += entry[1]
+            self._evict()
+            self._evicted.clear()
+
+    def save(self, directory: Path):
+        """Persiste les entrées modifiées depuis le dernier appel et retire les entrées évincées."""
+        with self._lock:
+            dirty = [(key, self._entries[key]) for key in self._dirty if key in self._entries]
+            evicted = list(self._evicted)
+            self._dirty.clear()
+            self._evicted.clear()
+        if not dirty and not evicted:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        for key, (mtime_ns, size, digest, value) in dirty:
+            doc = {"key": key, "mtime_ns": mtime_ns, "size": size, "digest": digest, "value": _cache_tuple(value)}
+            raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":"), default=_cache_default)
+            write_bytes_atomic(self._entry_file(directory, key), raw.encode("utf-8"))
+        for key in evicted:
+            try:
+                self._entry_file(directory, key).unlink()
+            except FileNotFoundError:
+                pass
+
+
+PARSE_CACHE = FileCache()
+
+
+def load_json(filepath: Path, default=None, cache: bool = True, parser: Callable[[str], Any] = json.loads):
+    """Charge un fichier JSON de manière sécurisée (via le cache partagé)."""
+    if default is None:
+        default = {}
+    try:
+        if filepath.exists():
+            if cache:
+                return PARSE_CACHE.get(filepath, parser)
+            raw = filepath.read_bytes()
+            record_read(filepath, len(raw), None, filepath.stat().st_mtime)
+            return parser(raw.decode("utf-8"))
+    except Exception as e:
+        record_error(e)
+    return default
+
+
+def _file_sha256(filepath: Path) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _replace_file(tmp_name: str, filepath: Path):
+    """Substitue le fichier temporaire à la cible en conservant ses permissions."""
+    os.chmod(tmp_name, filepath.stat().st_mode & 0o777 if filepath.exists() else 0o644)
+    os.replace(tmp_name, filepath)
+
+
+def write_bytes_atomic(filepath: Path, raw: bytes):
+    """Écrit des octets via un fichier temporaire synchronisé puis os.replace."""
+    fd, tmp_name = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace_file(tmp_name, filepath)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def _write_compressed(filepath: Path, raw: bytes):
+    """Produit les copies précompressées .gz (et .br si brotli est disponible)."""
+    write_bytes_atomic(filepath.with_name(filepath.name + ".gz"), gzip.compress(raw, compresslevel=6, mtime=0))
+    if brotli is not None:
+        write_bytes_atomic(filepath.with_name(filepath.name + ".br"), brotli.compress(raw))
+
+
+# Empreinte des fichiers écrits par save_json: (mtime_ns, taille, sha256), pour éviter de relire la cible
+_SAVED_DIGESTS: Dict[Path, Tuple[int, int, str]] = {}
+
+
+def save_json(filepath: Path, data: Any, pretty: Optional[bool] = None, compress: bool = False) -> bool:
+    """Sauvegarde un fichier JSON de façon atomique.
+
+    Le JSON compact est encodé et haché avant toute écriture: si le contenu
+    est identique à l'existant, rien n'est écrit et la fonction retourne
+    False (la cible n'est relue que si elle n'a pas été écrite par ce
+    processus). Sinon il est écrit dans un fichier temporaire, synchronisé
+    (fsync) puis substitué par os.replace: un lecteur ne voit jamais de
+    fichier tronqué.
+    """
+    if pretty is None:
+        pretty = PRETTY_JSON
+    raw = json.dumps(data, ensure_ascii=False, indent=2 if pretty else None,
+                     separators=None if pretty else (",", ":")).encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        st = None
+    unchanged = False
+    if st is not None and st.st_size == len(raw):
+        known = _SAVED_DIGESTS.get(filepath)
+        if known and known[:2] == (st.st_mtime_ns, st.st_size):
+            unchanged = known[2] == digest
+        else:
+            unchanged = _file_sha256(filepath) == digest
+    if not unchanged:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(filepath, raw)
+        st = filepath.stat()
+    _SAVED_DIGESTS[filepath] = (st.st_mtime_ns, st.st_size, digest)
+    if compress and (not unchanged or not filepath.with_name(filepath.name + ".gz").exists()):
+        _write_compressed(filepath, raw)
+    return not unchanged
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         TYPED RECORDS
+# ═══════════════════════════════════════════════════════════════════
+
+# Tuples de clés annexes partagés entre records de même forme
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_FIELD_GETTERS: Dict[type, Callable[[Any], Tuple]] = {}
+# Dernier encodage de chaque liste de records (listes partagées par PARSE_CACHE)
+_ENCODED: Dict[int, Tuple[List[Any], List[Dict[str, Any]]]] = {}
+
+
+def _intern(value: Any) -> Any:
+    """Interne les énumérations (type, stage, status) pour des comparaisons par identité."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=8192)
+def _parse_day(value: str) -> Optional[date]:
+    """Date YYYY-MM-DD (objets partagés entre records), None si invalide."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _parse_datetime(value: Any) -> datetime:
+    """Date ISO en heure locale naïve; datetime.min si absente ou invalide (donc expirée)."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.min
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _extra(data: Dict[str, Any], known: Tuple[str, ...], raw: Tuple[str, ...] = ()) -> Tuple[Tuple[str, ...], Tuple]:
+    """Champs annexes (clés partagées, valeurs) restitués tels quels à l'encodage.
+
+    Ce sont les champs non modélisés, les `null` explicites et les champs `raw`
+    dont la valeur typée ne reproduit pas le JSON d'origine.
+    """
+    keys = tuple(k for k, v in data.items() if v is None or k not in known or k in raw)
+    if not keys:
+        return (), ()
+    keys = _SHAPES.setdefault(keys, keys)
+    return keys, tuple(data[k] for k in keys)
+
+
+def _field_getter(cls) -> Callable[[Any], Tuple]:
+    """Extracteur du tuple des champs d'un record (ordre du constructeur)."""
+    getter = _FIELD_GETTERS.get(cls)
+    if getter is None:
+        getter = _FIELD_GETTERS[cls] = operator.attrgetter(*cls.__slots__)
+    return getter
+
+
+class _Record:
+    """Base des records: tuple compact des champs (copie, cache persisté)."""
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # dataclass(slots=True) recrée la classe: la dernière inscrite est la bonne
+        _RECORD_TYPES[cls.__name__] = cls
+
+    def __reduce__(self):
+        return type(self), _field_getter(type(self))(self)
+
+    def _encode(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        out = {}
+        for name in names:
+            value = getattr(self, name)
+            if value is not None:
+                out[name] = value
+        if self.extra_keys:
+            out.update(zip(self.extra_keys, self.extra_values))
+        return out
+
+
+@dataclass(slots=True)
+class Client(_Record):
+    """Client CRM (clients.json)."""
+    id: Any
+    name: Optional[str]
+    type: Optional[str]
+    last_contact: Optional[date]  # dernier_contact
+    extra_keys: Tuple[str, ...] = ()
+    extra_values: Tuple = ()
+
+    FIELDS = ("id", "name", "type", "dernier_contact")
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Client":
+        contact = d.get("dernier_contact")
+        day = _parse_day(contact) if isinstance(contact, str) else None
+        exact = day is None and contact is None or day is not None and day.isoformat() == contact
+        return cls(d.get("id"), d.get("name"), _intern(d.get("type")), day,
+                   *_extra(d, cls.FIELDS, () if exact else ("dernier_contact",)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = self._encode(("id", "name", "type"))
+        if self.last_contact is not None and "dernier_contact" not in out:
+            out["dernier_contact"] = self.last_contact.isoformat()
+        return out
+
+
+@dataclass(slots=True)
+class Deal(_Record):
+    """Deal du pipeline CRM (deals.json)."""
+    id: Any
+    title: Optional[str]
+    client: Any
+    value: Optional[float]
+    stage: Optional[str]
+    extra_keys: Tuple[str, ...] = ()
+    extra_values: Tuple = ()
+
+    FIELDS = ("id", "title", "client", "value", "stage")
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Deal":
+        raw = d.get("value")
+        return cls(d.get("id"), d.get("title"), d.get("client"), _to_number(raw), _intern(d.get("stage")),
+                   *_extra(d, cls.FIELDS, () if isinstance(raw, (int, float)) else ("value",)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._encode(self.FIELDS)
+
+
+@dataclass(slots=True)
+class Signal(_Record):
+    """Signal KONAN (performance.json)."""
+    id: Any
+    status: Optional[str]
+    pnl: Optional[float]
+    published_at: Optional[str]
+    extra_keys: Tuple[str, ...] = ()
+    extra_values: Tuple = ()
+
+    FIELDS = ("id", "status", "pnl", "published_at")
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Signal":
+        raw = d.get("pnl")
+        return cls(d.get("id"), _intern(d.get("status")), _to_number(raw), d.get("published_at"),
+                   *_extra(d, cls.FIELDS, () if isinstance(raw, (int, float)) else ("pnl",)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._encode(self.FIELDS)
+
+
+@dataclass(slots=True)
+class Subscriber(_Record):
+    """Abonné KONAN (subscribers.json), dates d'expiration parsées au chargement."""
+    telegram_id: Any
+    name: Optional[str]
+    username: Optional[str]
+    status: Optional[str]
+    plan: str
+    expires_at: Optional[str]
+    expires: datetime
+    access_code: Optional[str]
+    login_code: Optional[str]
+    login_code_expires: Optional[str]
+    login_expires: datetime
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Subscriber":
+        return cls(d.get("telegram_id"), d.get("name"), d.get("username"), _intern(d.get("status")),
+                   _intern(d.get("plan") or "monthly"), d.get("expires_at"), _parse_datetime(d.get("expires_at")),
+                   d.get("access_code"), d.get("login_code"), d.get("login_code_expires"),
+                   _parse_datetime(d.get("login_code_expires")))
+
+    @property
+    def display_name(self) -> str:
+        return self.name or self.username or "Trader"
+
+
+class MT5Deal(NamedTuple):
+    """Deal MT5 de l'historique local (tuple compact: horodatage, profit)."""
+    time: int
+    profit: float
+
+
+class RecordList(list):
+    """Liste de records d'un même type, picklée en lignes (tuples) pour le cache persisté."""
+
+    def __init__(self, cls, items=()):
+        super().__init__(items)
+        self.cls = cls
+
+    def __reduce__(self):
+        getter = _field_getter(self.cls)
+        return _rebuild_records, (self.cls, [getter(r) for r in self])
+
+
+def _rebuild_records(cls, rows: List[Tuple]) -> RecordList:
+    return RecordList(cls, [cls(*row) for row in rows])
+
+
+def decode_records(cls, items: Any) -> RecordList:
+    """Liste de records `cls` depuis une liste JSON (entrées non-objet ignorées)."""
+    if not isinstance(items, list):
+        return RecordList(cls)
+    return RecordList(cls, [cls.from_dict(item) for item in items if isinstance(item, dict)])
+
+
+def encode_records(records: List[Any]) -> List[Dict[str, Any]]:
+    """Encodage au schéma data.json, réutilisé tant que la liste de records est la même."""
+    cached = _ENCODED.get(id(records))
+    if cached and cached[0] is records:
+        return cached[1]
+    encoded = [r.to_dict() for r in records]
+    if len(_ENCODED) >= 8:
+        _ENCODED.clear()
+    _ENCODED[id(records)] = (records, encoded)
+    return encoded
+
+
+def _records_parser(cls, key: str) -> Callable[[str], List[Any]]:
+    """Parser FileCache: JSON -> records `cls` de la liste `key`."""
+    def parse(text: str) -> List[Any]:
+        data = json.loads(text)
+        return decode_records(cls, data.get(key) if isinstance(data, dict) else None)
+    parse.__name__ = f"{cls.__name__.lower()}_records"
+    return parse
+
+
+parse_clients = _records_parser(Client, "clients")
+parse_deals = _records_parser(Deal, "deals")
+
+
+def parse_subscribers(text: str) -> Tuple[List[Subscriber], Any]:
+    """Parser FileCache de subscribers.json: (abonnés, revenu total)."""
+    data = json.loads(text)
+    revenue = (data.get("stats") or {}).get("total_revenue", 0)
+    return decode_records(Subscriber, data.get("subscribers")), revenue
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         LOG SCANNER
+# ═══════════════════════════════════════════════════════════════════
+
+LOG_TIMESTAMP = re.compile(rb"(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})")
+
+
+def iter_lines_reversed(filepath: Path, end: Optional[int] = None, max_bytes: int = LOG_MAX_BACKSCAN,
+                        block_size: int = LOG_BLOCK_SIZE):
+    """Itère les lignes (bytes) d'un fichier de la fin vers le début, par blocs.
+
+    La lecture s'arrête après `max_bytes` octets; `end` borne la fin de lecture.
+    """
+    with open(filepath, "rb") as f:
+        pos = f.seek(0, os.SEEK_END) if end is None else end
+        stop = max(0, pos - max_bytes)
+        tail = b""
+        while pos > stop:
+            size = min(block_size, pos - stop)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+            record_read(filepath, len(block))
+            lines = (block + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        if tail:
+            yield tail
+
+
+def parse_log_event(line: bytes, keywords: Tuple[str, ...] = ("SIGNAL", "BUY", "SELL")) -> Optional[Dict[str, Any]]:
+    """Transforme une ligne de log en événement si elle contient un mot-clé de trading."""
+    text = line.decode("utf-8", errors="ignore").strip()
+    kind = next((k for k in keywords if k in text), None)
+    if kind is None:
+        return None
+    match = LOG_TIMESTAMP.search(line)
+    return {
+        "time": f"{match.group(1).decode()}T{match.group(2).decode()}" if match else None,
+        "kind": kind,
+        "message": text[:200]
+    }
+
+
+class LogTail:
+    """Suit un log en ajout seul avec un point de reprise persisté.
+
+    Seuls les octets ajoutés depuis le dernier passage sont lus. Une rotation
+    (changement d'inode), une troncature ou un ajout trop volumineux déclenchent
+    une relecture par la fin, bornée à `LOG_MAX_BACKSCAN` octets.
+    """
+
+    def __init__(self, filepath: Path, checkpoint_file: Path, keep: int = BOT_LOG_EVENTS):
+        self.filepath = filepath
+        self.checkpoint_file = checkpoint_file
+        self.keep = keep
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """Retourne les `keep` derniers événements, du plus récent au plus ancien."""
+        st = self.filepath.stat()
+        record_read(self.filepath, mtime=st.st_mtime)
+        cp = load_json(self.checkpoint_file, {}, cache=False)
+        identity = [st.st_dev, st.st_ino]
+        same_file = cp.get("path") == str(self.filepath)
+        events = deque(cp.get("events", []) if same_file else [], maxlen=self.keep)
+        offset = cp.get("offset", 0)
+
+        if same_file and cp.get("identity") == identity and offset <= st.st_size \
+                and st.st_size - offset <= LOG_MAX_BACKSCAN:
+            offset = self._read_forward(offset, st.st_size, events)
+        else:
+            offset = self._read_backward(st.st_size, events)
+
+        save_json(self.checkpoint_file, {
+            "path": str(self.filepath), "identity": identity, "offset": offset, "events": list(events)
+        }, pretty=False)
+        return list(reversed(events))
+
+    def _read_forward(self, offset: int, size: int, events: deque) -> int:
+        """Lit les lignes complètes ajoutées après `offset`; retourne le nouvel offset."""
+        with open(self.filepath, "rb") as f:
+            f.seek(offset)
+            pending = b""
+            while offset + len(pending) < size:
+                chunk = f.read(min(LOG_BLOCK_SIZE, size - offset - len(pending)))
+                if not chunk:
+                    break
+                record_read(self.filepath, len(chunk))
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    offset += len(line) + 1
+                    event = parse_log_event(line)
+                    if event:
+                        events.append(event)
+        return offset
+
+    def _read_backward(self, size: int, events: deque) -> int:
+        """Relit la fin du fichier jusqu'à trouver `keep` événements; retourne l'offset de fin."""
+        with open(self.filepath, "rb") as f:
+            f.seek(max(0, size - LOG_BLOCK_SIZE))
+            last_block = f.read(size - f.tell())
+        record_read(self.filepath, len(last_block))
+        # Ne pas consommer une dernière ligne incomplète
+        newline = last_block.rfind(b"\n")
+        end = size - len(last_block) + newline + 1
+        found = []
+        for line in iter_lines_reversed(self.filepath, end=end):
+            event = parse_log_event(line)
+            if event:
+                found.append(event)
+                if len(found) >= self.keep:
+                    break
+        events.extend(reversed(found))
+        return end
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         PROCESS INVENTORY
+# ═══════════════════════════════════════════════════════════════════
+
+_PROCESS_LOCK = threading.Lock()
+_PROCESS_SNAPSHOT: Tuple[float, List[Dict[str, Any]]] = (0.0, [])
+_PREVIOUS_CPU: Dict[int, Tuple[float, float]] = {}
+
+
+def _snapshot_proc() -> List[Dict[str, Any]]:
+    """Inventaire des processus python via /proc (Linux)."""
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    boot_uptime = float(Path("/proc/uptime").read_text().split()[0])
+    processes = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            cmdline = Path(entry.path, "cmdline").read_bytes().replace(b"\0", b" ").decode("utf-8", "replace").strip()
+            stat = Path(entry.path, "stat").read_text()
+        except OSError:
+            continue  # Processus terminé entre-temps
+        name = stat[stat.index("(") + 1:stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 2:].split()
+        if "python" not in name.lower() and "python" not in cmdline.split(" ")[0].lower():
+            continue
+        processes.append({
+            "pid": int(entry.name),
+            "name": name,
+            "cmdline": cmdline,
+            "uptime": round(boot_uptime - int(fields[19]) / clock_ticks, 1),
+            "cpu_seconds": (int(fields[11]) + int(fields[12])) / clock_ticks,
+            "rss": int(fields[21]) * page_size
+        })
+    return processes
+
+
+def _snapshot_powershell() -> List[Dict[str, Any]]:
+    """Inventaire des processus python via un unique appel PowerShell (Windows)."""
+    script = (
+        "Get-CimInstance Win32_Process -Filter \"Name like 'python%'\" | Select-Object ProcessId,Name,CommandLine,"
+        "@{n='Uptime';e={((Get-Date)-$_.CreationDate).TotalSeconds}},KernelModeTime,UserModeTime,WorkingSetSize"
+        " | ConvertTo-Json -Compress"
+    )
+    result = subprocess.run(["powershell", "-NoProfile", "-Command", script], capture_output=True, text=True, timeout=5)
+    raw = json.loads(result.stdout) if result.stdout.strip() else []
+    return [{
+        "pid": p.get("ProcessId"),
+        "name": p.get("Name") or "",
+        "cmdline": p.get("CommandLine") or "",
+        "uptime": round(p.get("Uptime") or 0, 1),
+        "cpu_seconds": ((p.get("KernelModeTime") or 0) + (p.get("UserModeTime") or 0)) / 1e7,
+        "rss": int(p.get("WorkingSetSize") or 0)
+    } for p in (raw if isinstance(raw, list) else [raw])]
+
+
+def take_process_snapshot(max_age: float = PROCESS_SNAPSHOT_TTL) -> List[Dict[str, Any]]:
+    """Photo unique de la table des processus, partagée par les collecteurs d'une même sync."""
+    global _PROCESS_SNAPSHOT
+    with _PROCESS_LOCK:
+        taken, processes = _PROCESS_SNAPSHOT
+        if time.monotonic() - taken <= max_age:
+            return processes
+        processes = _snapshot_proc() if Path("/proc/self/stat").exists() else _snapshot_powershell()
+        now = time.monotonic()
+        own_pid = os.getpid()
+        processes = [p for p in processes if p["pid"] != own_pid]
+        for p in processes:
+            # CPU instantané depuis la photo précédente, sinon moyenne sur la durée de vie
+            previous = _PREVIOUS_CPU.get(p["pid"])
+            if previous and now > previous[1]:
+                p["cpu_percent"] = round((p["cpu_seconds"] - previous[0]) / (now - previous[1]) * 100, 1)
+            else:
+                p["cpu_percent"] = round(p["cpu_seconds"] / p["uptime"] * 100, 1) if p["uptime"] > 0 else 0
+        _PREVIOUS_CPU.clear()
+        _PREVIOUS_CPU.update({p["pid"]: (p["cpu_seconds"], now) for p in processes})
+        _PROCESS_SNAPSHOT = (now, processes)
+        return processes
+
+
+def find_processes(patterns: List[str]) -> List[Dict[str, Any]]:
+    """Processus dont la ligne de commande correspond à l'un des motifs (insensible à la casse)."""
+    patterns = [p.lower() for p in patterns]
+    return [
+        {"pid": p["pid"], "uptime": p["uptime"], "cpu_percent": p["cpu_percent"], "rss": p["rss"]}
+        for p in take_process_snapshot()
+        if any(fnmatch.fnmatchcase(p["cmdline"].lower(), pattern) for pattern in patterns)
+    ]
+
+
+def _service_status(patterns: List[str]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Statut running/stopped/error et processus correspondants."""
+    try:
+        processes = find_processes(patterns)
+        return ("running" if processes else "stopped"), processes
+    except Exception as e:
+        record_error(e)
+        return "error", []
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         MT5 DEAL LEDGER
+# ═══════════════════════════════════════════════════════════════════
+
+def _period_starts(now: datetime) -> Dict[str, datetime]:
+    """Débuts de la journée, de la semaine et du mois en cours."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {"day": today, "week": today - timedelta(days=today.weekday()), "month": today.replace(day=1)}
+
+
+class DealLedger:
+    """Historique local des deals MT5 indexé par ticket.
+
+    Seuls les deals postérieurs au dernier deal connu (moins un recouvrement)
+    sont demandés au terminal; les agrégats jour/semaine/mois sont calculés
+    en une seule passe sur l'historique local.
+    """
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        data = load_json(filepath, {}, cache=False)
+        self.deals: Dict[int, MT5Deal] = {int(t): MT5Deal(*d) for t, d in data.get("deals", {}).items()}
+        self.last_time = data.get("last_time", 0)
+
+    def sync(self, mt5, now: datetime) -> int:
+        """Récupère les nouveaux deals; retourne le nombre de deals ajoutés."""
+        starts = _period_starts(now)
+        window_start = min(starts["week"], starts["month"])
+        since = window_start
+        if self.last_time:
+            since = max(window_start, datetime.fromtimestamp(self.last_time - MT5_LEDGER_OVERLAP))
+        history = mt5.history_deals_get(since, now) or ()
+        added = 0
+        for d in history:
+            if d.ticket not in self.deals:
+                self.deals[d.ticket] = MT5Deal(int(d.time), float(d.profit))
+                added += 1
+            self.last_time = max(self.last_time, int(d.time))
+        # Oublier les deals hors de la fenêtre semaine/mois
+        cutoff = window_start.timestamp()
+        expired = [t for t, (ts, _) in self.deals.items() if ts < cutoff]
+        for ticket in expired:
+            del self.deals[ticket]
+        if added or expired:
+            self.save()
+        return added
+
+    def save(self):
+        save_json(self.filepath, {
+            "last_time": self.last_time,
+            "deals": {str(t): list(d) for t, d in self.deals.items()}
+        }, pretty=False)
+
+    def aggregates(self, now: datetime) -> Dict[str, Dict[str, Any]]:
+        """Profit, nombre de deals, gains, winrate et drawdown max par période."""
+        starts = {name: start.timestamp() for name, start in _period_starts(now).items()}
+        acc = {name: {"profit": 0.0, "trades": 0, "wins": 0, "peak": 0.0, "max_drawdown": 0.0} for name in starts}
+        for ts, profit in sorted(self.deals.values()):
+            for name, start in starts.items():
+                if ts < start:
+                    continue
+                a = acc[name]
+                a["profit"] += profit
+                a["trades"] += 1
+                a["wins"] += profit > 0
+                a["peak"] = max(a["peak"], a["profit"])
+                a["max_drawdown"] = max(a["max_drawdown"], a["peak"] - a["profit"])
+        return {name: {
+            "profit": round(a["profit"], 2),
+            "trades": a["trades"],
+            "wins": a["wins"],
+            "winrate": round(a["wins"] / a["trades"] * 100, 1) if a["trades"] else 0,
+            "max_drawdown": round(a["max_drawdown"], 2)
+        } for name, a in acc.items()}
+
+
+_DEAL_LEDGER: Optional[DealLedger] = None
+
+
+def get_deal_ledger() -> DealLedger:
+    """Historique des deals partagé par les syncs successives du processus."""
+    global _DEAL_LEDGER
+    if _DEAL_LEDGER is None:
+        _DEAL_LEDGER = DealLedger(STATE_DIR / "mt5_deals.json")
+    return _DEAL_LEDGER
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         MT5 SESSION
+# ═══════════════════════════════════════════════════════════════════
+
+class MT5Session:
+    """Connexion unique au terminal MT5, partagée par tous les appelants du processus.
+
+    `initialize()` n'est appelé qu'à la première requête ou après une perte de
+    connexion, avec un délai de reconnexion croissant en cas d'échec. La santé
+    est vérifiée par `account_info()` (None = connexion perdue, une reconnexion
+    est tentée). Les réponses sont servies depuis un cache de `ttl` secondes;
+    `shutdown()` est appelé à la fermeture du processus.
+    """
+
+    def __init__(self, module: Any = None, ttl: float = MT5_CACHE_TTL):
+        self._module = module
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self.connected = False
+        self.connects = 0
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error: Any = None
+        self._atexit = False
+
+    @property
+    def module(self):
+        """Module MetaTrader5 (ImportError si absent)."""
+        if self._module is None:
+            import MetaTrader5
+            self._module = MetaTrader5
+        return self._module
+
+    def connect(self) -> bool:
+        """Ouvre la connexion si nécessaire; False si le terminal refuse ou pendant le délai de reconnexion."""
+        with self._lock:
+            if self.connected:
+                return True
+            now = time.monotonic()
+            if now < self.retry_at:
+                return False
+            mt5 = self.module
+            if mt5.initialize():
+                self.connected = True
+                self.connects += 1
+                self.failures = 0
+                if not self._atexit:
+                    atexit.register(self.close)
+                    self._atexit = True
+                return True
+            self.failures += 1
+            self.retry_at = now + min(MT5_RECONNECT_MAX_DELAY, MT5_RECONNECT_BACKOFF * 2 ** (self.failures - 1))
+            self.last_error = mt5.last_error()
+            return False
+
+    def close(self):
+        """Ferme la connexion (shutdown) et vide le cache."""
+        with self._lock:
+            self._cache.clear()
+            if not self.connected:
+                return
+            self.connected = False
+            try:
+                self.module.shutdown()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _cached(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        """Valeur de `key` si elle a moins de `ttl` secondes, sinon `fetch()` (connexion fermée sur exception)."""
+        with self._lock:
+            now = time.monotonic()
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < self.ttl:
+                return hit[1]
+            if not self.connect():
+                raise ConnectionError(f"MT5 indisponible: {self.last_error}")
+            try:
+                value = fetch()
+            except Exception:
+                self.close()
+                raise
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.ttl}
+            self._cache[key] = (now, value)
+            return value
+
+    def account_info(self):
+        """Infos du compte; sert aussi de contrôle de santé (une reconnexion si la connexion est perdue)."""
+        for attempt in range(2):
+            account = self._cached(("account_info",), lambda: self.module.account_info())
+            if account is not None:
+                return account
+            with self._lock:
+                self.last_error = self.module.last_error()
+                self.close()
+        raise ConnectionError(f"MT5 account_info() indisponible: {self.last_error}")
+
+    def positions_get(self):
+        """Positions ouvertes."""
+        return self._cached(("positions_get",), lambda: self.module.positions_get())
+
+    def history_deals_get(self, date_from: datetime, date_to: datetime):
+        """Deals depuis `date_from`; une réponse de moins de `ttl` secondes est réutilisée quel que soit `date_to`."""
+        return self._cached(("history_deals_get", date_from), lambda: self.module.history_deals_get(date_from, date_to))
+
+
+_MT5_SESSION: Optional[MT5Session] = None
+
+
+def get_mt5_session() -> MT5Session:
+    """Session MT5 partagée par les syncs du processus."""
+    global _MT5_SESSION
+    if _MT5_SESSION is None:
+        _MT5_SESSION = MT5Session()
+    return _MT5_SESSION
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         KONAN SIGNAL AGGREGATES
+# ═══════════════════════════════════════════════════════════════════
+
+class JsonArrayReader:
+    """Lecteur JSON en flux (un bloc + un élément en mémoire) qui suit l'offset en octets consommé."""
+
+    _WS = re.compile(r"[ \t\n\r]*")
+    _SEP = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+    def __init__(self, f, offset: int = 0, block_size: int = LOG_BLOCK_SIZE):
+        f.seek(offset)
+        self.f = f
+        self.offset = offset  # Octets du fichier consommés jusqu'à pos
+        self.block_size = block_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.raw_decode = json.JSONDecoder().raw_decode
+        self.buf, self.pos, self.eof, self.bytes_read, self.ascii = "", 0, False, 0, True
+
+    def _fill(self) -> bool:
+        """Ajoute un bloc au tampon; False en fin de fichier."""
+        if self.eof:
+            return False
+        raw = self.f.read(self.block_size)
+        self.bytes_read += len(raw)
+        self.eof = not raw
+        self.buf = self.buf[self.pos:] + self.decoder.decode(raw, final=self.eof)
+        self.pos, self.ascii = 0, self.buf.isascii()
+        return True
+
+    def _advance(self, end: int):
+        self.offset += end - self.pos if self.ascii else len(self.buf[self.pos:end].encode("utf-8"))
+        self.pos = end
+
+    def peek(self) -> str:
+        """Prochain caractère significatif ("" en fin de fichier)."""
+        while True:
+            self._advance(self._WS.match(self.buf, self.pos).end())
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"JSON inattendu à l'octet {self.offset}: {c!r} au lieu de {chars!r}")
+        self._advance(self.pos + 1)
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self.buf) and self._fill():
+                continue  # Nombre possiblement tronqué en fin de tampon
+            self._advance(end)
+            return value
+
+    def seek_key(self, key: str) -> bool:
+        """Se place sur la valeur de `key` dans l'objet racine; False si absente."""
+        self.expect("{")
+        if self.peek() == "}":
+            return False
+        while True:
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.value()
+            if self.expect(",}") == "}":
+                return False
+
+    def items(self, resume: bool = False):
+        """Itère (élément, offset début, offset fin) d'un tableau; resume=True reprend après un élément."""
+        if not resume:
+            self.expect("[")
+            if self.peek() == "]":
+                return
+        elif self.expect(",]") == "]":
+            return
+        while True:
+            self.peek()
+            start = self.offset
+            item = self.value()
+            yield item, start, self.offset
+            m = self._SEP.match(self.buf, self.pos)
+            if m and m.end() < len(self.buf):
+                self._advance(m.start(1))
+                sep = self.buf[self.pos]
+                self._advance(self.pos + 1)
+            else:
+                sep = self.expect(",]")  # Séparateur en fin de tampon
+            if sep == "]":
+                return
+
+
+def iter_performance_signals(perf_file: Path, offset: Optional[int] = None):
+    """Itère (Signal, offset début, offset fin) de performance.json en flux.
+
+    offset: fin d'un signal déjà lu; la lecture reprend au signal suivant.
+    """
+    with open(perf_file, "rb") as f:
+        reader = JsonArrayReader(f, offset or 0)
+        try:
+            if offset is not None or reader.seek_key("signals") and reader.peek() == "[":
+                for item, start, end in reader.items(resume=offset is not None):
+                    if isinstance(item, dict):
+                        yield Signal.from_dict(item), start, end
+        finally:
+            record_read(perf_file, reader.bytes_read, None, perf_file.stat().st_mtime)
+
+
+def _span_digest(path: Path, span: List[int]) -> str:
+    """Empreinte des octets [début, fin) d'un fichier."""
+    with open(path, "rb") as f:
+        f.seek(span[0])
+        return hashlib.sha1(f.read(span[1] - span[0])).hexdigest()
+
+
+class SignalStats:
+    """Agrégats cumulés des signaux (stats globales et mensuelles) en une passe."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.total = data.get("total", 0)
+        self.pending = data.get("pending", 0)
+        self.wins = data.get("wins", 0)
+        self.losses = data.get("losses", 0)
+        self.win_sum = data.get("win_sum", 0.0)
+        self.loss_sum = data.get("loss_sum", 0.0)
+        self.best = data.get("best")
+        self.worst = data.get("worst")
+        self.monthly: Dict[str, Dict[str, Any]] = {m: dict(v) for m, v in data.get("monthly", {}).items()}
+        # Tas min (date, -position dans le fichier, signal) des signaux les plus récents
+        self.recent: List[Tuple[str, int, Signal]] = []
+        for position, signal in data.get("recent", []):
+            self.push_recent(Signal.from_dict(signal), position)
+
+    def push_recent(self, signal: Signal, position: int, keep: int = KONAN_RECENT_SIGNALS):
+        # À date égale, le signal le plus tôt dans le fichier l'emporte (comme un tri stable)
+        entry = (signal.published_at or "", -position, signal)
+        if len(self.recent) < keep:
+            heapq.heappush(self.recent, entry)
+        elif entry[:2] > self.recent[0][:2]:
+            heapq.heapreplace(self.recent, entry)
+
+    def fold(self, signal: Signal, position: int):
+        """Intègre le signal situé à `position` dans le fichier."""
+        self.total += 1
+        self.push_recent(signal, position)
+        if signal.status in KONAN_OPEN_STATUSES:
+            self.pending += 1
+            return
+        pnl = float(signal.pnl or 0)
+        month = self.monthly.setdefault((signal.published_at or "")[:7],
+                                        {"signals": 0, "wins": 0, "losses": 0, "pnl": 0.0})
+        month["signals"] += 1
+        month["pnl"] += pnl
+        if pnl > 0:
+            self.wins += 1
+            self.win_sum += pnl
+            month["wins"] += 1
+        else:
+            self.losses += 1
+            self.loss_sum += pnl
+            month["losses"] += 1
+        self.best = pnl if self.best is None else max(self.best, pnl)
+        self.worst = pnl if self.worst is None else min(self.worst, pnl)
+
+    def merge(self, other: "SignalStats") -> "SignalStats":
+        """Nouveaux agrégats combinant `self` et `other`."""
+        merged = SignalStats(self.to_dict())
+        merged.total += other.total
+        merged.pending += other.pending
+        merged.wins += other.wins
+        merged.losses += other.losses
+        merged.win_sum += other.win_sum
+        merged.loss_sum += other.loss_sum
+        for value in (other.best, other.worst):
+            if value is not None:
+                merged.best = value if merged.best is None else max(merged.best, value)
+                merged.worst = value if merged.worst is None else min(merged.worst, value)
+        for m, v in other.monthly.items():
+            month = merged.monthly.setdefault(m, {"signals": 0, "wins": 0, "losses": 0, "pnl": 0.0})
+            for k in month:
+                month[k] += v[k]
+        for _, position, signal in other.recent:
+            merged.push_recent(signal, -position)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total, "pending": self.pending, "wins": self.wins, "losses": self.losses,
+            "win_sum": self.win_sum, "loss_sum": self.loss_sum, "best": self.best, "worst": self.worst,
+            "monthly": self.monthly, "recent": [[-position, signal.to_dict()] for _, position, signal in self.recent]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Format `stats` de data.json."""
+        closed = self.wins + self.losses
+        return {
+            "total_signals": self.total, "wins": self.wins, "losses": self.losses, "pending": self.pending,
+            "win_rate": round(self.wins / closed * 100, 1) if closed else 0,
+            "total_pnl": round(self.win_sum + self.loss_sum, 2),
+            "avg_win": round(self.win_sum / self.wins, 2) if self.wins else 0,
+            "avg_loss": round(self.loss_sum / self.losses, 2) if self.losses else 0,
+            "best_trade": round(self.best or 0, 2), "worst_trade": round(self.worst or 0, 2)
+        }
+
+    def monthly_summary(self) -> Dict[str, Dict[str, Any]]:
+        return {m: dict(v, pnl=round(v["pnl"], 2)) for m, v in sorted(self.monthly.items())}
+
+    def recent_signals(self) -> List[Dict[str, Any]]:
+        return [signal.to_dict() for _, _, signal in sorted(self.recent, key=lambda e: e[:2], reverse=True)]
+
+
+def aggregate_performance(perf_file: Path, state_file: Path) -> Dict[str, Any]:
+    """Stats, mensuel et signaux récents de performance.json avec un filigrane persisté.
+
+    Le préfixe de signaux clôturés déjà intégré (jusqu'au filigrane) n'est ni
+    relu ni ré-agrégé: la lecture reprend à l'offset en octets du dernier signal
+    intégré, dont l'empreinte vérifie que l'historique n'a pas été réécrit.
+    Mémoire bornée: un bloc de lecture, un tas de KONAN_RECENT_SIGNALS signaux
+    et des compteurs.
+    """
+    st = perf_file.stat()
+    signature = [str(perf_file), st.st_mtime_ns, st.st_size]
+    state = load_json(state_file, {}, cache=False)
+    if state.get("signature") == signature:
+        return state["result"]
+    span = state.get("watermark_span")
+    resume = (state.get("signature", [None])[0] == str(perf_file) and span is not None
+              and span[1] <= st.st_size and _span_digest(perf_file, span) == state.get("watermark_digest"))
+
+    for attempt in (resume, False):
+        base = SignalStats(state.get("folded") if attempt else None)
+        watermark = state.get("watermark", 0) if attempt else 0
+        wm_span = span if attempt else None
+        tail = SignalStats()
+        advancing = True
+        try:
+            signals = iter_performance_signals(perf_file, wm_span[1] if attempt else None)
+            for i, (signal, start, end) in enumerate(signals, watermark):
+                if advancing and signal.status not in KONAN_OPEN_STATUSES:
+                    base.fold(signal, i)
+                    watermark, wm_span = i + 1, [start, end]
+                else:
+                    advancing = False
+                    tail.fold(signal, i)
+            break
+        except ValueError:
+            if not attempt:
+                raise  # JSON invalide: l'erreur remonte au collecteur
+
+    total = base.merge(tail)
+    result = {"stats": total.stats(), "monthly": total.monthly_summary(), "recent_signals": total.recent_signals()}
+    save_json(state_file, {
+        "signature": signature, "watermark": watermark, "watermark_span": wm_span,
+        "watermark_digest": _span_digest(perf_file, wm_span) if wm_span else None,
+        "folded": base.to_dict(), "result": result
+    })
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         CRM FRAME & ALERT RULES
+# ═══════════════════════════════════════════════════════════════════
+
+_COMPARE = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+            "==": operator.eq, "!=": operator.ne}
+
+
+def _column(values: List[Any], numeric: bool = False):
+    """Colonne NumPy si disponible, sinon liste Python."""
+    if np is None:
+        return values
+    return np.array(values, dtype=float if numeric else object)
+
+
+def _days_since(dates: List[Optional[date]], today: date):
+    """Jours écoulés depuis chaque date déjà parsée (NaN si absente)."""
+    if np is not None:
+        delta = np.datetime64(today, "D") - np.array([d or "NaT" for d in dates], dtype="datetime64[D]")
+        return np.where(np.isnat(delta), np.nan, delta.astype(float))
+    nan = float("nan")
+    return [float((today - d).days) if d else nan for d in dates]
+
+
+def _mask(column, op: str, value: Any):
+    """Masque booléen `column <op> value`, vectorisé si NumPy est disponible."""
+    if op == "in":
+        if np is not None:
+            return np.isin(column, list(value))
+        return [v in value for v in column]
+    compare = _COMPARE[op]
+    if np is not None:
+        return compare(column, value)
+    return [compare(v, value) for v in column]
+
+
+def _conjunction(table: Dict[str, Any], conditions: List[Tuple[str, str, Any]], size: int):
+    """Masque des lignes satisfaisant toutes les conditions."""
+    mask = np.ones(size, dtype=bool) if np is not None else [True] * size
+    for column, op, value in conditions:
+        other = _mask(table[column], op, value)
+        mask = mask & other if np is not None else [a and b for a, b in zip(mask, other)]
+    return mask
+
+
+def _number(value: float):
+    """Entier si la valeur est entière (sortie JSON identique aux sommes d'entiers)."""
+    return int(value) if float(value).is_integer() else value
+
+
+class CrmFrame:
+    """Vue colonnaire des clients et deals, construite une fois par sync."""
+
+    def __init__(self, clients: List[Client], deals: List[Deal], today: Optional[date] = None):
+        today = today or date.today()
+        self.clients = {
+            "id": _column([c.id if c.id is not None else "x" for c in clients]),
+            "name": _column([c.name if c.name is not None else "Client" for c in clients]),
+            "type": _column([c.type for c in clients]),
+            "days_since_contact": _days_since([c.last_contact for c in clients], today),
+        }
+        self.deals = {
+            "id": _column([d.id if d.id is not None else "x" for d in deals]),
+            "client": _column([d.client if d.client is not None else "Deal" for d in deals]),
+            "title": _column([d.title if d.title is not None else "N/A" for d in deals]),
+            "stage": _column([d.stage for d in deals]),
+            "value": _column([d.value or 0.0 for d in deals], numeric=True),
+        }
+        self.client_count = len(clients)
+        self.deal_count = len(deals)
+
+    def count(self, table: str, column: str, op: str, value: Any) -> int:
+        """Nombre de lignes satisfaisant une condition."""
+        mask = _mask(getattr(self, table)[column], op, value)
+        return int(mask.sum()) if np is not None else sum(mask)
+
+    def total(self, table: str, column: str, where: Tuple[str, str, Any]) -> float:
+        """Somme de `column` sur les lignes satisfaisant `where`."""
+        data = getattr(self, table)
+        mask = _mask(data[where[0]], where[1], where[2])
+        if np is not None:
+            return _number(float(data[column][mask].sum()))
+        return _number(sum(v for v, keep in zip(data[column], mask) if keep))
+
+    def tables(self, rules: List[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Colonnes sur lesquelles évaluer `rules` (toutes les lignes)."""
+        return {"clients": self.clients, "deals": self.deals}
+
+
+_CRM_FRAME: Optional[Tuple[List[Client], List[Deal], date, CrmFrame]] = None
+
+
+def get_crm_frame(clients: List[Client], deals: List[Deal]) -> CrmFrame:
+    """Vue colonnaire, réutilisée tant que les records (objets du cache) et la date n'ont pas changé.
+
+    Avec le store SQLite (et des données CRM importées), vue interrogée par requêtes indexées.
+    """
+    global _CRM_FRAME
+    today = date.today()
+    store = get_store()
+    if store is not None and store.has_rows("clients") and store.has_rows("deals"):
+        return StoreFrame(store, today)
+    cached = _CRM_FRAME
+    if cached and cached[0] is clients and cached[1] is deals and cached[2] == today:
+        return cached[3]
+    frame = CrmFrame(clients, deals, today)
+    _CRM_FRAME = (clients, deals, today, frame)
+    return frame
+
+
+def evaluate_alert_rules(tables: Dict[str, Dict[str, Any]], rules: List[Dict] = None,
+                         limit: int = SMART_ALERTS_LIMIT, now: Optional[datetime] = None) -> List[Dict]:
+    """Évalue la table de règles en lot et retourne les `limit` alertes les plus prioritaires."""
+    rules = ALERT_RULES if rules is None else rules
+    now = now or datetime.now()
+    candidates = []
+    for rule_index, rule in enumerate(rules):
+        table = tables[rule["table"]]
+        size = len(next(iter(table.values()))) if table else 0
+        if not size:
+            continue
+        matches = _conjunction(table, rule["when"], size)
+        ranks = np.full(size, len(ALERT_PRIORITIES)) if np is not None else [len(ALERT_PRIORITIES)] * size
+        for label, conditions in reversed(rule["priority"]):
+            level = _conjunction(table, conditions, size)
+            rank = ALERT_PRIORITIES.index(label)
+            if np is not None:
+                ranks[level] = rank
+            else:
+                ranks = [rank if hit else r for r, hit in zip(ranks, level)]
+        indices = np.flatnonzero(matches).tolist() if np is not None else [i for i, hit in enumerate(matches) if hit]
+        order = table.get(rule.get("order"))
+        for i in indices:
+            if ranks[i] >= len(ALERT_PRIORITIES):
+                continue  # Aucune priorité applicable
+            key = -float(order[i]) if order is not None else 0.0
+            candidates.append((rule.get("precedence", 1), int(ranks[i]), rule_index, key if key == key else 0.0, i))
+
+    alerts = []
+    for _, rank, rule_index, _, i in heapq.nsmallest(limit, candidates):
+        rule = rules[rule_index]
+        row = {k: (v[i].item() if hasattr(v[i], "item") else v[i]) for k, v in tables[rule["table"]].items()}
+        try:
+            text = {field: rule[field].format(**row) for field in ("id", "client", "message")}
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            # Une ligne mal typée ne doit pas faire perdre les autres alertes
+            record_error(e)
+            continue
+        alerts.append({
+            "id": text["id"],
+            "type": rule["type"],
+            "priorite": ALERT_PRIORITIES[rank],
+            "client": text["client"],
+            "message": text["message"],
+            "date_creation": now.strftime("%Y-%m-%d"),
+            "auto": True
+        })
+    return alerts
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         LOCAL STORE (SQLite)
+# ═══════════════════════════════════════════════════════════════════
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, path TEXT, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS clients (pos INTEGER PRIMARY KEY, id, name, type, last_contact TEXT);
+CREATE INDEX IF NOT EXISTS clients_last_contact ON clients (last_contact);
+CREATE INDEX IF NOT EXISTS clients_type ON clients (type);
+CREATE TABLE IF NOT EXISTS deals (pos INTEGER PRIMARY KEY, id, client, title, stage, value REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS deals_stage ON deals (stage);
+CREATE TABLE IF NOT EXISTS rdv (pos INTEGER PRIMARY KEY, date TEXT, doc TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS rdv_date ON rdv (date);
+CREATE TABLE IF NOT EXISTS kpis (month TEXT PRIMARY KEY, doc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS alertes (pos INTEGER PRIMARY KEY, traitee INTEGER NOT NULL, doc TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS alertes_traitee ON alertes (traitee);
+CREATE TABLE IF NOT EXISTS signals (pos INTEGER PRIMARY KEY, closed INTEGER NOT NULL, pnl REAL NOT NULL,
+                                    published_at TEXT NOT NULL, doc TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS signals_published_at ON signals (published_at DESC);
+"""
+
+STORE_INSERT = {
+    "clients": "INSERT INTO clients VALUES (?, ?, ?, ?, ?)",
+    "deals": "INSERT INTO deals VALUES (?, ?, ?, ?, ?, ?)",
+    "rdv": "INSERT INTO rdv VALUES (?, ?, ?)",
+    "kpis": "INSERT INTO kpis VALUES (?, ?)",
+    "alertes": "INSERT INTO alertes VALUES (?, ?, ?)",
+    "signals": "INSERT INTO signals VALUES (?, ?, ?, ?, ?)",
+}
+
+
+def _sql_value(value: Any) -> Any:
+    """Valeur stockable telle quelle par SQLite (sinon encodée en JSON)."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _doc(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_source(path: Path) -> Any:
+    """Contenu JSON d'une source (None si illisible: la table est alors vidée)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _list_of(data: Any, key: str) -> List[Any]:
+    items = data.get(key) if isinstance(data, dict) else None
+    return items if isinstance(items, list) else []
+
+
+def _client_rows(path: Path):
+    for pos, c in enumerate(decode_records(Client, _list_of(_read_source(path), "clients"))):
+        yield (pos, _sql_value(c.id if c.id is not None else "x"), _sql_value(c.name if c.name is not None else "Client"),
+               _sql_value(c.type), c.last_contact.isoformat() if c.last_contact else None)
+
+
+def _deal_rows(path: Path):
+    for pos, d in enumerate(decode_records(Deal, _list_of(_read_source(path), "deals"))):
+        yield (pos, _sql_value(d.id if d.id is not None else "x"), _sql_value(d.client if d.client is not None else "Deal"),
+               _sql_value(d.title if d.title is not None else "N/A"), _sql_value(d.stage), d.value or 0.0)
+
+
+def _rdv_rows(path: Path):
+    for pos, r in enumerate(_list_of(_read_source(path), "rdv")):
+        if isinstance(r, dict):
+            yield pos, r.get("date") if isinstance(r.get("date"), str) else None, _doc(r)
+
+
+def _kpi_rows(path: Path):
+    data = _read_source(path)
+    for month, kpis in (data.items() if isinstance(data, dict) else ()):
+        yield month, _doc(kpis)
+
+
+def _alerte_rows(path: Path):
+    for pos, a in enumerate(_list_of(_read_source(path), "alertes")):
+        if isinstance(a, dict):
+            yield pos, 1 if a.get("traitee", False) else 0, _doc(a)
+
+
+def _signal_rows(path: Path):
+    for pos, (s, _, _) in enumerate(iter_performance_signals(path)):
+        closed = s.status not in KONAN_OPEN_STATUSES
+        yield pos, int(closed), float(s.pnl or 0), s.published_at or "", _doc(s.to_dict())
+
+
+class LocalStore:
+    """Store SQLite local alimenté par les fichiers JSON (qui restent la source de vérité).
+
+    Chaque source est réimportée en une transaction quand sa signature
+    (chemin, mtime, taille) change; les collecteurs l'interrogent ensuite par
+    requêtes indexées (date de RDV, mois de KPI, dernier contact, stage, date
+    de publication des signaux).
+    """
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(filepath), check_same_thread=False)
+        self.conn.executescript(STORE_SCHEMA)
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def sources(self) -> List[Tuple[str, Path, Callable[[Path], Any]]]:
+        """Tables du store, fichier source et extracteur de lignes."""
+        return [
+            ("clients", CRM_DATA / "clients.json", _client_rows),
+            ("deals", CRM_DATA / "deals.json", _deal_rows),
+            ("rdv", CCPRO_DATA / "rdv.json", _rdv_rows),
+            ("kpis", CCPRO_DATA / "objectifs.json", _kpi_rows),
+            ("alertes", CCPRO_DATA / "alertes.json", _alerte_rows),
+            ("signals", KONAN_SIGNALS_DIR / "performance.json", _signal_rows),
+        ]
+
+    def import_sources(self, force: bool = False) -> List[str]:
+        """Réimporte les sources modifiées depuis le dernier import; retourne les tables mises à jour."""
+        imported = []
+        try:
+            with self._lock:
+                known = {name: (path, mtime, size) for name, path, mtime, size
+                         in self.conn.execute("SELECT name, path, mtime_ns, size FROM sources")}
+                for name, path, rows in self.sources():
+                    signature = _file_signature(path) or (None, None)
+                    if not force and known.get(name) == (str(path), *signature):
+                        continue
+                    with self.conn:
+                        self.conn.execute(f"DELETE FROM {name}")
+                        if signature[0] is not None:
+                            self.conn.executemany(STORE_INSERT[name], rows(path))
+                        self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                                          (name, str(path), *signature))
+                    imported.append(name)
+        except sqlite3.Error:
+            self.ready = False
+            raise
+        self.ready = True
+        return imported
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def has_rows(self, table: str) -> bool:
+        return bool(self.query(f"SELECT 1 FROM {table} LIMIT 1"))
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre de lignes par table."""
+        return {name: self.query(f"SELECT COUNT(*) FROM {name}")[0][0] for name, _, _ in self.sources()}
+
+    def rdv_on(self, day: str) -> List[Dict]:
+        """RDV d'une date (index rdv_date)."""
+        return [json.loads(doc) for doc, in self.query("SELECT doc FROM rdv WHERE date = ? ORDER BY pos", (day,))]
+
+    def kpis(self, month: str) -> Optional[Dict]:
+        """KPIs d'un mois (clé primaire), None si absents."""
+        rows = self.query("SELECT doc FROM kpis WHERE month = ?", (month,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def open_alerts(self) -> List[Dict]:
+        """Alertes non traitées (index alertes_traitee)."""
+        return [json.loads(doc) for doc, in self.query("SELECT doc FROM alertes WHERE traitee = 0 ORDER BY pos")]
+
+    def signal_summary(self, recent: int = KONAN_RECENT_SIGNALS) -> Dict[str, Any]:
+        """Stats, mensuel et signaux récents (index signals_published_at), au format de aggregate_performance."""
+        stats = SignalStats()
+        stats.total, pending = self.query("SELECT COUNT(*), TOTAL(NOT closed) FROM signals")[0]
+        stats.pending = int(pending)
+        for month, count, wins, pnl, win_sum, best, worst in self.query(
+                "SELECT substr(published_at, 1, 7), COUNT(*), TOTAL(pnl > 0), TOTAL(pnl),"
+                " TOTAL(CASE WHEN pnl > 0 THEN pnl END), MAX(pnl), MIN(pnl)"
+                " FROM signals WHERE closed GROUP BY 1"):
+            wins = int(wins)
+            stats.monthly[month] = {"signals": count, "wins": wins, "losses": count - wins, "pnl": pnl}
+            stats.wins += wins
+            stats.losses += count - wins
+            stats.win_sum += win_sum
+            stats.loss_sum += pnl - win_sum
+            stats.best = best if stats.best is None else max(stats.best, best)
+            stats.worst = worst if stats.worst is None else min(stats.worst, worst)
+        rows = self.query("SELECT doc FROM signals ORDER BY published_at DESC, pos LIMIT ?", (recent,))
+        return {"stats": stats.stats(), "monthly": stats.monthly_summary(),
+                "recent_signals": [json.loads(doc) for doc, in rows]}
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_STORE: Optional[LocalStore] = None
+
+
+def get_store(ready: bool = True) -> Optional[LocalStore]:
+    """Store SQLite partagé, None s'il est désactivé, indisponible ou (si `ready`) pas encore importé.
+
+    Les collecteurs retombent alors sur la lecture des fichiers JSON.
+    """
+    global _STORE
+    if STORE_FILE is None or sqlite3 is None:
+        return None
+    if _STORE is None or _STORE.filepath != Path(STORE_FILE):
+        try:
+            _STORE = LocalStore(Path(STORE_FILE))
+        except (OSError, sqlite3.Error):
+            return None
+    return _STORE if _STORE.ready or not ready else None
+
+
+# Opérateurs des règles -> SQL; `days_since_contact <op> N` devient `last_contact <miroir> today - N`
+_SQL_OPS = {">": ">", ">=": ">=", "<": "<", "<=": "<=", "==": "=", "!=": "!="}
+_SQL_MIRRORED = {">": "<", ">=": "<=", "<": ">", "<=": ">=", "==": "=", "!=": "!="}
+_STORE_COLUMNS = {"clients": ("id", "name", "type"), "deals": ("id", "client", "title", "stage", "value")}
+
+
+class StoreFrame:
+    """Vue CRM adossée au store: comptes, sommes et pré-filtrage des règles par requêtes indexées.
+
+    Même interface que CrmFrame; les conditions non traduisibles en SQL sont
+    évaluées sur une vue colonnaire complète.
+    """
+
+    def __init__(self, store: LocalStore, today: Optional[date] = None):
+        self.store = store
+        self.today = today or date.today()
+
+    def _condition(self, table: str, column: str, op: str, value: Any) -> Optional[Tuple[str, List[Any]]]:
+        if table == "clients" and column == "days_since_contact":
+            if op not in _SQL_MIRRORED or not float(value).is_integer():
+                return None
+            column = "last_contact"
+            sql, params = f"last_contact {_SQL_MIRRORED[op]} ?", [(self.today - timedelta(days=int(value))).isoformat()]
+        elif column in _STORE_COLUMNS.get(table, ()):
+            if op == "in":
+                value = list(value)
+                sql, params = f"{column} IN ({', '.join('?' * len(value))})", value
+            elif op in _SQL_OPS:
+                sql, params = f"{column} {_SQL_OPS[op]} ?", [value]
+            else:
+                return None
+        else:
+            return None
+        # Valeurs absentes: comme dans CrmFrame, seules `!=` (et `in` avec None) les retiennent
+        if op == "!=" or op == "in" and None in params:
+            sql = f"({sql} OR {column} IS NULL)"
+        return sql, params
+
+    def _where(self, table: str, conditions: List[Tuple[str, str, Any]]) -> Optional[Tuple[str, List[Any]]]:
+        clauses, params = [], []
+        for column, op, value in conditions:
+            condition = self._condition(table, column, op, value)
+            if condition is None:
+                return None
+            clauses.append(condition[0])
+            params += condition[1]
+        return " AND ".join(clauses) or "1", params
+
+    def _frame(self, where: str = "1", params: List[Any] = (), tables: Tuple[str, ...] = ("clients", "deals")) -> CrmFrame:
+        """Vue colonnaire des lignes sélectionnées (même `where` pour chaque table demandée)."""
+        clients = deals = []
+        if "clients" in tables:
+            clients = [Client(i, n, t, _parse_day(lc) if lc else None) for i, n, t, lc in self.store.query(
+                f"SELECT id, name, type, last_contact FROM clients WHERE {where} ORDER BY pos", tuple(params))]
+        if "deals" in tables:
+            deals = [Deal(i, ti, c, v, s) for i, c, ti, s, v in self.store.query(
+                f"SELECT id, client, title, stage, value FROM deals WHERE {where} ORDER BY pos", tuple(params))]
+        return CrmFrame(clients, deals, self.today)
+
+    def count(self, table: str, column: str, op: str, value: Any) -> int:
+        """Nombre de lignes satisfaisant une condition."""
+        condition = self._condition(table, column, op, value)
+        if condition is None:
+            return self._frame(tables=(table,)).count(table, column, op, value)
+        return self.store.query(f"SELECT COUNT(*) FROM {table} WHERE {condition[0]}", tuple(condition[1]))[0][0]
+
+    def total(self, table: str, column: str, where: Tuple[str, str, Any]) -> float:
+        """Somme de `column` sur les lignes satisfaisant `where`."""
+        condition = self._condition(table, *where)
+        if condition is None or column not in _STORE_COLUMNS.get(table, ()):
+            return self._frame(tables=(table,)).total(table, column, where)
+        return _number(self.store.query(f"SELECT TOTAL({column}) FROM {table} WHERE {condition[0]}",
+                                        tuple(condition[1]))[0][0])
+
+    def tables(self, rules: List[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Colonnes des seules lignes candidates aux règles (union des clauses `when`)."""
+        tables = {}
+        for table in _STORE_COLUMNS:
+            clauses, params = [], []
+            for rule in rules:
+                if rule["table"] != table:
+                    continue
+                where = self._where(table, rule["when"]) or ("1", [])
+                clauses.append(f"({where[0]})")
+                params += where[1]
+            if clauses:
+                frame = self._frame(" OR ".join(clauses), params, (table,))
+                tables[table] = getattr(frame, table)
+        return tables
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         METRIC HISTORY
+# ═══════════════════════════════════════════════════════════════════
+
+# Enregistrement: début du bucket, métrique, nombre de points, min, max, moyenne, dernière valeur
+_HISTORY_RECORD = struct.Struct("<IHHdddd")
+_HISTORY_TIERS = (("1m", 60), ("1h", 3600), ("1d", 86400))
+_TIER_SECONDS = dict(_HISTORY_TIERS)
+
+
+def _bucket_start(t: int, seconds: int) -> int:
+    """Début du bucket contenant `t` (jours alignés sur minuit local)."""
+    if seconds >= 86400:
+        return int(datetime.fromtimestamp(t).replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+    return t - t % seconds
+
+
+def _next_bucket(start: int, seconds: int) -> int:
+    """Début du bucket suivant (jours de 23 ou 25 h aux changements d'heure)."""
+    return _bucket_start(start + seconds + (3600 if seconds >= 86400 else 0), seconds)
+
+
+class HistoryStore:
+    """Séries temporelles des métriques numériques, en fichiers binaires à ajout seul.
+
+    Chaque niveau (1m, 1h, 1d) est un fichier d'enregistrements de taille fixe
+    triés par temps. Chaque sync ajoute un point par métrique au niveau 1m (au
+    plus un toutes les HISTORY_MIN_INTERVAL secondes); les heures et jours
+    révolus sont agrégés vers le niveau suivant. Les lectures passent par mmap
+    avec recherche dichotomique sur le temps; un niveau est réécrit sans ses
+    enregistrements hors rétention dès qu'ils dépassent 10 % de la fenêtre.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.catalog_file = directory / "metrics.json"
+        self.metrics: List[str] = load_json(self.catalog_file, [], cache=False)
+        self.ids = {name: i for i, name in enumerate(self.metrics)}
+        last = self._last("1m")
+        self.last_append = last[0] if last else 0
+        self._series: Optional[Dict[str, Any]] = None
+
+    def _path(self, tier: str) -> Path:
+        return self.directory / f"{tier}.bin"
+
+    def _last(self, tier: str) -> Optional[Tuple]:
+        """Dernier enregistrement d'un niveau (None si vide)."""
+        path = self._path(tier)
+        size = _HISTORY_RECORD.size
+        try:
+            with open(path, "rb") as f:
+                end = f.seek(0, os.SEEK_END) // size * size
+                if not end:
+                    return None
+                f.seek(end - size)
+                return _HISTORY_RECORD.unpack(f.read(size))
+        except OSError:
+            return None
+
+    def read(self, tier: str, since: int = 0) -> List[Tuple]:
+        """Enregistrements d'un niveau à partir de `since` (lecture mmap bornée à la fenêtre demandée)."""
+        path = self._path(tier)
+        size = _HISTORY_RECORD.size
+        try:
+            st = path.stat()
+        except OSError:
+            return []
+        count = st.st_size // size
+        if not count:
+            return []
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), count * size, access=mmap.ACCESS_READ) as mm:
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if _HISTORY_RECORD.unpack_from(mm, mid * size)[0] < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            record_read(path, (count - lo) * size, None, st.st_mtime)
+            return list(_HISTORY_RECORD.iter_unpack(mm[lo * size:count * size]))
+
+    def _write(self, tier: str, records: List[Tuple]):
+        if not records:
+            return
+        with open(self._path(tier), "ab") as f:
+            f.write(b"".join(_HISTORY_RECORD.pack(*r) for r in records))
+
+    def append(self, values: Dict[str, float], now: Optional[float] = None) -> bool:
+        """Ajoute un point par métrique, puis agrège et purge; False si le dernier point est trop récent."""
+        now = time.time() if now is None else now
+        if not values or now - self.last_append < HISTORY_MIN_INTERVAL:
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        new = [name for name in values if name not in self.ids]
+        if new:
+            for name in new:
+                self.ids[name] = len(self.metrics)
+                self.metrics.append(name)
+            save_json(self.catalog_file, self.metrics)
+        t = int(now)
+        self._write("1m", [(t, self.ids[name], 1, v, v, v, v) for name, v in values.items()])
+        self.last_append = t
+        self._rollup(t)
+        self._expire(t)
+        self._series = None
+        return True
+
+    def _rollup(self, now: int):
+        """Agrège les heures (puis jours) révolues du niveau inférieur non encore agrégées."""
+        for (source, _), (target, seconds) in zip(_HISTORY_TIERS, _HISTORY_TIERS[1:]):
+            last = self._last(target)
+            current = _bucket_start(now, seconds)
+            buckets: Dict[Tuple[int, int], List[float]] = {}
+            for t, metric, n, low, high, avg, value in self.read(source, since=last[0] + 1 if last else 0):
+                bucket = _bucket_start(t, seconds)
+                if bucket >= current or (last and bucket <= last[0]):
+                    continue
+                acc = buckets.get((bucket, metric))
+                if acc is None:
+                    buckets[(bucket, metric)] = [n, low, high, avg * n, value]
+                else:
+                    acc[0] += n
+                    acc[1] = min(acc[1], low)
+                    acc[2] = max(acc[2], high)
+                    acc[3] += avg * n
+                    acc[4] = value
+            self._write(target, [(bucket, metric, min(n, 0xFFFF), low, high, total / n, value)
+                                 for (bucket, metric), (n, low, high, total, value) in sorted(buckets.items())])
+
+    def _expire(self, now: int):
+        """Réécrit les niveaux dont les enregistrements hors rétention dépassent 10 % de la fenêtre."""
+        for tier, _ in _HISTORY_TIERS:
+            retention = HISTORY_RETENTION[tier]
+            path = self._path(tier)
+            try:
+                with open(path, "rb") as f:
+                    first = f.read(_HISTORY_RECORD.size)
+            except OSError:
+                continue
+            if len(first) < _HISTORY_RECORD.size or _HISTORY_RECORD.unpack(first)[0] >= now - retention * 1.1:
+                continue
+            kept = self.read(tier, since=now - retention)
+            write_bytes_atomic(path, b"".join(_HISTORY_RECORD.pack(*r) for r in kept))
+
+    def _collect(self, level: int, since: int) -> List[Tuple]:
+        """Enregistrements du niveau `level` depuis `since`, complétés par les niveaux plus fins non encore agrégés."""
+        tier, seconds = _HISTORY_TIERS[level]
+        records = self.read(tier, since)
+        if level > 0:
+            tail = _next_bucket(records[-1][0], seconds) if records else since
+            records += self._collect(level - 1, max(since, tail))
+        return records
+
+    def series(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Séries sous-échantillonnées (≤ HISTORY_POINTS points par plage) pour les graphiques du dashboard.
+
+        Par plage: `start` et `step` (secondes) et, par métrique, la moyenne de
+        chaque intervalle (None sans donnée). Résultat mis en cache jusqu'au
+        prochain point.
+        """
+        if self._series is not None:
+            return self._series
+        now = int(time.time() if now is None else now)
+        ranges = {}
+        for name, (tier, span) in HISTORY_RANGES.items():
+            level = [t for t, _ in _HISTORY_TIERS].index(tier)
+            step = max(_TIER_SECONDS[tier], -(-span // HISTORY_POINTS))
+            points = -(-span // step)
+            # Intervalles alignés sur `step`, le dernier contenant `now`
+            start = now - now % step + step - points * step
+            sums: Dict[int, List[float]] = {}
+            counts: Dict[int, List[int]] = {}
+            for t, metric, n, _, _, avg, _ in self._collect(level, start):
+                i = (t - start) // step
+                if not 0 <= i < points:
+                    continue
+                if metric not in sums:
+                    sums[metric], counts[metric] = [0.0] * points, [0] * points
+                sums[metric][i] += avg * n
+                counts[metric][i] += n
+            ranges[name] = {"start": start, "step": step, "values": {
+                self.metrics[metric]: [round(s / c, 2) if c else None for s, c in zip(sums[metric], counts[metric])]
+                for metric in sorted(sums)
+            }}
+        self._series = {"updated": datetime.fromtimestamp(self.last_append).isoformat() if self.last_append else None,
+                        "ranges": ranges}
+        return self._series
 
-# ═══════════════════════════════════════════════════════════════════
-#                         HELPER FUNCTIONS
-# ═══════════════════════════════════════════════════════════════════
 
-def load_json(filepath: Path, default=None):
-    """Charge un fichier JSON de manière sécurisée."""
-    if default is None:
-        default = {}
-    try:
-        if filepath.exists():
-            return json.loads(filepath.read_text(encoding="utf-8"))
-    except:
-        pass
-    return default
+_HISTORY_STORE: Optional[HistoryStore] = None
 
 
-def save_json(filepath: Path, data: dict):
-    """Sauvegarde un fichier JSON."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    filepath.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def get_history_store() -> HistoryStore:
+    """Historique des métriques partagé par les syncs du processus."""
+    global _HISTORY_STORE
+    if _HISTORY_STORE is None:
+        _HISTORY_STORE = HistoryStore(STATE_DIR / "history")
+    return _HISTORY_STORE
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -67,82 +2178,73 @@ def get_mt5_status() -> Dict[str, Any]:
         "profit_week": 0, "profit_month": 0, "last_update": datetime.now().isoformat()
     }
     try:
-        import MetaTrader5 as mt5
-        if mt5.initialize():
-            account = mt5.account_info()
-            positions = mt5.positions_get()
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            week_start = today - timedelta(days=today.weekday())
-            month_start = today.replace(day=1)
-            
-            history_today = mt5.history_deals_get(today, datetime.now())
-            history_week = mt5.history_deals_get(week_start, datetime.now())
-            history_month = mt5.history_deals_get(month_start, datetime.now())
-            
-            trades_today = len(history_today) if history_today else 0
-            profit_today = sum(d.profit for d in history_today) if history_today else 0
-            profit_week = sum(d.profit for d in history_week) if history_week else 0
-            profit_month = sum(d.profit for d in history_month) if history_month else 0
-            wins = sum(1 for d in history_today if d.profit > 0) if history_today else 0
-            winrate = (wins / trades_today * 100) if trades_today > 0 else 0
+        session = get_mt5_session()
+        if session.connect():
+            account = session.account_info()
+            positions = session.positions_get()
+            now = datetime.now()
+            ledger = get_deal_ledger()
+            ledger.sync(session, now)
+            periods = ledger.aggregates(now)
             
-            mt5.shutdown()
             return {
                 "status": "online",
                 "balance": account.balance if account else 0,
                 "equity": account.equity if account else 0,
-                "profit_today": round(profit_today, 2),
-                "profit_week": round(profit_week, 2),
-                "profit_month": round(profit_month, 2),
-                "trades_today": trades_today,
-                "winrate": round(winrate, 1),
+                "profit_today": periods["day"]["profit"],
+                "profit_week": periods["week"]["profit"],
+                "profit_month": periods["month"]["profit"],
+                "trades_today": periods["day"]["trades"],
+                "winrate": periods["day"]["winrate"],
                 "open_positions": len(positions) if positions else 0,
                 "drawdown": round(((account.balance - account.equity) / account.balance * 100), 2) if account and account.balance > 0 else 0,
+                "periods": periods,
                 "last_update": datetime.now().isoformat()
             }
-    except:
+        # Terminal installé mais injoignable (échec d'initialize ou délai de reconnexion): statut `degraded`
+        record_error(ConnectionError(f"MT5 indisponible: {session.last_error}"))
+    except ImportError:
         pass
+    except Exception as e:
+        record_error(e)
     return default
 
 
 def get_bot_status() -> Dict[str, Any]:
     """Vérifie si le bot MT5 est actif."""
+    status, processes = _service_status(PROCESS_PATTERNS["bot"])
+    last_signal = "N/A"
+    events = []
     try:
-        result = subprocess.run(
-            ["powershell", "-Command", "Get-Process python -ErrorAction SilentlyContinue | Where-Object {$_.CommandLine -like '*mt5*' -or $_.CommandLine -like '*bot*'}"],
-            capture_output=True, text=True, timeout=5
-        )
-        is_running = bool(result.stdout.strip())
-        last_signal = "N/A"
         bot_log = MT5_DATA / "bot.log"
         if bot_log.exists():
-            lines = bot_log.read_text(encoding="utf-8", errors="ignore").split("\n")[-50:]
-            for line in reversed(lines):
-                if any(x in line for x in ["SIGNAL", "BUY", "SELL"]):
-                    last_signal = line[-50:] if len(line) > 50 else line
-                    break
-        return {"status": "running" if is_running else "stopped", "last_signal": last_signal, "last_check": datetime.now().isoformat()}
-    except:
-        return {"status": "error", "last_signal": "N/A", "last_check": datetime.now().isoformat()}
+            events = LogTail(bot_log, STATE_DIR / "bot_log_checkpoint.json").scan()
+            if events:
+                line = events[0]["message"]
+                last_signal = line[-50:] if len(line) > 50 else line
+    except Exception as e:
+        record_error(e)
+    return {"status": status, "last_signal": last_signal, "events": events,
+            "processes": processes, "last_check": datetime.now().isoformat()}
 
 
 def get_wave_catcher_status() -> Dict[str, Any]:
     """Vérifie Wave Catcher status."""
-    try:
-        result = subprocess.run(
-            ["powershell", "-Command", "Get-Process python -ErrorAction SilentlyContinue | Where-Object {$_.CommandLine -like '*wave*'}"],
-            capture_output=True, text=True, timeout=5
-        )
-        is_running = bool(result.stdout.strip())
-        return {"status": "running" if is_running else "stopped", "last_signal": "N/A"}
-    except:
-        return {"status": "error", "last_signal": "N/A"}
+    status, processes = _service_status(PROCESS_PATTERNS["wave_catcher"])
+    return {"status": status, "last_signal": "N/A", "processes": processes}
+
+
+def get_services_status() -> Dict[str, Any]:
+    """Vérifie les services supplémentaires configurés dans EXTRA_SERVICES."""
+    services = {}
+    for name, patterns in EXTRA_SERVICES.items():
+        status, processes = _service_status(patterns)
+        services[name] = {"status": status, "processes": processes}
+    return services
 
 
 def get_kpis() -> Dict[str, Any]:
     """Récupère les KPIs CCPRO."""
-    kpis_file = CCPRO_DATA / "objectifs.json"
-    data = load_json(kpis_file, {})
     mois = datetime.now().strftime("%Y-%m")
     default_kpis = {
         "conquete_clients": {"cible": 5, "realise": 0, "unite": "clients"},
@@ -152,78 +2254,40 @@ def get_kpis() -> Dict[str, Any]:
         "rdv_clients": {"cible": 20, "realise": 0, "unite": "RDV"},
         "equipement": {"cible": 10, "realise": 0, "unite": "produits"}
     }
+    store = get_store()
+    if store is not None:
+        kpis = store.kpis(mois)
+        return default_kpis if kpis is None else kpis
+    data = load_json(CCPRO_DATA / "objectifs.json", {})
     return data.get(mois, default_kpis)
 
 
 def get_alerts() -> List[Dict]:
     """Récupère les alertes actives."""
+    store = get_store()
+    if store is not None:
+        return store.open_alerts()
     alertes_file = CCPRO_DATA / "alertes.json"
     data = load_json(alertes_file, {"alertes": []})
     return [a for a in data.get("alertes", []) if not a.get("traitee", False)]
 
 
-def generate_smart_alerts(clients: List, deals: List, mt5: Dict) -> List[Dict]:
-    """Génère des alertes intelligentes basées sur les données."""
-    alerts = []
-    now = datetime.now()
-    
-    # Alertes clients sans contact > 7 jours
-    for client in clients:
-        if not isinstance(client, dict):
-            continue
-        if client.get("dernier_contact"):
-            try:
-                last_contact = datetime.strptime(client["dernier_contact"], "%Y-%m-%d")
-                days = (now - last_contact).days
-                if days > 14:
-                    alerts.append({
-                        "id": f"auto_client_{client.get('id', 'x')}",
-                        "type": "relance",
-                        "priorite": "haute" if days > 21 else "moyenne",
-                        "client": client.get("name", "Client"),
-                        "message": f"Pas de contact depuis {days} jours",
-                        "date_creation": now.strftime("%Y-%m-%d"),
-                        "auto": True
-                    })
-            except:
-                pass
-    
-    # Alertes deals bloqués
-    for deal in deals:
-        if not isinstance(deal, dict):
-            continue
-        if deal.get("stage") in ["proposal", "negotiation"]:
-            alerts.append({
-                "id": f"auto_deal_{deal.get('id', 'x')}",
-                "type": "opportunite",
-                "priorite": "moyenne",
-                "client": deal.get("client", "Deal"),
-                "message": f"Deal '{deal.get('title', 'N/A')[:30]}' en attente",
-                "date_creation": now.strftime("%Y-%m-%d"),
-                "auto": True
-            })
-    
-    # Alerte trading si perte > 100$
-    if mt5.get("profit_today", 0) < -100:
-        alerts.append({
-            "id": "auto_mt5_loss",
-            "type": "incident",
-            "priorite": "haute",
-            "client": "MT5 Trading",
-            "message": f"Perte importante: {mt5['profit_today']:.2f}$",
-            "date_creation": now.strftime("%Y-%m-%d"),
-            "auto": True
-        })
-    
-    return alerts[:10]  # Max 10 alertes auto
+def generate_smart_alerts(frame: CrmFrame, mt5: Dict) -> List[Dict]:
+    """Génère des alertes intelligentes basées sur les données (règles ALERT_RULES)."""
+    tables = frame.tables(ALERT_RULES)
+    tables["mt5"] = {"profit_today": _column([float(mt5.get("profit_today", 0) or 0)], numeric=True)}
+    return evaluate_alert_rules(tables)
 
 
 def get_planning() -> Dict:
     """Récupère les RDV et relances."""
-    rdv_file = CCPRO_DATA / "rdv.json"
-    data = load_json(rdv_file, {"rdv": []})
     today = datetime.now().strftime("%Y-%m-%d")
-    rdv_today = [r for r in data.get("rdv", []) if r.get("date") == today]
+    store = get_store()
+    if store is not None:
+        rdv_today = store.rdv_on(today)
+    else:
+        data = load_json(CCPRO_DATA / "rdv.json", {"rdv": []})
+        rdv_today = [r for r in data.get("rdv", []) if r.get("date") == today]
     
     # Relances simulées (à connecter avec CRM réel)
     relances = [
@@ -235,14 +2299,13 @@ def get_planning() -> Dict:
     return {"rdv_today": rdv_today, "relances": relances}
 
 
-def get_clients() -> List[Dict]:
+def get_clients() -> List[Client]:
     """Récupère les clients CRM."""
-    clients_file = CRM_DATA / "clients.json"
-    data = load_json(clients_file, {"clients": []})
-    if data.get("clients"):
-        return data["clients"]
+    clients = load_json(CRM_DATA / "clients.json", [], parser=parse_clients)
+    if clients:
+        return clients
     # Clients de démo
-    return [
+    return decode_records(Client, [
         {"id": "cli_001", "name": "MAROC TEXTILE SARL", "type": "actif", "sector": "Textile", "score": 85},
         {"id": "cli_002", "name": "ATLAS IMPORT EXPORT", "type": "actif", "sector": "Commerce", "score": 92},
         {"id": "cli_003", "name": "OUJDA AGRO SA", "type": "actif", "sector": "Agroalimentaire", "score": 78},
@@ -251,22 +2314,21 @@ def get_clients() -> List[Dict]:
         {"id": "cli_006", "name": "NADOR LOGISTICS", "type": "prospect", "sector": "Transport", "score": 65},
         {"id": "cli_007", "name": "OUJDA MOTORS", "type": "actif", "sector": "Automobile", "score": 82},
         {"id": "cli_008", "name": "ORIENTAL TECH", "type": "prospect", "sector": "IT", "score": 70},
-    ]
+    ])
 
 
-def get_deals() -> List[Dict]:
+def get_deals() -> List[Deal]:
     """Récupère les deals pipeline."""
-    deals_file = CRM_DATA / "deals.json"
-    data = load_json(deals_file, {"deals": []})
-    if data.get("deals"):
-        return data["deals"]
-    return [
+    deals = load_json(CRM_DATA / "deals.json", [], parser=parse_deals)
+    if deals:
+        return deals
+    return decode_records(Deal, [
         {"id": "deal_001", "title": "Crédit Équipement Textile", "client": "cli_001", "value": 2500000, "stage": "negotiation"},
         {"id": "deal_002", "title": "Ligne de Trésorerie", "client": "cli_002", "value": 5000000, "stage": "proposal"},
         {"id": "deal_003", "title": "Extension Usine", "client": "cli_003", "value": 8000000, "stage": "qualification"},
         {"id": "deal_004", "title": "Leasing Engins BTP", "client": "cli_004", "value": 3500000, "stage": "closing"},
         {"id": "deal_005", "title": "Crédit Stock Pharmacie", "client": "cli_005", "value": 1500000, "stage": "won"},
-    ]
+    ])
 
 
 def get_skills() -> List[Dict]:
@@ -279,7 +2341,7 @@ def get_skills() -> List[Dict]:
     return sorted(skills, key=lambda x: x["name"])
 
 
-def get_predictions(mt5: Dict, clients: List, deals: List) -> List[Dict]:
+def get_predictions(mt5: Dict, frame: CrmFrame) -> List[Dict]:
     """Génère des prédictions IA basées sur les patterns."""
     predictions = []
     
@@ -290,23 +2352,21 @@ def get_predictions(mt5: Dict, clients: List, deals: List) -> List[Dict]:
         predictions.append({"type": "success", "icon": "🎯", "message": "Bonne semaine! Sécurisez les gains"})
     
     # Prédiction clients
-    prospects = [c for c in clients if isinstance(c, dict) and c.get("type") == "prospect"]
-    if len(prospects) >= 3:
-        predictions.append({"type": "opportunity", "icon": "💡", "message": f"{len(prospects)} prospects à convertir ce mois"})
+    prospects = frame.count("clients", "type", "==", "prospect")
+    if prospects >= 3:
+        predictions.append({"type": "opportunity", "icon": "💡", "message": f"{prospects} prospects à convertir ce mois"})
     
     # Prédiction pipeline
-    closing_deals = [d for d in deals if isinstance(d, dict) and d.get("stage") == "closing"]
+    closing_deals = frame.count("deals", "stage", "==", "closing")
     if closing_deals:
-        total = sum(d.get("value", 0) for d in closing_deals)
-        predictions.append({"type": "info", "icon": "📊", "message": f"{len(closing_deals)} deals près de clôturer ({total/1e6:.1f}M MAD)"})
+        total = frame.total("deals", "value", ("stage", "==", "closing"))
+        predictions.append({"type": "info", "icon": "📊", "message": f"{closing_deals} deals près de clôturer ({total/1e6:.1f}M MAD)"})
     
     return predictions[:5]
 
 
 def get_konan_signals() -> Dict[str, Any]:
     """Récupère les données KONAN Signals."""
-    KONAN_SIGNALS_DIR = Path(r"C:\Users\solan\clawd\skills\konan-signals")
-    
     default = {
         "stats": {
             "total_signals": 0, "wins": 0, "losses": 0, "pending": 0,
@@ -320,155 +2380,853 @@ def get_konan_signals() -> Dict[str, Any]:
     
     # Performance
     perf_file = KONAN_SIGNALS_DIR / "performance.json"
+    store = get_store()
     if perf_file.exists():
         try:
-            perf = json.loads(perf_file.read_text(encoding="utf-8"))
-            default["stats"] = perf.get("stats", default["stats"])
-            default["monthly"] = perf.get("monthly", {})
-            # 10 derniers signaux
-            signals = perf.get("signals", [])
-            default["recent_signals"] = sorted(
-                signals, key=lambda x: x.get("published_at", ""), reverse=True
-            )[:10]
-        except:
-            pass
+            if store is not None:
+                default.update(store.signal_summary())
+            else:
+                default.update(aggregate_performance(perf_file, STATE_DIR / "konan_signals_state.json"))
+        except Exception as e:
+            record_error(e)
     
     # Subscribers
     subs_file = KONAN_SIGNALS_DIR / "subscribers.json"
     if subs_file.exists():
         try:
-            subs = json.loads(subs_file.read_text(encoding="utf-8"))
-            sub_list = subs.get("subscribers", [])
-            active = [
-                s for s in sub_list 
-                if s.get("status") == "active" and 
-                datetime.fromisoformat(s.get("expires_at", "2000-01-01")) > datetime.now()
-            ]
+            sub_list, revenue = PARSE_CACHE.get(subs_file, parse_subscribers)
+            now = datetime.now()
+            active = sum(1 for s in sub_list if s.status == "active" and s.expires > now)
             default["subscribers"] = {
                 "total": len(sub_list),
-                "active": len(active),
-                "revenue": subs.get("stats", {}).get("total_revenue", 0)
+                "active": active,
+                "revenue": revenue
             }
-        except:
-            pass
+        except Exception as e:
+            record_error(e)
     
     return default
 
 
 def get_login_codes() -> List[Dict]:
     """Récupère les codes de connexion valides pour le dashboard."""
-    KONAN_SIGNALS_DIR = Path(r"C:\Users\solan\clawd\skills\konan-signals")
     subs_file = KONAN_SIGNALS_DIR / "subscribers.json"
     
     codes = []
     
     if subs_file.exists():
         try:
-            subs = json.loads(subs_file.read_text(encoding="utf-8"))
-            for sub in subs.get("subscribers", []):
+            sub_list, _ = PARSE_CACHE.get(subs_file, parse_subscribers)
+            now = datetime.now()
+            for sub in sub_list:
                 # Skip expired subscriptions
-                expires = datetime.fromisoformat(sub.get("expires_at", "2000-01-01"))
-                if expires < datetime.now() or sub.get("status") != "active":
+                if sub.expires < now or sub.status != "active":
                     continue
                 
                 # Add access_code (permanent)
-                if sub.get("access_code"):
+                if sub.access_code:
                     codes.append({
-                        "telegram_id": sub.get("telegram_id"),
-                        "code": sub.get("access_code"),
-                        "expires": sub.get("expires_at"),
-                        "name": sub.get("name") or sub.get("username") or "Trader",
-                        "plan": sub.get("plan", "monthly").upper()
+                        "telegram_id": sub.telegram_id,
+                        "code": sub.access_code,
+                        "expires": sub.expires_at,
+                        "name": sub.display_name,
+                        "plan": sub.plan.upper()
                     })
                 
                 # Add login_code (temporary, 24h)
-                if sub.get("login_code"):
-                    login_expires = sub.get("login_code_expires", "2000-01-01")
-                    if datetime.fromisoformat(login_expires) > datetime.now():
-                        codes.append({
-                            "telegram_id": sub.get("telegram_id"),
-                            "code": sub.get("login_code"),
-                            "expires": login_expires,
-                            "name": sub.get("name") or sub.get("username") or "Trader",
-                            "plan": sub.get("plan", "monthly").upper()
-                        })
-        except:
-            pass
+                if sub.login_code and sub.login_expires > now:
+                    codes.append({
+                        "telegram_id": sub.telegram_id,
+                        "code": sub.login_code,
+                        "expires": sub.login_code_expires,
+                        "name": sub.display_name,
+                        "plan": sub.plan.upper()
+                    })
+        except Exception as e:
+            record_error(e)
     
     return codes
 
 
+def get_history(mt5: Dict, kpis: Dict) -> Dict[str, Any]:
+    """Enregistre les métriques MT5 et KPI de la sync et retourne les séries sous-échantillonnées."""
+    values = {}
+    if mt5.get("status") == "online":
+        for field in HISTORY_MT5_FIELDS:
+            value = mt5.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[f"mt5.{field}"] = float(value)
+    for name, kpi in kpis.items():
+        value = kpi.get("realise") if isinstance(kpi, dict) else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"kpi.{name}"] = float(value)
+    store = get_history_store()
+    store.append(values)
+    return store.series()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         ALERT LIFECYCLE
+# ═══════════════════════════════════════════════════════════════════
+
+class AlertStore:
+    """Historique des alertes indexé par id (première/dernière apparition, résolution).
+
+    Fusionne alertes manuelles et automatiques en O(n), produit le delta
+    depuis la dernière sync (nouvelles, modifiées, résolues) et reporte les
+    alertes automatiques dans alertes.json: ajout à leur apparition,
+    `resolue_auto` à leur résolution (rouverte si la condition réapparaît),
+    retrait ALERT_RESOLVED_TTL_DAYS jours après la résolution.
+    Seule une alerte marquée `traitee` par l'utilisateur dans alertes.json
+    n'est plus affichée tant que sa condition persiste.
+    """
+
+    def __init__(self, state_file: Path, alerts_file: Path):
+        self.state_file = state_file
+        self.alerts_file = alerts_file
+        self.records: Dict[str, Dict[str, Any]] = load_json(state_file, {}, cache=False).get("alerts", {})
+
+    def update(self, manual: List[Dict], auto: List[Dict], resolve_missing: bool = True,
+               now: Optional[datetime] = None) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Retourne (alertes actives, delta depuis la dernière sync)."""
+        now = now or datetime.now()
+        stamp = now.isoformat(timespec="seconds")
+        file_alerts = load_json(self.alerts_file, {"alertes": []}).get("alertes", [])
+        # `traitee` n'est posé que par l'utilisateur (une résolution par la sync est `resolue_auto`)
+        acknowledged = {a.get("id") for a in file_alerts if a.get("traitee")}
+
+        # Les copies d'alertes auto reportées dans alertes.json ne comptent pas comme manuelles:
+        # seule la génération courante décide si elles sont encore actives
+        current: Dict[str, Dict] = {a["id"]: a for a in manual if not a.get("auto")}
+        for a in auto:
+            if a["id"] not in acknowledged and a["id"] not in current:
+                current[a["id"]] = a
+
+        delta = {"new": [], "changed": [], "resolved": []}
+        merged = []
+        for alert_id, alert in current.items():
+            fingerprint = content_hash({"type": alert.get("type"), "priorite": alert.get("priorite")})
+            rec = self.records.get(alert_id)
+            if rec is None or rec["status"] == "resolved":
+                rec = self.records[alert_id] = {"first_seen": stamp, "status": "active", "hash": fingerprint}
+                delta["new"].append(alert)
+            elif rec["hash"] != fingerprint:
+                rec["hash"] = fingerprint
+                delta["changed"].append(alert)
+            rec["last_seen"] = stamp
+            merged.append(dict(alert, first_seen=rec["first_seen"]))
+
+        cutoff = (now - timedelta(days=ALERT_RESOLVED_TTL_DAYS)).isoformat(timespec="seconds")
+        for alert_id, rec in list(self.records.items()):
+            if alert_id in current:
+                continue
+            if rec["status"] == "active" and resolve_missing:
+                rec.update(status="resolved", resolved_at=stamp)
+                delta["resolved"].append(alert_id)
+            elif rec["status"] == "resolved" and rec.get("resolved_at", "") < cutoff:
+                del self.records[alert_id]
+
+        if delta["new"] or delta["changed"] or delta["resolved"]:
+            save_json(self.state_file, {"alerts": self.records})
+        if ALERTS_WRITE_BACK:
+            self._write_back(file_alerts, [a for a in delta["new"] if a.get("auto")], set(delta["resolved"]),
+                             stamp, cutoff)
+        return merged, delta
+
+    def _write_back(self, file_alerts: List[Dict], new_auto: List[Dict], resolved: set, stamp: str, cutoff: str):
+        """Reporte les alertes auto nouvelles, rouvertes et résolues dans alertes.json (résolues avant `cutoff` retirées)."""
+        reopened = {a["id"]: a for a in new_auto}
+        updated = []
+        modified = False
+        for a in file_alerts:
+            alert_id = a.get("id")
+            if (a.get("auto") and a.get("resolue_auto") and alert_id not in reopened
+                    and str(a.get("date_resolution", "")) < cutoff):
+                modified = True
+                continue
+            if a.get("auto") and alert_id in resolved and not a.get("traitee") and not a.get("resolue_auto"):
+                a = dict(a, resolue_auto=True, date_resolution=stamp)
+                modified = True
+            elif alert_id in reopened:
+                if a.get("resolue_auto"):
+                    a = dict(reopened[alert_id], traitee=False)
+                    modified = True
+                del reopened[alert_id]
+            updated.append(a)
+        for a in reopened.values():
+            updated.append(dict(a, traitee=False))
+            modified = True
+        if modified:
+            data = dict(load_json(self.alerts_file, {}), alertes=updated)
+            save_json(self.alerts_file, data, pretty=True)
+
+
+_ALERT_STORE: Optional[AlertStore] = None
+
+
+def get_alert_store() -> AlertStore:
+    """Historique des alertes partagé par les syncs du processus."""
+    global _ALERT_STORE
+    if _ALERT_STORE is None:
+        _ALERT_STORE = AlertStore(STATE_DIR / "alerts_state.json", CCPRO_DATA / "alertes.json")
+    return _ALERT_STORE
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         COLLECTOR SCHEDULER
+# ═══════════════════════════════════════════════════════════════════
+
+@dataclass
+class Collector:
+    """Déclaration d'un collecteur: fonction, dépendances et budget temps."""
+    name: str
+    func: Callable[..., Any]
+    label: str
+    deps: Tuple[str, ...] = ()
+    timeout: float = COLLECTOR_TIMEOUT
+    default: Callable[[], Any] = dict
+    path: Tuple[str, ...] = ()  # Emplacement du résultat dans data.json
+    sources: Callable[[], List[Path]] = list  # Fichiers surveillés en mode --watch
+    live: bool = False  # Rafraîchi périodiquement (pas de fichier source)
+    decode: Optional[Callable[[Any], Any]] = None  # JSON de data.json -> records (valeurs de repli)
+
+
+COLLECTORS: List[Collector] = [
+    Collector("mt5", get_mt5_status, "📊 Collecte MT5...", timeout=15.0, path=("trading", "mt5"), live=True),
+    Collector("bot", get_bot_status, "🤖 Collecte Bot status...", timeout=8.0, path=("trading", "bot"),
+              sources=lambda: [MT5_DATA / "bot.log"], live=True),
+    Collector("wave_catcher", get_wave_catcher_status, "🌊 Collecte Wave Catcher...", timeout=8.0,
+              path=("trading", "wave_catcher"), live=True),
+    Collector("services", get_services_status, "🛰️ Collecte Services...", timeout=8.0,
+              path=("trading", "services"), live=True),
+    Collector("kpis", get_kpis, "📈 Collecte KPIs...", path=("kpis",),
+              sources=lambda: [CCPRO_DATA / "objectifs.json"]),
+    Collector("clients", get_clients, "👥 Collecte Clients...", default=list, path=("clients",),
+              sources=lambda: [CRM_DATA / "clients.json"], decode=lambda v: decode_records(Client, v)),
+    Collector("deals", get_deals, "💼 Collecte Deals...", default=list, path=("deals",),
+              sources=lambda: [CRM_DATA / "deals.json"], decode=lambda v: decode_records(Deal, v)),
+    Collector("alerts", get_alerts, "🚨 Collecte Alertes...", default=list,
+              sources=lambda: [CCPRO_DATA / "alertes.json"]),
+    Collector("crm_frame", get_crm_frame, "🧮 Vue colonnaire CRM...", deps=("clients", "deals"),
+              default=lambda: CrmFrame([], [])),
+    Collector("smart_alerts", generate_smart_alerts, "🚨 Génération Alertes auto...", deps=("crm_frame", "mt5"), default=list),
+    Collector("planning", get_planning, "📅 Collecte Planning...", path=("planning",),
+              sources=lambda: [CCPRO_DATA / "rdv.json"]),
+    Collector("skills", get_skills, "⚡ Collecte Skills...", default=list, path=("skills",),
+              sources=lambda: [SKILLS_DIR]),
+    Collector("predictions", get_predictions, "🧠 Génération Prédictions...", deps=("mt5", "crm_frame"), default=list, path=("predictions",)),
+    Collector("konan_signals", get_konan_signals, "📡 Collecte KONAN Signals...", path=("konan_signals",),
+              sources=lambda: [KONAN_SIGNALS_DIR / "performance.json", KONAN_SIGNALS_DIR / "subscribers.json"]),
+    Collector("login_codes", get_login_codes, "🔐 Collecte Login Codes...", default=list,
+              sources=lambda: [KONAN_SIGNALS_DIR / "subscribers.json"]),
+    Collector("history", get_history, "📉 Historique des métriques...", deps=("mt5", "kpis"), path=("history",)),
+]
+
+# Dernière valeur valide de chaque collecteur (repli en cas de délai dépassé)
+_LAST_GOOD: Dict[str, Any] = {}
+# Collecteurs en retard encore en cours d'une sync précédente: future et début d'exécution
+_IN_FLIGHT: Dict[str, Tuple[Future, float]] = {}
+
+
+def seed_last_good(collectors: List[Collector], snapshot: Dict[str, Any]):
+    """Initialise les valeurs de repli depuis le dernier data.json publié."""
+    for c in collectors:
+        if c.name in _LAST_GOOD or not c.path:
+            continue
+        node: Any = snapshot
+        for key in c.path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if node is not None:
+            _LAST_GOOD[c.name] = c.decode(node) if c.decode else node
+
+
+def _fallback(c: Collector) -> Any:
+    """Retourne la dernière valeur valide du collecteur, sinon sa valeur par défaut."""
+    if c.name in _LAST_GOOD:
+        return _LAST_GOOD[c.name]
+    return c.default()
+
+
+def _start_daemon(name: str, func: Callable[..., Any], *args) -> Future:
+    """Exécute `func` dans un thread démon: un collecteur bloqué ne retarde pas la sortie du processus."""
+    future: Future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=target, name=f"collector-{name}", daemon=True).start()
+    return future
+
+
+def expand_dependents(collectors: List[Collector], names: set) -> set:
+    """Ajoute aux collecteurs demandés tous ceux qui en dépendent (transitivement)."""
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for c in collectors:
+            if c.name not in selected and any(d in selected for d in c.deps):
+                selected.add(c.name)
+                changed = True
+    return selected
+
+
+def run_collectors(collectors: List[Collector], verbose: bool = True,
+                   only: Optional[set] = None) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+    """Exécute les collecteurs en parallèle selon leurs dépendances.
+
+    Chaque collecteur dispose de son propre budget temps; au-delà, sa dernière
+    valeur valide est utilisée et il est marqué `stale` dans le statut. Il
+    continue dans son thread démon et n'est pas relancé tant qu'il n'a pas
+    terminé (son résultat tardif devient la valeur de repli).
+    Un collecteur qui a absorbé des erreurs est marqué `degraded`; le statut
+    porte aussi ses mesures (CPU, octets lus, cache, date des sources).
+    Avec `only`, seuls ces collecteurs et leurs dépendants sont ré-exécutés;
+    les autres reprennent leur dernier résultat (`cached`).
+    """
+    names = {c.name for c in collectors}
+    for c in collectors:
+        missing = [d for d in c.deps if d not in names]
+        if missing:
+            raise ValueError(f"Collecteur {c.name}: dépendances inconnues {missing}")
+
+    results: Dict[str, Any] = {}
+    status: Dict[str, Dict] = {}
+    pending = list(collectors)
+    if only is not None:
+        selected = expand_dependents(collectors, only)
+        for c in collectors:
+            if c.name not in selected and c.name in _LAST_GOOD:
+                results[c.name] = _LAST_GOOD[c.name]
+                status[c.name] = {"status": "cached", "duration": 0}
+                pending.remove(c)
+    running: Dict[Any, Tuple[Collector, CollectorProbe, float, float]] = {}
+    while pending or running:
+        for c in [c for c in pending if all(d in results for d in c.deps)]:
+            pending.remove(c)
+            if c.name in _IN_FLIGHT:
+                previous, since = _IN_FLIGHT[c.name]
+                if not previous.done():
+                    results[c.name] = _fallback(c)
+                    status[c.name] = {"status": "stale", "duration": 0,
+                                      "error": f"toujours en cours depuis {time.monotonic() - since:.0f}s"}
+                    if verbose: print(f"   ⏱️ {c.name}: exécution précédente en cours, dernière valeur conservée")
+                    continue
+                del _IN_FLIGHT[c.name]
+                if previous.exception() is None:
+                    _LAST_GOOD[c.name] = previous.result()
+            if verbose: print(c.label)
+            probe = CollectorProbe()
+            started = time.monotonic()
+            future = _start_daemon(c.name, run_probed, probe, c.func, *(results[d] for d in c.deps))
+            running[future] = (c, probe, started, started + c.timeout)
+        if not running:
+            break
+        timeout = max(0.0, min(deadline for *_, deadline in running.values()) - time.monotonic())
+        done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        for future in list(running):
+            c, probe, started, deadline = running[future]
+            if future in done:
+                del running[future]
+                try:
+                    results[c.name] = future.result()
+                    _LAST_GOOD[c.name] = results[c.name]
+                    status[c.name] = {"status": "degraded" if probe.errors else "ok"}
+                except Exception as e:
+                    results[c.name] = _fallback(c)
+                    status[c.name] = {"status": "error", "exception": type(e).__name__,
+                                      "error": f"{type(e).__name__}: {e}"}
+            elif now >= deadline:
+                # Le collecteur en retard continue en arrière-plan sans bloquer la sync
+                del running[future]
+                _IN_FLIGHT[c.name] = (future, started)
+                results[c.name] = _fallback(c)
+                status[c.name] = {"status": "stale", "error": f"timeout après {c.timeout:.0f}s"}
+                if verbose: print(f"   ⏱️ {c.name}: délai dépassé, dernière valeur conservée")
+            else:
+                continue
+            status[c.name] = {**probe.to_dict(c.sources()), **status[c.name], "duration": round(now - started, 3)}
+
+    # Dépendances jamais satisfaites (cycle)
+    for c in pending:
+        results[c.name] = _fallback(c)
+        status[c.name] = {"status": "error", "error": "dépendances non résolues", "duration": 0}
+    return results, status
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         SECTIONED OUTPUT
+# ═══════════════════════════════════════════════════════════════════
+
+# Dernier snapshot publié (base du delta)
+_PREVIOUS_SNAPSHOT: Optional[Dict[str, Any]] = None
+# Empreinte de chaque section par identité de ses valeurs (résultats repris du cache non re-hachés)
+_SECTION_HASHES: Dict[str, Tuple[Tuple[int, ...], List[Any], str]] = {}
+# data.json en retard sur les sections (sync rapide sans snapshot complet)
+_SNAPSHOT_PENDING = False
+
+
+def strip_volatile(value: Any) -> Any:
+    """Copie d'une valeur JSON sans les champs VOLATILE_KEYS (horodatages, métriques)."""
+    if isinstance(value, dict):
+        return {k: strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [strip_volatile(v) for v in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    """Empreinte stable d'une valeur JSON, hors champs volatils."""
+    raw = json.dumps(strip_volatile(value), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _pointer(path: str, key: Any) -> str:
+    """Ajoute une clé à un JSON Pointer (RFC 6901)."""
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Opérations JSON Patch (RFC 6902) transformant `old` en `new`.
+
+    Les listes de même longueur sont comparées élément par élément, sinon
+    remplacées en bloc.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": _pointer(path, k)} for k in old if k not in new]
+        for k, v in new.items():
+            if k not in old:
+                ops.append({"op": "add", "path": _pointer(path, k), "value": v})
+            else:
+                ops.extend(json_diff(old[k], v, _pointer(path, k)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(json_diff(a, b, _pointer(path, i)))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _remove_orphan_sections():
+    """Supprime les fichiers (et copies .gz/.br) des sections absentes de DASHBOARD_SECTIONS."""
+    for path in SECTIONS_DIR.glob("*.json*"):
+        name = path.name.split(".", 1)[0]
+        if name and name not in DASHBOARD_SECTIONS:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def write_sections(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Écrit les sections modifiées, le manifest versionné et le delta JSON Patch.
+
+    Retourne le manifest; seules les sections dont l'empreinte (hors champs
+    volatils) a changé sont réécrites. Si aucune n'a changé, rien n'est écrit.
+    Les sections de PASSIVE_SECTIONS (mesures, delta des alertes) suivent les autres:
+    elles ne comptent pas dans la décision mais sont réécrites avec elles.
+    Les fichiers de sections retirées de DASHBOARD_SECTIONS sont supprimés.
+    """
+    global _PREVIOUS_SNAPSHOT
+    previous_manifest = load_json(MANIFEST_FILE, {}, cache=False)
+    previous_sections = previous_manifest.get("sections", {})
+    if _PREVIOUS_SNAPSHOT is None:
+        _PREVIOUS_SNAPSHOT = load_json(DATA_FILE, {}, cache=False)
+
+    sections = {}
+    changed = []
+    passive = []
+    for name, keys in DASHBOARD_SECTIONS.items():
+        content = {key: data[key] for key in keys if key in data}
+        values = list(content.values())
+        ids = tuple(map(id, values))
+        memo = _SECTION_HASHES.get(name)
+        digest = memo[2] if memo and memo[0] == ids else content_hash(content)
+        _SECTION_HASHES[name] = (ids, values, digest)
+        prev = previous_sections.get(name, {})
+        section_file = SECTIONS_DIR / f"{name}.json"
+        if prev.get("hash") == digest and section_file.exists():
+            sections[name] = prev
+            continue
+        if name in PASSIVE_SECTIONS:
+            # Décidé après les autres sections
+            passive.append((name, content, digest, prev))
+            continue
+        save_json(section_file, content, compress=COMPRESS_OUTPUT)
+        sections[name] = {
+            "file": f"sections/{name}.json",
+            "hash": digest,
+            "version": prev.get("version", 0) + 1,
+            "bytes": section_file.stat().st_size
+        }
+        changed.append(name)
+
+    removed = [name for name in previous_sections if name not in DASHBOARD_SECTIONS]
+    if not changed and not removed and previous_manifest:
+        return dict(previous_manifest, changed=[])
+    for name, content, digest, prev in passive:
+        section_file = SECTIONS_DIR / f"{name}.json"
+        save_json(section_file, content, compress=COMPRESS_OUTPUT)
+        sections[name] = {
+            "file": f"sections/{name}.json",
+            "hash": digest,
+            "version": prev.get("version", 0) + 1,
+            "bytes": section_file.stat().st_size
+        }
+        changed.append(name)
+    version = previous_manifest.get("version", 0) + 1
+    manifest = {"version": version, "generated": datetime.now().isoformat(), "changed": changed, "sections": sections}
+    save_json(MANIFEST_FILE, manifest)
+    _remove_orphan_sections()
+    save_json(DELTA_FILE, {
+        "from": previous_manifest.get("version", 0),
+        "to": version,
+        "ops": json_diff(_PREVIOUS_SNAPSHOT, data)
+    })
+    _PREVIOUS_SNAPSHOT = data
+    return manifest
+
+
+def hash_login_code(code: str) -> str:
+    """Clé de l'index: SHA-256 du code normalisé (identique côté /api/validate)."""
+    return hashlib.sha256(str(code).upper().strip().encode("utf-8")).hexdigest()
+
+
+def build_login_index(codes: List[Dict], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Index code haché -> abonné; les codes expirés sont écartés à la construction."""
+    now = now or datetime.now()
+    index = {}
+    expiries: Dict[str, datetime] = {}
+    next_expiry = None
+    for entry in codes:
+        try:
+            # Heure locale naïve, avec ou sans décalage dans la date source
+            expires = _parse_datetime(entry.get("expires"))
+        except (TypeError, ValueError, OverflowError):
+            continue
+        if expires <= now or not entry.get("code"):
+            continue
+        key = hash_login_code(entry["code"])
+        # Un même code présent deux fois: garder l'expiration la plus lointaine
+        if key in index and expiries[key] >= expires:
+            continue
+        index[key] = {k: entry.get(k) for k in ("telegram_id", "name", "plan", "expires")}
+        expiries[key] = expires
+        if next_expiry is None or expires < next_expiry[0]:
+            next_expiry = (expires, entry["expires"])
+    return {"version": 1, "next_expiry": next_expiry[1] if next_expiry else None, "codes": index}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         PUBLISH PIPELINE
+# ═══════════════════════════════════════════════════════════════════
+
+def published_files(extras: bool = True) -> List[Path]:
+    """Fichiers de sortie à publier, relatifs à DASHBOARD_DIR (sans .gz/.br ni delta.json si `extras` est faux).
+
+    Seules les sections listées par le manifest courant sont publiées.
+    """
+    public = DASHBOARD_DIR / "public"
+    files = [public / name for name in ("data.json", "manifest.json") + (("delta.json",) if extras else ())]
+    sections = load_json(MANIFEST_FILE, {}, cache=False).get("sections", {})
+    files += sorted(public / entry["file"] for entry in sections.values() if isinstance(entry, dict) and "file" in entry)
+    if extras:
+        files += [f.with_name(f.name + ext) for f in list(files) for ext in (".gz", ".br")]
+    files.append(LOGIN_INDEX_FILE)
+    return [f.relative_to(DASHBOARD_DIR) for f in files if f.exists()]
+
+
+class GitBackend:
+    """Publie par git add/commit/push dans le dépôt du dashboard (redéploiement Vercel).
+
+    Par défaut seuls les JSON servis sont committés: la plateforme compresse
+    elle-même et ne lit pas delta.json (voir PUBLISH_GIT_EXTRAS).
+    """
+    name = "git"
+
+    def __init__(self, repo_dir: Path, extras: bool = PUBLISH_GIT_EXTRAS):
+        self.repo_dir = repo_dir
+        self.extras = extras
+
+    def _git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], cwd=self.repo_dir, capture_output=True, text=True, check=check)
+
+    def publish(self, files: List[Path], message: str) -> bool:
+        paths = [str(f) for f in files]
+        self._git("add", "--", *paths)
+        committed = False
+        if self._git("diff", "--cached", "--quiet", "--", *paths, check=False).returncode != 0:
+            self._git("commit", "-m", message, "--", *paths)
+            committed = True
+        # Pousser aussi un commit resté local après un échec précédent
+        ahead = self._git("rev-list", "--count", "@{upstream}..HEAD", check=False)
+        if (int(ahead.stdout.strip()) if ahead.returncode == 0 else committed) > 0:
+            self._git("push")
+            return True
+        return False
+
+
+class DirectoryBackend:
+    """Copie les fichiers modifiés vers un dossier (partage réseau, serveur statique...)."""
+    name = "directory"
+    extras = True
+
+    def __init__(self, target: Path):
+        self.target = target
+
+    def publish(self, files: List[Path], message: str) -> bool:
+        copied = False
+        for rel in files:
+            src, dst = DASHBOARD_DIR / rel, self.target / rel
+            if dst.exists() and dst.stat().st_size == src.stat().st_size and _file_sha256(dst) == _file_sha256(src):
+                continue
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomic(dst, src.read_bytes())
+            copied = True
+        return copied
+
+
+class HttpBackend:
+    """Envoie les fichiers modifiés par HTTP PUT sur `base_url/<chemin>`."""
+    name = "http"
+    extras = True
+
+    def __init__(self, base_url: str, state_file: Path):
+        self.base_url = base_url.rstrip("/")
+        self.state_file = state_file
+
+    def publish(self, files: List[Path], message: str) -> bool:
+        uploaded = load_json(self.state_file, {}, cache=False)
+        sent = False
+        for rel in files:
+            src = DASHBOARD_DIR / rel
+            digest = _file_sha256(src)
+            key = rel.as_posix()
+            if uploaded.get(key) == digest:
+                continue
+            request = urllib.request.Request(f"{self.base_url}/{key}", data=src.read_bytes(), method="PUT",
+                                             headers={"Content-Type": "application/json", "X-Sync-Message": message})
+            with urllib.request.urlopen(request, timeout=30):
+                pass
+            uploaded[key] = digest
+            sent = True
+        if sent:
+            save_json(self.state_file, uploaded)
+        return sent
+
+
+class ObjectStoreBackend:
+    """Store d'objets local adressé par contenu: objets/<sha256> + index des chemins publiés."""
+    name = "object_store"
+    extras = True
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def publish(self, files: List[Path], message: str) -> bool:
+        index_file = self.root / "index.json"
+        index = load_json(index_file, {"files": {}}, cache=False)
+        entries = dict(index.get("files", {}))
+        for rel in files:
+            src = DASHBOARD_DIR / rel
+            digest = _file_sha256(src)
+            blob = self.root / "objects" / digest[:2] / digest
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                write_bytes_atomic(blob, src.read_bytes())
+            entries[rel.as_posix()] = digest
+        if entries == index.get("files"):
+            return False
+        save_json(index_file, {"files": entries, "message": message, "published": datetime.now().isoformat()})
+        return True
+
+
+def make_publish_backend(kind: str = None, target: str = None):
+    """Instancie le backend de publication configuré."""
+    kind = kind or PUBLISH_BACKEND
+    target = target if target is not None else PUBLISH_TARGET
+    if kind == "git":
+        return GitBackend(Path(target) if target else DASHBOARD_DIR, PUBLISH_GIT_EXTRAS)
+    if kind == "directory":
+        return DirectoryBackend(Path(target))
+    if kind == "http":
+        return HttpBackend(target, STATE_DIR / "publish_http.json")
+    if kind == "object_store":
+        return ObjectStoreBackend(Path(target) if target else STATE_DIR / "object_store")
+    raise ValueError(f"Backend de publication inconnu: {kind}")
+
+
+class Publisher:
+    """Étape de publication: regroupe les snapshots en attente en une seule publication.
+
+    Une publication a lieu au plus toutes les `min_interval` secondes; l'état
+    (snapshots en attente, dernière publication) est persisté pour que des
+    exécutions cron successives se regroupent aussi.
+    """
+
+    def __init__(self, backend, min_interval: float = PUBLISH_MIN_INTERVAL, state_file: Optional[Path] = None):
+        self.backend = backend
+        self.min_interval = min_interval
+        self.state_file = state_file or STATE_DIR / "publish_state.json"
+        self.state = load_json(self.state_file, {"pending": 0, "last_publish": 0}, cache=False)
+
+    def _save(self):
+        save_json(self.state_file, self.state)
+
+    def submit(self):
+        """Signale un nouveau snapshot à publier."""
+        self.state["pending"] = self.state.get("pending", 0) + 1
+        self._save()
+
+    def due(self) -> bool:
+        return self.state.get("pending", 0) > 0 and time.time() - self.state.get("last_publish", 0) >= self.min_interval
+
+    def flush(self, force: bool = False, verbose: bool = True) -> bool:
+        """Publie les snapshots en attente si l'intervalle minimal est écoulé."""
+        pending = self.state.get("pending", 0)
+        if not pending or (not force and not self.due()):
+            if pending and verbose:
+                print(f"⏳ Publication différée ({pending} snapshot(s) en attente)")
+            return False
+        message = f"sync: {datetime.now().strftime('%Y-%m-%d %H:%M')} ({pending} snapshot(s))"
+        for attempt in range(PUBLISH_RETRIES):
+            try:
+                published = self.backend.publish(published_files(self.backend.extras), message)
+                break
+            except Exception as e:
+                if verbose: print(f"⚠️ Publication {self.backend.name} échouée ({attempt + 1}/{PUBLISH_RETRIES}): {e}")
+                if attempt + 1 == PUBLISH_RETRIES:
+                    return False
+                time.sleep(PUBLISH_BACKOFF * 2 ** attempt)
+        self.state = {"pending": 0, "last_publish": time.time()}
+        self._save()
+        if verbose:
+            if not published:
+                print("✅ Rien à publier, arbre inchangé")
+            elif self.backend.name == "git":
+                print("✅ Push réussi! Vercel redéploie automatiquement (~30s)")
+            else:
+                print(f"✅ Publication {self.backend.name} réussie")
+        return published
+
+
+_PUBLISHER: Optional[Publisher] = None
+
+
+def get_publisher() -> Publisher:
+    """Publisher partagé par les syncs du processus."""
+    global _PUBLISHER
+    if _PUBLISHER is None:
+        _PUBLISHER = Publisher(make_publish_backend(), min_interval=PUBLISH_MIN_INTERVAL)
+    return _PUBLISHER
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         METRICS EXPORT
+# ═══════════════════════════════════════════════════════════════════
+
+_METRICS = (
+    ("konan_collector_duration_seconds", "Durée (wall) du collecteur", "duration"),
+    ("konan_collector_cpu_seconds", "Temps CPU du collecteur", "cpu"),
+    ("konan_collector_bytes_read", "Octets lus par le collecteur", "bytes_read"),
+    ("konan_collector_cache_hits", "Lectures servies par le cache", "cache_hits"),
+    ("konan_collector_cache_misses", "Lectures parsées à nouveau", "cache_misses"),
+)
+
+
+def _prometheus_text(status: Dict[str, Dict], duration: float, now: float) -> str:
+    """Mesures de la sync au format d'exposition texte Prometheus."""
+    lines = []
+    for metric, help_text, key in _METRICS:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [f'{metric}{{collector="{name}"}} {st[key]}' for name, st in status.items() if key in st]
+    lines += ["# HELP konan_collector_up 1 si le collecteur est ok ou en cache, 0 sinon",
+              "# TYPE konan_collector_up gauge"]
+    for name, st in status.items():
+        up = int(st["status"] in ("ok", "cached"))
+        lines.append(f'konan_collector_up{{collector="{name}",status="{st["status"]}"}} {up}')
+    lines += ["# HELP konan_collector_source_age_seconds Âge de la source la plus récente du collecteur",
+              "# TYPE konan_collector_source_age_seconds gauge"]
+    for name, st in status.items():
+        if st.get("source_mtime"):
+            age = now - datetime.fromisoformat(st["source_mtime"]).timestamp()
+            lines.append(f'konan_collector_source_age_seconds{{collector="{name}"}} {max(0.0, age):.0f}')
+    lines += ["# HELP konan_sync_duration_seconds Durée totale de la dernière sync",
+              "# TYPE konan_sync_duration_seconds gauge", f"konan_sync_duration_seconds {duration:.3f}",
+              "# HELP konan_sync_timestamp_seconds Fin de la dernière sync (epoch)",
+              "# TYPE konan_sync_timestamp_seconds gauge", f"konan_sync_timestamp_seconds {now:.0f}"]
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(status: Dict[str, Dict], duration: float):
+    """Exporte les mesures de la sync vers METRICS_FILE (Prometheus) et TRACE_FILE (JSON-lines)."""
+    now = time.time()
+    if METRICS_FILE is not None:
+        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(METRICS_FILE, _prometheus_text(status, duration, now).encode("utf-8"))
+    if TRACE_FILE is not None:
+        TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        if TRACE_FILE.exists() and TRACE_FILE.stat().st_size > TRACE_MAX_BYTES:
+            os.replace(TRACE_FILE, TRACE_FILE.with_name(TRACE_FILE.name + ".1"))
+        record = {"time": datetime.fromtimestamp(now).isoformat(timespec="milliseconds"),
+                  "duration": round(duration, 3), "collectors": status}
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
 # ═══════════════════════════════════════════════════════════════════
 #                         MAIN SYNC
 # ═══════════════════════════════════════════════════════════════════
 
-def sync_dashboard(push: bool = False, verbose: bool = True):
-    """Synchronise toutes les données du dashboard."""
-    if verbose:
-        print("╔══════════════════════════════════════════════════════════════╗")
-        print("║       KONAN DASHBOARD SYNC v3.0                              ║")
-        print("╚══════════════════════════════════════════════════════════════╝\n")
-    
-    # Collecter toutes les données
-    if verbose: print("📊 Collecte MT5...")
-    mt5_data = get_mt5_status()
-    
-    if verbose: print("🤖 Collecte Bot status...")
-    bot_data = get_bot_status()
-    
-    if verbose: print("🌊 Collecte Wave Catcher...")
-    wave_data = get_wave_catcher_status()
-    
-    if verbose: print("📈 Collecte KPIs...")
-    kpis = get_kpis()
-    
-    if verbose: print("👥 Collecte Clients...")
-    clients = get_clients()
-    
-    if verbose: print("💼 Collecte Deals...")
-    deals = get_deals()
-    
-    if verbose: print("🚨 Collecte Alertes...")
-    alerts = get_alerts()
-    smart_alerts = generate_smart_alerts(clients, deals, mt5_data)
-    all_alerts = alerts + [a for a in smart_alerts if a["id"] not in [x["id"] for x in alerts]]
-    
-    if verbose: print("📅 Collecte Planning...")
-    planning = get_planning()
-    
-    if verbose: print("⚡ Collecte Skills...")
-    skills = get_skills()
-    
-    if verbose: print("🧠 Génération Prédictions...")
-    predictions = get_predictions(mt5_data, clients, deals)
-    
-    if verbose: print("📡 Collecte KONAN Signals...")
-    konan_signals = get_konan_signals()
+def build_dashboard_data(results: Dict[str, Any], status: Dict[str, Dict], all_alerts: List[Dict],
+                         alerts_delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Assemble data.json à partir des résultats des collecteurs et des alertes fusionnées."""
+    mt5_data = results["mt5"]
+    bot_data = results["bot"]
+    wave_data = results["wave_catcher"]
+    kpis = results["kpis"]
+    clients = results["clients"]
+    deals = results["deals"]
+    planning = results["planning"]
+    skills = results["skills"]
+    predictions = results["predictions"]
+    konan_signals = results["konan_signals"]
     
-    if verbose: print("🔐 Collecte Login Codes...")
-    login_codes = get_login_codes()
-    
-    # Calculer stats
-    active_clients = len([c for c in clients if isinstance(c, dict) and c.get("type") == "actif"])
-    prospects = len([c for c in clients if isinstance(c, dict) and c.get("type") == "prospect"])
-    pipeline_total = sum(d.get("value", 0) for d in deals if isinstance(d, dict) and d.get("stage") != "won")
+    # Calculer stats (sur la vue colonnaire)
+    frame = results["crm_frame"]
+    active_clients = frame.count("clients", "type", "==", "actif")
+    prospects = frame.count("clients", "type", "==", "prospect")
+    pipeline_total = frame.total("deals", "value", ("stage", "!=", "won"))
     
     # Construire data.json
     data = {
         "trading": {
             "mt5": mt5_data,
             "bot": bot_data,
-            "wave_catcher": wave_data
+            "wave_catcher": wave_data,
+            "services": results["services"]
         },
         "konan_signals": konan_signals,
-        "login_codes": login_codes,
         "alerts": all_alerts,
+        "alerts_delta": alerts_delta,
         "kpis": kpis,
         "planning": planning,
         "predictions": predictions,
-        "clients": clients,
-        "deals": deals,
+        "clients": encode_records(clients),
+        "deals": encode_records(deals),
         "skills": skills,
+        "history": results["history"],
         "stats": {
             "skillsCount": len(skills),
             "clientsCount": len(clients),
@@ -479,46 +3237,467 @@ def sync_dashboard(push: bool = False, verbose: bool = True):
             "alertsCount": len(all_alerts),
             "rdvToday": len(planning.get("rdv_today", [])),
             "lastUpdate": datetime.now().isoformat()
+        },
+        "meta": {
+            "collectors": status,
+            "stale": sorted(name for name, st in status.items() if st["status"] in ("stale", "error")),
+            "degraded": sorted(name for name, st in status.items() if st["status"] == "degraded")
         }
     }
+    return data
+
+
+def sync_dashboard(push: bool = False, verbose: bool = True, only: Optional[set] = None, snapshot: bool = True):
+    """Synchronise toutes les données du dashboard.
+
+    `only` limite la collecte aux collecteurs nommés (et à leurs dépendants),
+    les autres sections étant reprises du cache (mode --watch). Avec
+    `snapshot=False`, seules les sections sont écrites; data.json est mis à
+    jour à la prochaine sync complète.
+    """
+    global _SNAPSHOT_PENDING
+    if verbose:
+        print("╔══════════════════════════════════════════════════════════════╗")
+        print("║       KONAN DASHBOARD SYNC v3.0                              ║")
+        print("╚══════════════════════════════════════════════════════════════╝\n")
+    sync_started = time.monotonic()
+    
+    # Collecter toutes les données (en parallèle, avec délai par collecteur)
+    cache_file = STATE_DIR / "parse_cache"
+    if PARSE_CACHE_PERSIST and not PARSE_CACHE.loaded:
+        PARSE_CACHE.load(cache_file)
+    if any(c.path and c.name not in _LAST_GOOD for c in COLLECTORS):
+        seed_last_good(COLLECTORS, load_json(DATA_FILE, {}, cache=False))
+    store = get_store(ready=False)
+    if store is not None:
+        try:
+            imported = store.import_sources()
+            if verbose and imported:
+                print(f"🗄️ Store SQLite: {', '.join(imported)} réimporté(s)")
+        except sqlite3.Error as e:
+            if verbose:
+                print(f"⚠️ Store SQLite indisponible, lecture des fichiers JSON: {e}")
+    results, status = run_collectors(COLLECTORS, verbose=verbose, only=only)
+    # Résolution des alertes absentes seulement si toute la chaîne qui les produit est saine
+    complete = all(status[name]["status"] in ("ok", "cached") for name in ALERT_RESOLVE_REQUIRES)
+    all_alerts, alerts_delta = get_alert_store().update(results["alerts"], results["smart_alerts"],
+                                                        resolve_missing=complete)
+    data = build_dashboard_data(results, status, all_alerts, alerts_delta)
+    data["meta"]["parse_cache"] = PARSE_CACHE.stats()
+    if PARSE_CACHE_PERSIST:
+        try:
+            PARSE_CACHE.save(cache_file)
+        except (OSError, TypeError, ValueError):
+            pass
+    mt5_data = data["trading"]["mt5"]
+    skills, clients, deals = data["skills"], data["clients"], data["deals"]
+    all_alerts, planning = data["alerts"], data["planning"]
     
-    # Sauvegarder
-    save_json(DATA_FILE, data)
+    # Sauvegarder (sections versionnées + snapshot complet), sauf sync sans changement
+    manifest = write_sections(data)
+    changed = bool(manifest["changed"])
+    if _LIVE_FEED is not None:
+        _LIVE_FEED.publish(manifest["version"], data, manifest["changed"])
+    if (changed or _SNAPSHOT_PENDING) and snapshot:
+        save_json(DATA_FILE, data, compress=COMPRESS_OUTPUT)
+    _SNAPSHOT_PENDING = (changed or _SNAPSHOT_PENDING) and not snapshot
+    if status["login_codes"]["status"] == "ok":
+        changed |= save_json(LOGIN_INDEX_FILE, build_login_index(results["login_codes"]))
     if verbose:
-        print(f"\n✅ data.json mis à jour: {DATA_FILE}")
+        if changed:
+            print(f"\n✅ data.json mis à jour: {DATA_FILE}")
+            print(f"   • Sections modifiées: {', '.join(manifest['changed'])} (v{manifest['version']})")
+        else:
+            print(f"\n✅ Aucun changement, data.json conservé (v{manifest['version']})")
         print(f"   • MT5: {mt5_data['status']} | Balance: ${mt5_data['balance']:,.0f}")
         print(f"   • P&L Jour: ${mt5_data['profit_today']:+.2f}")
         print(f"   • Skills: {len(skills)} | Clients: {len(clients)} | Deals: {len(deals)}")
         print(f"   • Alertes: {len(all_alerts)} | RDV: {len(planning.get('rdv_today', []))}")
+        if data["meta"]["stale"]:
+            print(f"   • ⚠️ Données périmées: {', '.join(data['meta']['stale'])}")
+        if data["meta"]["degraded"]:
+            print(f"   • ⚠️ Collecte dégradée: {', '.join(data['meta']['degraded'])}")
+        slowest = sorted(status.items(), key=lambda item: item[1]["duration"], reverse=True)[:3]
+        print("   • ⏱️ Plus lents: " + ", ".join(f"{name} {st['duration']:.2f}s" for name, st in slowest))
     
-    # Push vers GitHub si demandé
+    # Publication si demandée (regroupée selon PUBLISH_MIN_INTERVAL)
     if push:
-        if verbose: print("\n🚀 Push vers GitHub...")
-        try:
-            os.chdir(DASHBOARD_DIR)
-            subprocess.run(["git", "add", "public/data.json"], check=True, capture_output=True)
-            subprocess.run(["git", "commit", "-m", f"sync: {datetime.now().strftime('%Y-%m-%d %H:%M')}"], capture_output=True)
-            result = subprocess.run(["git", "push"], capture_output=True, text=True)
-            if result.returncode == 0:
-                if verbose: print("✅ Push réussi! Vercel redéploie automatiquement (~30s)")
-            else:
-                if verbose: print(f"⚠️ Push warning: {result.stderr}")
-        except Exception as e:
-            if verbose: print(f"❌ Erreur push: {e}")
+        publisher = get_publisher()
+        if changed:
+            publisher.submit()
+        if verbose and publisher.due(): print(f"\n🚀 Publication ({publisher.backend.name})...")
+        publisher.flush(verbose=verbose)
     
+    try:
+        export_metrics(status, time.monotonic() - sync_started)
+    except OSError as e:
+        if verbose: print(f"⚠️ Export des mesures impossible: {e}")
     return data
 
 
+def profile_sync(push: bool = False, verbose: bool = True, output: Optional[Path] = None):
+    """Sync sous cProfile (threads collecteurs compris) et tracemalloc; affiche les points chauds."""
+    global _PROFILES
+    output = output or STATE_DIR / "sync.prof"
+    _PROFILES = []
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        profiler.runcall(sync_dashboard, push=push, verbose=verbose)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        profiles, _PROFILES = _PROFILES, None
+    stats = pstats.Stats(profiler)
+    for thread_profile in profiles:
+        stats.add(thread_profile)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(output)
+    print(f"\n🔬 Profil CPU ({PROFILE_TOP} premières lignes, temps cumulé) — complet: {output}")
+    stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+    print(f"🧠 Mémoire: pic {peak / 1024 / 1024:.1f} Mo — principales allocations:")
+    for stat in snapshot.statistics("lineno")[:10]:
+        print(f"   • {stat}")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         WATCH MODE
+# ═══════════════════════════════════════════════════════════════════
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Signature (mtime_ns, taille) d'un fichier, None s'il n'existe pas."""
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class SourceWatcher:
+    """Surveille les fichiers sources des collecteurs par scrutation mtime/taille."""
+
+    def __init__(self, collectors: List[Collector]):
+        self.owners: Dict[Path, set] = {}
+        for c in collectors:
+            for path in c.sources():
+                self.owners.setdefault(Path(path), set()).add(c.name)
+        self.signatures = {path: _file_signature(path) for path in self.owners}
+
+    def poll(self) -> set:
+        """Retourne les collecteurs dont une source a changé depuis le dernier appel."""
+        changed = set()
+        for path, owners in self.owners.items():
+            sig = _file_signature(path)
+            if sig != self.signatures[path]:
+                self.signatures[path] = sig
+                changed |= owners
+        return changed
+
+    def wait_quiet(self, changed: set, debounce: float = WATCH_DEBOUNCE, max_delay: float = WATCH_MAX_DELAY) -> set:
+        """Regroupe une rafale d'écritures: attend `debounce` s sans changement (max `max_delay`)."""
+        started = quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < debounce and time.monotonic() - started < max_delay:
+            time.sleep(min(WATCH_POLL_INTERVAL, debounce))
+            more = self.poll()
+            if more:
+                changed |= more
+                quiet_since = time.monotonic()
+        return changed
+
+
+def watch_dashboard(push: bool = False, verbose: bool = True, live_interval: float = WATCH_LIVE_INTERVAL,
+                    fast: Optional[set] = None, fast_interval: float = WATCH_LIVE_INTERVAL):
+    """Mode démon: re-synchronise dès qu'une source change, uniquement les collecteurs concernés.
+
+    Les collecteurs de `fast` sont en plus rafraîchis toutes les `fast_interval` secondes.
+    """
+    sync_dashboard(push=push, verbose=verbose)
+    watcher = SourceWatcher(COLLECTORS)
+    live = {c.name for c in COLLECTORS if c.live}
+    last_live = last_fast = time.monotonic()
+    day = datetime.now().date()
+    if verbose: print(f"\n👀 Surveillance de {len(watcher.owners)} sources (Ctrl+C pour arrêter)...")
+    try:
+        while True:
+            time.sleep(WATCH_POLL_INTERVAL)
+            changed = watcher.poll()
+            if changed:
+                changed = watcher.wait_quiet(changed)
+            if time.monotonic() - last_live >= live_interval:
+                changed |= live
+                last_live = time.monotonic()
+            if fast and time.monotonic() - last_fast >= fast_interval:
+                changed |= fast
+                last_fast = time.monotonic()
+            if datetime.now().date() != day:
+                # Changement de jour: RDV, KPIs du mois et alertes dépendent de la date
+                day = datetime.now().date()
+                changed = {c.name for c in COLLECTORS}
+            if push and get_publisher().due():
+                get_publisher().flush(verbose=verbose)
+            if not changed:
+                continue
+            started = time.monotonic()
+            # Rafraîchissement rapide seul: sections et flux live, data.json à la prochaine sync complète
+            full = not fast or not changed <= fast
+            sync_dashboard(push=push, verbose=False, only=changed, snapshot=full)
+            if verbose and full:
+                print(f"🔄 [{datetime.now():%H:%M:%S}] {', '.join(sorted(changed))} ({time.monotonic() - started:.2f}s)")
+    except KeyboardInterrupt:
+        if verbose: print("\n👋 Surveillance arrêtée")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                         LIVE FEED (SSE)
+# ═══════════════════════════════════════════════════════════════════
+
+def _sse(event: str, version: int, payload: Dict[str, Any]) -> bytes:
+    """Encode un événement Server-Sent Events (une ligne data JSON)."""
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {version}\nevent: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+class LiveFeed:
+    """Diffuse en Server-Sent Events les sections modifiées par chaque sync.
+
+    Un événement `update` (id = version du manifest) porte, par section, un
+    JSON Patch par rapport à la version précédente ou le contenu complet si le
+    patch dépasse LIVE_MAX_OPS opérations. Les derniers événements restent dans
+    un tampon borné (LIVE_REPLAY_EVENTS / LIVE_REPLAY_BYTES) pour les reprises
+    via Last-Event-ID; un client plus ancien, ou nouveau, reçoit un `snapshot`
+    (toutes les sections en contenu complet).
+    Un client lent reçoit en un seul `update` les sections modifiées pendant
+    son retard (contenu complet). Une requête portant une origine hors de
+    `origins` est refusée; avec `token`, le jeton doit figurer dans l'URL.
+    """
+
+    def __init__(self, host: str = LIVE_HOST, port: int = LIVE_PORT,
+                 origins: Optional[set] = None, token: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.origins = set(LIVE_ALLOW_ORIGINS if origins is None else origins)
+        self.token = LIVE_TOKEN if token is None else token
+        # Côté sync (thread appelant publish)
+        self._published: Dict[str, Any] = {}
+        # Côté boucle asyncio
+        self.sections: Dict[str, Any] = {}
+        self.version = 0
+        self.floor = 0  # Version à partir de laquelle le tampon permet une reprise
+        self.events: deque = deque()  # (version, sections modifiées, octets)
+        self.buffered = 0
+        self.clients = 0
+        self._snapshot: Tuple[int, bytes] = (0, b"")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._ready = threading.Event()
+        self._error: Optional[OSError] = None
+
+    def start(self):
+        """Démarre le serveur HTTP dans un thread dédié (lève OSError si le port est pris)."""
+        threading.Thread(target=lambda: asyncio.run(self._serve()), name="live-feed", daemon=True).start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Condition()
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def publish(self, version: int, data: Dict[str, Any], changed: List[str]):
+        """Publie les sections `changed` de `data` (appelé par la sync, hors boucle asyncio)."""
+        sections = {name: {key: data[key] for key in keys if key in data} for name, keys in DASHBOARD_SECTIONS.items()}
+        event = None
+        if self._published and changed:
+            payload = {}
+            for name in changed:
+                ops = json_diff(self._published.get(name, {}), sections[name])
+                payload[name] = {"ops": ops} if len(ops) <= LIVE_MAX_OPS else {"value": sections[name]}
+            event = (version, tuple(changed), _sse("update", version, {"version": version, "sections": payload}))
+        elif self._published:
+            return
+        self._published = sections
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._commit(version, sections, event), self._loop)
+
+    async def _commit(self, version: int, sections: Dict[str, Any], event: Optional[Tuple]):
+        async with self._changed:
+            self.sections = sections
+            self.version = version
+            if event is None:
+                # Première publication (ou reprise): pas de delta possible
+                self.events.clear()
+                self.buffered = 0
+                self.floor = version
+            else:
+                self.events.append(event)
+                self.buffered += len(event[2])
+                while len(self.events) > 1 and (len(self.events) > LIVE_REPLAY_EVENTS or self.buffered > LIVE_REPLAY_BYTES):
+                    old_version, _, raw = self.events.popleft()
+                    self.buffered -= len(raw)
+                    self.floor = old_version
+            self._changed.notify_all()
+
+    def snapshot(self) -> bytes:
+        """Événement `snapshot` de toutes les sections (encodé une fois par version)."""
+        if self._snapshot[0] != self.version or not self._snapshot[1]:
+            sections = {name: {"value": content} for name, content in self.sections.items()}
+            self._snapshot = (self.version, _sse("snapshot", self.version, {"version": self.version, "sections": sections}))
+        return self._snapshot[1]
+
+    def since(self, version: Optional[int]) -> bytes:
+        """Événements à envoyer à un client à jour de `version` (rejoués, regroupés ou snapshot)."""
+        if version is None or not self.floor <= version <= self.version:
+            return self.snapshot()
+        pending = [e for e in self.events if e[0] > version]
+        if len(pending) == 1:
+            return pending[0][2]
+        names = sorted({name for e in pending for name in e[1]})
+        return _sse("update", self.version, {"version": self.version,
+                                             "sections": {name: {"value": self.sections[name]} for name in names}})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Requête HTTP minimale: GET /events (flux SSE), GET /snapshot (JSON), OPTIONS (CORS)."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), LIVE_CLIENT_TIMEOUT)
+            lines = head.decode("latin-1").split("\r\n")
+            method, target = (lines[0].split(" ") + [""])[:2]
+            headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+            path, _, query = target.partition("?")
+            origin = headers.get("origin", "")
+            allowed = "*" if "*" in self.origins else origin if origin in self.origins else None
+            token = urllib.parse.parse_qs(query).get("token", [""])[0]
+            cors = (f"Access-Control-Allow-Origin: {allowed}\r\nVary: Origin\r\n"
+                    f"Access-Control-Allow-Headers: Last-Event-ID\r\n") if allowed else ""
+            if origin and allowed is None:
+                writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+            elif method == "OPTIONS":
+                writer.write(f"HTTP/1.1 204 No Content\r\n{cors}Content-Length: 0\r\n\r\n".encode())
+            elif self.token and not hmac.compare_digest(token.encode(), self.token.encode()):
+                writer.write(f"HTTP/1.1 401 Unauthorized\r\n{cors}Content-Length: 0\r\n\r\n".encode())
+            elif method == "GET" and path == "/events":
+                last_id = headers.get("last-event-id", "")
+                writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                             f"Connection: keep-alive\r\nX-Accel-Buffering: no\r\n{cors}\r\nretry: 2000\n\n".encode())
+                await self._stream(writer, int(last_id) if last_id.isdigit() else None)
+            elif method == "GET" and path == "/snapshot":
+                body = json.dumps({"version": self.version, "sections": self.sections},
+                                  ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n{cors}"
+                             f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await asyncio.wait_for(writer.drain(), LIVE_CLIENT_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, sent: Optional[int]):
+        """Envoie les événements à un client jusqu'à sa déconnexion (keepalive en l'absence de changement)."""
+        self.clients += 1
+        try:
+            while True:
+                async with self._changed:
+                    if sent is not None and sent == self.version:
+                        try:
+                            await asyncio.wait_for(self._changed.wait_for(lambda: self.version != sent), LIVE_KEEPALIVE)
+                        except asyncio.TimeoutError:
+                            pass
+                    if sent is not None and sent == self.version:
+                        payload = b": keepalive\n\n"
+                    else:
+                        payload, sent = self.since(sent), self.version
+                writer.write(payload)
+                # Un client lent bloque ici; les versions suivantes lui seront envoyées regroupées
+                await asyncio.wait_for(writer.drain(), LIVE_CLIENT_TIMEOUT)
+        finally:
+            self.clients -= 1
+
+
+_LIVE_FEED: Optional[LiveFeed] = None
+
+
+def serve_dashboard(push: bool = False, verbose: bool = True, live_interval: float = WATCH_LIVE_INTERVAL,
+                    host: str = LIVE_HOST, port: int = LIVE_PORT):
+    """Mode --watch doublé d'un flux SSE local: chaque section modifiée est poussée aux dashboards connectés."""
+    global _LIVE_FEED
+    _LIVE_FEED = LiveFeed(host, port)
+    _LIVE_FEED.start()
+    if verbose:
+        print(f"📡 Flux live: http://{host}:{port}/events (snapshot: /snapshot)")
+        print(f"   • Origines autorisées: {', '.join(sorted(_LIVE_FEED.origins)) or 'aucune'}"
+              f"{' — jeton requis' if _LIVE_FEED.token else ''}")
+        if "*" in _LIVE_FEED.origins:
+            print("   • ⚠️ Toute page web ouverte dans le navigateur peut lire les données CRM du flux")
+    watch_dashboard(push=push, verbose=verbose, live_interval=live_interval,
+                    fast=LIVE_FAST_COLLECTORS, fast_interval=LIVE_FAST_INTERVAL)
+
+
 # ═══════════════════════════════════════════════════════════════════
 #                         CLI
 # ═══════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Konan Dashboard Sync v3.0")
-    parser.add_argument("--push", "-p", action="store_true", help="Push vers GitHub après sync")
+    parser.add_argument("--push", "-p", action="store_true", help="Publier après sync (git push par défaut)")
+    parser.add_argument("--publish-backend", choices=["git", "directory", "http", "object_store"], default=PUBLISH_BACKEND,
+                        help="Backend de publication")
+    parser.add_argument("--publish-target", default=PUBLISH_TARGET, help="Dossier, URL ou store cible de la publication")
+    parser.add_argument("--publish-interval", type=float, default=PUBLISH_MIN_INTERVAL,
+                        help="Intervalle minimal entre deux publications (s)")
+    parser.add_argument("--publish-extras", action="store_true", default=PUBLISH_GIT_EXTRAS,
+                        help="Backend git: committer aussi les copies .gz/.br et delta.json")
     parser.add_argument("--quiet", "-q", action="store_true", help="Mode silencieux")
+    parser.add_argument("--pretty", action="store_true", help="JSON indenté (debug)")
+    parser.add_argument("--watch", "-w", action="store_true", help="Mode démon: re-sync à chaque modification des sources")
+    parser.add_argument("--interval", type=float, default=WATCH_LIVE_INTERVAL, help="Rafraîchissement MT5/process en mode --watch (s)")
+    parser.add_argument("--serve", action="store_true", help="Mode --watch + flux live SSE des sections modifiées")
+    parser.add_argument("--host", default=LIVE_HOST, help="Adresse d'écoute du flux live")
+    parser.add_argument("--port", type=int, default=LIVE_PORT, help="Port du flux live")
+    parser.add_argument("--live-origin", action="append", default=None, metavar="ORIGINE",
+                        help="Origine autorisée à lire le flux live (répétable; '*' = toutes, déconseillé)")
+    parser.add_argument("--live-token", default=LIVE_TOKEN, help="Jeton exigé dans l'URL du flux live (?token=...)")
+    parser.add_argument("--store", type=Path, default=STORE_FILE, help="Store SQLite local (requêtes indexées, repli JSON)")
+    parser.add_argument("--import-store", action="store_true", help="Réimporter toutes les sources dans le store puis quitter")
+    parser.add_argument("--metrics-file", type=Path, default=METRICS_FILE, help="Exporter les mesures au format texte Prometheus")
+    parser.add_argument("--trace-file", type=Path, default=TRACE_FILE, help="Ajouter une trace JSON-lines par sync")
+    parser.add_argument("--profile", nargs="?", type=Path, const=STATE_DIR / "sync.prof", default=None, metavar="FICHIER",
+                        help="Profiler une sync (cProfile + tracemalloc) et enregistrer les stats")
     args = parser.parse_args()
+    PRETTY_JSON = args.pretty
+    PUBLISH_BACKEND, PUBLISH_TARGET, PUBLISH_MIN_INTERVAL = args.publish_backend, args.publish_target, args.publish_interval
+    PUBLISH_GIT_EXTRAS = args.publish_extras
+    STORE_FILE = args.store
+    METRICS_FILE, TRACE_FILE = args.metrics_file, args.trace_file
+    if args.live_origin:
+        LIVE_ALLOW_ORIGINS = set(args.live_origin)
+    LIVE_TOKEN = args.live_token
     
-    sync_dashboard(push=args.push, verbose=not args.quiet)
+    if args.import_store:
+        store = get_store(ready=False)
+        if store is None:
+            sys.exit("❌ Store SQLite non configuré (--store) ou sqlite3 indisponible")
+        store.import_sources(force=True)
+        print(f"🗄️ Store SQLite importé: {store.filepath}")
+        for table, count in store.counts().items():
+            print(f"   • {table}: {count}")
+    elif args.profile:
+        profile_sync(push=args.push, verbose=not args.quiet, output=args.profile)
+    elif args.serve:
+        serve_dashboard(push=args.push, verbose=not args.quiet, live_interval=args.interval, host=args.host, port=args.port)
+    elif args.watch:
+        watch_dashboard(push=args.push, verbose=not args.quiet, live_interval=args.interval)
+    else:
+        sync_dashboard(push=args.push, verbose=not args.quiet)
 
 
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Fixtures communes: module sync_dashboard importé une fois, chemins redirigés vers tmp_path."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def sd():
+    """Module sync_dashboard (qui réencode stdout/stderr à l'import: flux d'origine restaurés)."""
+    sys.path.insert(0, str(REPO_DIR))
+    stdout, stderr = sys.stdout, sys.stderr
+    try:
+        import sync_dashboard
+    finally:
+        # Les wrappers créés à l'import restent référencés par le module: ils ne ferment pas les flux
+        sync_dashboard._WRAPPED_STREAMS = (sys.stdout, sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+    return sync_dashboard
+
+
+@pytest.fixture
+def dashboard(sd, tmp_path, monkeypatch):
+    """Dossier du dashboard et état local isolés dans tmp_path."""
+    dash = tmp_path / "dashboard"
+    (dash / "public" / "sections").mkdir(parents=True)
+    monkeypatch.setattr(sd, "DASHBOARD_DIR", dash)
+    monkeypatch.setattr(sd, "DATA_FILE", dash / "public" / "data.json")
+    monkeypatch.setattr(sd, "SECTIONS_DIR", dash / "public" / "sections")
+    monkeypatch.setattr(sd, "MANIFEST_FILE", dash / "public" / "manifest.json")
+    monkeypatch.setattr(sd, "DELTA_FILE", dash / "public" / "delta.json")
+    monkeypatch.setattr(sd, "LOGIN_INDEX_FILE", dash / "data" / "login_index.json")
+    monkeypatch.setattr(sd, "STATE_DIR", tmp_path / "state")
+    return dash
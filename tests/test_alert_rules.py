@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Règles d'alertes automatiques: jours écoulés, ordre de précédence et formatage des messages."""
+
+import math
+from datetime import date, datetime
+
+
+def _tables(sd, days, profit_today, deals=()):
+    clients = {"id": [f"c{i}" for i in range(len(days))], "name": [f"Client {i}" for i in range(len(days))],
+               "days_since_contact": list(days)}
+    deals = {key: [d[key] for d in deals] for key in ("id", "client", "title", "stage", "value")}
+    mt5 = {"profit_today": [profit_today]}
+    if sd.np is not None:
+        clients = {k: sd.np.array(v, dtype=float if k == "days_since_contact" else object) for k, v in clients.items()}
+        deals = {k: sd.np.array(v, dtype=float if k == "value" else object) for k, v in deals.items()}
+        mt5 = {k: sd.np.array(v, dtype=float) for k, v in mt5.items()}
+    return {"clients": clients, "deals": deals, "mt5": mt5}
+
+
+def test_days_since_missing_date_is_nan(sd):
+    days = list(sd._days_since([date(2026, 1, 1), None], date(2026, 1, 11)))
+    assert days[0] == 10.0
+    assert math.isnan(days[1])
+
+
+def test_missing_contact_date_raises_no_alert(sd):
+    days = sd._days_since([None], date(2026, 1, 11))
+    alerts = sd.evaluate_alert_rules(_tables(sd, days, 0.0), now=datetime(2026, 1, 11))
+    assert alerts == []
+
+
+def test_mt5_incident_survives_many_high_priority_client_alerts(sd):
+    tables = _tables(sd, [40.0] * (sd.SMART_ALERTS_LIMIT * 2), -500.0)
+    alerts = sd.evaluate_alert_rules(tables, now=datetime(2026, 1, 11))
+    assert len(alerts) == sd.SMART_ALERTS_LIMIT
+    assert alerts[0]["id"] == "auto_mt5_loss"
+    assert all(a["priorite"] == "haute" for a in alerts)
+
+
+def test_non_string_deal_title_is_formatted(sd):
+    deals = [{"id": "d1", "client": "c1", "title": 12345, "stage": "proposal", "value": 5000.0}]
+    alerts = sd.evaluate_alert_rules(_tables(sd, [40.0], -500.0, deals), now=datetime(2026, 1, 11))
+    assert [a["id"] for a in alerts] == ["auto_mt5_loss", "auto_client_c0", "auto_deal_d1"]
+    assert alerts[2]["message"] == "Deal '12345' en attente"
+
+
+def test_unformattable_row_skips_only_that_alert(sd):
+    rules = [dict(sd.ALERT_RULES[1], message="Deal {title:d}"), sd.ALERT_RULES[2]]
+    deals = [{"id": "d1", "client": "c1", "title": "Texte", "stage": "proposal", "value": 5000.0}]
+    alerts = sd.evaluate_alert_rules(_tables(sd, [], -500.0, deals), rules=rules, now=datetime(2026, 1, 11))
+    assert [a["id"] for a in alerts] == ["auto_mt5_loss"]
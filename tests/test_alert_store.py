@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""AlertStore: cycle de vie des alertes automatiques et report dans alertes.json."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+DAY0 = datetime(2026, 1, 1, 9, 0)
+INCIDENT = {"id": "auto_mt5_loss", "type": "incident", "priorite": "haute", "message": "Perte", "auto": True}
+
+
+@pytest.fixture
+def store(sd, tmp_path):
+    alerts_file = tmp_path / "alertes.json"
+    alerts_file.write_text(json.dumps({"alertes": []}), encoding="utf-8")
+    return sd.AlertStore(tmp_path / "alerts_state.json", alerts_file)
+
+
+def _file_alerts(store):
+    return json.loads(store.alerts_file.read_text(encoding="utf-8"))["alertes"]
+
+
+def _update(store, auto, day, resolve_missing=True):
+    manual = [a for a in _file_alerts(store) if not a.get("traitee")]
+    return store.update(manual, auto, resolve_missing=resolve_missing, now=DAY0 + timedelta(days=day))
+
+
+def test_auto_alert_fires_resolves_and_reopens(store):
+    active, delta = _update(store, [INCIDENT], 0)
+    assert [a["id"] for a in active] == ["auto_mt5_loss"]
+    assert len(delta["new"]) == 1
+    assert _file_alerts(store)[0]["traitee"] is False
+
+    active, delta = _update(store, [], 1)
+    assert active == []
+    assert delta["resolved"] == ["auto_mt5_loss"]
+    entry = _file_alerts(store)[0]
+    assert entry["resolue_auto"] is True
+    assert entry["traitee"] is False  # Une résolution automatique n'acquitte pas l'alerte
+
+    active, delta = _update(store, [INCIDENT], 3)
+    assert [a["id"] for a in active] == ["auto_mt5_loss"]
+    assert len(delta["new"]) == 1
+    assert active[0]["first_seen"] == (DAY0 + timedelta(days=3)).isoformat(timespec="seconds")
+    assert "resolue_auto" not in _file_alerts(store)[0]
+
+
+def test_user_acknowledged_alert_stays_hidden(store):
+    _update(store, [INCIDENT], 0)
+    entries = _file_alerts(store)
+    entries[0]["traitee"] = True
+    store.alerts_file.write_text(json.dumps({"alertes": entries}), encoding="utf-8")
+    active, delta = _update(store, [INCIDENT], 1)
+    assert active == []
+    assert delta["resolved"] == ["auto_mt5_loss"]
+    assert _file_alerts(store)[0]["traitee"] is True
+
+
+def test_incomplete_collection_does_not_resolve(store):
+    _update(store, [INCIDENT], 0)
+    active, delta = _update(store, [], 1, resolve_missing=False)
+    assert active == []
+    assert delta["resolved"] == []
+    assert store.records["auto_mt5_loss"]["status"] == "active"
+
+
+def test_priority_change_is_reported(store):
+    _update(store, [INCIDENT], 0)
+    _, delta = _update(store, [dict(INCIDENT, priorite="moyenne")], 1)
+    assert [a["id"] for a in delta["changed"]] == ["auto_mt5_loss"]
+    assert delta["new"] == []
+
+
+def test_resolved_auto_entries_expire_from_alertes_json(sd, store):
+    manual = {"id": "m1", "type": "relance", "priorite": "basse", "message": "Rappeler", "traitee": False}
+    store.alerts_file.write_text(json.dumps({"alertes": [manual]}), encoding="utf-8")
+    _update(store, [INCIDENT], 0)
+    _update(store, [], 1)
+    assert [a["id"] for a in _file_alerts(store)] == ["m1", "auto_mt5_loss"]
+    _update(store, [], 1 + sd.ALERT_RESOLVED_TTL_DAYS - 1)
+    assert len(_file_alerts(store)) == 2
+    _update(store, [], 2 + sd.ALERT_RESOLVED_TTL_DAYS)
+    assert _file_alerts(store) == [manual]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""DealLedger: synchronisation incrémentale, persistance et agrégats par période."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+
+class FakeHistory:
+    """Terminal MT5 simulé: history_deals_get filtre une liste de deals par date."""
+
+    def __init__(self, deals):
+        self.deals = deals
+        self.requests = []
+
+    def history_deals_get(self, date_from, date_to):
+        self.requests.append(date_from)
+        start, end = date_from.timestamp(), date_to.timestamp()
+        return tuple(d for d in self.deals if start <= d.time <= end)
+
+
+def _deal(ticket, when, profit):
+    return SimpleNamespace(ticket=ticket, time=int(when.timestamp()), profit=profit)
+
+
+NOW = datetime(2026, 3, 11, 15, 0)  # Mercredi
+
+
+def test_sync_is_incremental_and_persisted(sd, tmp_path):
+    history = FakeHistory([_deal(1, NOW - timedelta(hours=3), 50.0), _deal(2, NOW - timedelta(hours=2), -20.0)])
+    ledger = sd.DealLedger(tmp_path / "ledger.json")
+    assert ledger.sync(history, NOW) == 2
+
+    history.deals.append(_deal(3, NOW - timedelta(minutes=10), 30.0))
+    assert ledger.sync(history, NOW) == 1
+    # Seconde requête: depuis le dernier deal connu moins le recouvrement
+    assert history.requests[1] == datetime.fromtimestamp(history.deals[1].time - sd.MT5_LEDGER_OVERLAP)
+
+    reloaded = sd.DealLedger(tmp_path / "ledger.json")
+    assert sorted(reloaded.deals) == [1, 2, 3]
+    assert reloaded.last_time == history.deals[2].time
+
+
+def test_deals_outside_week_and_month_are_dropped(sd, tmp_path):
+    old = _deal(1, NOW - timedelta(days=40), 10.0)
+    ledger = sd.DealLedger(tmp_path / "ledger.json")
+    ledger.deals[old.ticket] = sd.MT5Deal(old.time, old.profit)
+    ledger.sync(FakeHistory([]), NOW)
+    assert ledger.deals == {}
+
+
+def test_aggregates_per_period(sd, tmp_path):
+    deals = [
+        _deal(1, NOW - timedelta(days=9), 100.0),   # Mois seulement
+        _deal(2, NOW - timedelta(days=1), -40.0),   # Semaine et mois
+        _deal(3, NOW - timedelta(hours=2), 60.0),   # Jour, semaine et mois
+        _deal(4, NOW - timedelta(hours=1), -30.0),
+    ]
+    ledger = sd.DealLedger(tmp_path / "ledger.json")
+    ledger.sync(FakeHistory(deals), NOW)
+    stats = ledger.aggregates(NOW)
+    assert stats["day"] == {"profit": 30.0, "trades": 2, "wins": 1, "winrate": 50.0, "max_drawdown": 30.0}
+    assert stats["week"]["profit"] == -10.0
+    assert stats["week"]["max_drawdown"] == 40.0
+    assert stats["month"] == {"profit": 90.0, "trades": 4, "wins": 2, "winrate": 50.0, "max_drawdown": 40.0}
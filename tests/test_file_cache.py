@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""FileCache: LRU borné, empreinte de contenu et persistance JSON entre deux exécutions."""
+
+import json
+import os
+from datetime import date
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_unchanged_file_is_served_from_cache(sd, tmp_path):
+    cache = sd.FileCache()
+    path = _write(tmp_path / "a.json", {"v": 1})
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_touched_file_with_same_content_is_not_reparsed(sd, tmp_path):
+    cache = sd.FileCache(hash_content=True)
+    path = _write(tmp_path / "a.json", {"v": 1})
+    first = cache.get(path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(path) is first
+    _write(path, {"v": 2})
+    assert cache.get(path) == {"v": 2}
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_by_entries_and_bytes(sd, tmp_path):
+    cache = sd.FileCache(max_entries=2, max_bytes=10**6)
+    paths = [_write(tmp_path / f"{i}.json", {"i": i}) for i in range(3)]
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # paths[1] devient le moins récent
+    cache.get(paths[2])
+    assert set(cache._entries) == {str(paths[0]), str(paths[2])}
+
+    small = sd.FileCache(max_entries=10, max_bytes=30)
+    big = _write(tmp_path / "big.json", {"x": "y" * 20})
+    small.get(paths[0])
+    small.get(big)
+    assert list(small._entries) == [str(big)]
+
+
+def test_persisted_records_round_trip(sd, tmp_path):
+    source = _write(tmp_path / "clients.json", {"clients": [
+        {"id": 1, "name": "A", "type": "actif", "dernier_contact": "2026-01-05", "ville": "Lyon"},
+        {"id": 2, "name": None, "type": "prospect"},
+    ]})
+    cache = sd.FileCache()
+    records = cache.get(source, sd.parse_clients)
+    cache.save(tmp_path / "cache")
+
+    warm = sd.FileCache()
+    warm.load(tmp_path / "cache")
+    restored = warm.get(source, sd.parse_clients)
+    assert warm.stats()["hits"] == 1
+    assert restored == records
+    assert restored[0].last_contact == date(2026, 1, 5)
+    assert [r.to_dict() for r in restored] == [r.to_dict() for r in records]
+
+
+def test_only_changed_entries_are_rewritten_and_evicted_ones_removed(sd, tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    cache = sd.FileCache(max_entries=2)
+    a, b, c = (_write(tmp_path / f"{n}.json", {"n": n}) for n in "abc")
+    cache.get(a)
+    cache.get(b)
+    cache.save(directory)
+    written = []
+    atomic = sd.write_bytes_atomic
+    monkeypatch.setattr(sd, "write_bytes_atomic", lambda path, raw: written.append(path) or atomic(path, raw))
+    cache.get(c)  # Évince a
+    cache.save(directory)
+    assert written == [cache._entry_file(directory, str(c))]
+    assert not cache._entry_file(directory, str(a)).exists()
+    assert len(list(directory.glob("*.json"))) == 2
+    cache.get(b)
+    cache.save(directory)  # Succès du cache: aucune écriture
+    assert len(written) == 1
+
+
+def test_malformed_or_unknown_entries_are_ignored(sd, tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    (directory / "junk.json").write_text("not json", encoding="utf-8")
+    (directory / "os.json").write_text(json.dumps({"key": "x", "mtime_ns": 1, "size": 1, "digest": None,
+                                                   "value": {"__r": "system", "f": ["id"]}}), encoding="utf-8")
+    (directory / "shape.json").write_text(json.dumps({"key": 3, "mtime_ns": "1", "size": 1, "digest": None,
+                                                      "value": 1}), encoding="utf-8")
+    cache = sd.FileCache()
+    cache.load(directory)
+    assert cache.stats()["entries"] == 0
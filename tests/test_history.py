@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""HistoryStore: ajout borné, agrégation 1m -> 1h -> 1d, rétention et séries publiées."""
+
+from datetime import datetime
+
+import pytest
+
+# Minuit local: les buckets jour sont alignés sur l'heure locale
+T0 = int(datetime(2026, 3, 2).timestamp())
+
+
+@pytest.fixture
+def store(sd, tmp_path):
+    return sd.HistoryStore(tmp_path / "history")
+
+
+def test_append_is_throttled(sd, store):
+    assert store.append({"equity": 1.0}, now=T0)
+    assert not store.append({"equity": 2.0}, now=T0 + sd.HISTORY_MIN_INTERVAL - 1)
+    assert store.append({"equity": 3.0}, now=T0 + sd.HISTORY_MIN_INTERVAL)
+    assert [r[6] for r in store.read("1m")] == [1.0, 3.0]
+    assert not store.append({}, now=T0 + 3600)
+
+
+def test_closed_hours_and_days_are_rolled_up(sd, store):
+    for minute in range(0, 26 * 60, 10):
+        store.append({"equity": float(minute), "balance": 100.0}, now=T0 + minute * 60)
+    metric = store.ids["equity"]
+    hours = [r for r in store.read("1h") if r[1] == metric]
+    # 26 h écrites: les 25 premières heures sont closes
+    assert len(hours) == 25
+    start, _, n, low, high, avg, last = hours[0]
+    assert (start, n, low, high, avg, last) == (T0, 6, 0.0, 50.0, 25.0, 50.0)
+    days = [r for r in store.read("1d") if r[1] == metric]
+    assert len(days) == 1
+    assert days[0][0] == T0 and days[0][2] == 144 and days[0][4] == 1430.0
+
+    # Rechargé depuis le disque: mêmes métriques et dernier point
+    reopened = sd.HistoryStore(store.directory)
+    assert reopened.metrics == store.metrics
+    assert reopened.last_append == store.last_append
+
+
+def test_expired_records_are_dropped(sd, store, monkeypatch):
+    monkeypatch.setattr(sd, "HISTORY_RETENTION", {"1m": 3600, "1h": 86400, "1d": 10 * 86400})
+    for minute in range(0, 4 * 60, 5):
+        store.append({"equity": 1.0}, now=T0 + minute * 60)
+    now = T0 + (4 * 60 - 5) * 60
+    records = store.read("1m")
+    # Purge dès que l'excédent dépasse 10 % de la fenêtre
+    assert records[0][0] >= now - 3600 * 1.1
+    assert store.read("1h")[0][0] == T0  # Niveau supérieur conservé
+
+
+def test_series_downsamples_each_range(sd, store):
+    for minute in range(0, 6 * 60, 1):
+        store.append({"equity": 10.0 if minute < 180 else 20.0}, now=T0 + minute * 60)
+    now = T0 + 6 * 3600
+    series = store.series(now=now)
+    day = series["ranges"]["24h"]
+    assert day["step"] == 900 and len(day["values"]["equity"]) == sd.HISTORY_POINTS
+    points = [v for v in day["values"]["equity"] if v is not None]
+    assert points[0] == 10.0 and points[-1] == 20.0
+    assert day["start"] + sd.HISTORY_POINTS * day["step"] > now - day["step"]
+    assert series["ranges"]["30d"]["values"]["equity"][-1] is not None
+    assert store.series() is series  # Cache jusqu'au prochain point
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""aggregate_performance: reprise à l'offset du filigrane, recalcul si l'historique est réécrit."""
+
+import json
+
+import pytest
+
+
+def _signal(i, status="win"):
+    pnl = {"win": 10.0 + i, "loss": -5.0, "pending": None}[status]
+    return {"id": i, "status": status, "pnl": pnl, "published_at": f"2026-03-{1 + i % 28:02d}T10:00:00",
+            "pair": "EUR/USD", "note": "clôturé é"}
+
+
+def _write(path, signals):
+    path.write_text(json.dumps({"version": 2, "signals": signals}, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def reads(sd, monkeypatch):
+    seen = []
+    monkeypatch.setattr(sd, "record_read", lambda path, nbytes=0, *a, **k: seen.append(nbytes))
+    return seen
+
+
+def _fresh(sd, perf, tmp_path):
+    return sd.aggregate_performance(perf, tmp_path / "fresh_state.json")
+
+
+def test_appended_signals_are_read_from_the_watermark(sd, tmp_path, reads):
+    perf, state = tmp_path / "performance.json", tmp_path / "state.json"
+    signals = [_signal(i, "loss" if i % 3 == 0 else "win") for i in range(300)] + [_signal(300, "pending")]
+    _write(perf, signals)
+    sd.aggregate_performance(perf, state)
+    assert reads[-1] >= perf.stat().st_size
+
+    # Le signal en attente est clôturé et deux signaux sont ajoutés
+    signals[-1] = _signal(300, "win")
+    signals += [_signal(301, "pending"), _signal(302, "loss")]
+    _write(perf, signals)
+    result = sd.aggregate_performance(perf, state)
+    assert reads[-1] < perf.stat().st_size // 10
+    assert json.loads(state.read_text())["watermark"] == 301
+    assert result == _fresh(sd, perf, tmp_path)
+    assert result["stats"]["pending"] == 1
+
+
+def test_rewritten_history_triggers_full_recompute(sd, tmp_path, reads):
+    perf, state = tmp_path / "performance.json", tmp_path / "state.json"
+    signals = [_signal(i) for i in range(50)]
+    _write(perf, signals)
+    sd.aggregate_performance(perf, state)
+
+    signals[-1] = _signal(49, "loss")
+    _write(perf, signals[:-1] + [_signal(50), signals[-1]])
+    result = sd.aggregate_performance(perf, state)
+    assert reads[-1] >= perf.stat().st_size
+    assert result == _fresh(sd, perf, tmp_path)
+    assert result["stats"]["total_signals"] == 51
+
+
+def test_truncated_file_and_missing_signals(sd, tmp_path):
+    perf, state = tmp_path / "performance.json", tmp_path / "state.json"
+    _write(perf, [_signal(i) for i in range(20)])
+    sd.aggregate_performance(perf, state)
+    _write(perf, [_signal(0)])
+    assert sd.aggregate_performance(perf, state)["stats"]["total_signals"] == 1
+
+    perf.write_text(json.dumps({"version": 2}), encoding="utf-8")
+    assert sd.aggregate_performance(perf, state)["stats"]["total_signals"] == 0
+
+    perf.write_text('{"signals": [{"id": 1, "status": "win", "pnl": 1}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        sd.aggregate_performance(perf, state)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""LiveFeed: reprise via Last-Event-ID, regroupement des retards et contrôle d'accès HTTP."""
+
+import asyncio
+import json
+import socket
+
+import pytest
+
+
+def _data(sd, trading, clients):
+    data = {key: {} for keys in sd.DASHBOARD_SECTIONS.values() for key in keys}
+    data.update(trading=trading, clients=clients, deals=[])
+    return data
+
+
+def _events(raw: bytes):
+    """(type, id, payload) de chaque événement SSE encodé."""
+    events = []
+    for block in raw.decode("utf-8").strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], int(fields["id"]), json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def feed(sd, monkeypatch):
+    """Flux sans serveur: chaque publication est appliquée immédiatement, comme par la boucle asyncio."""
+    feed = sd.LiveFeed(port=0)
+    feed._loop = object()
+
+    def run_now(coro, loop):
+        async def commit():
+            feed._changed = asyncio.Condition()
+            await coro
+        asyncio.run(commit())
+
+    monkeypatch.setattr(sd.asyncio, "run_coroutine_threadsafe", run_now)
+    return feed
+
+
+def test_replay_single_event_then_coalesce(sd, feed):
+    feed.publish(1, _data(sd, {"balance": 1}, [{"id": "c1"}]), [])
+    feed.publish(2, _data(sd, {"balance": 2}, [{"id": "c1"}]), ["trading"])
+    feed.publish(3, _data(sd, {"balance": 3}, [{"id": "c2"}]), ["trading", "crm"])
+
+    (kind, version, payload), = _events(feed.since(2))
+    assert (kind, version) == ("update", 3)
+    assert set(payload["sections"]) == {"trading", "crm"}
+    assert "ops" in payload["sections"]["trading"]
+
+    # Client en retard de deux versions: un seul update, contenu complet
+    (kind, version, payload), = _events(feed.since(1))
+    assert (kind, version) == ("update", 3)
+    assert payload["sections"]["trading"] == {"value": {"trading": {"balance": 3}}}
+
+    # Client inconnu ou trop ancien: snapshot
+    for last in (None, 0, 99):
+        (kind, version, payload), = _events(feed.since(last))
+        assert kind == "snapshot" and version == 3
+        assert payload["sections"]["crm"]["value"]["clients"] == [{"id": "c2"}]
+
+
+def test_replay_buffer_is_bounded(sd, feed, monkeypatch):
+    monkeypatch.setattr(sd, "LIVE_REPLAY_EVENTS", 2)
+    feed.publish(1, _data(sd, {"balance": 0}, []), [])
+    for v in range(2, 6):
+        feed.publish(v, _data(sd, {"balance": v}, []), ["trading"])
+    assert [e[0] for e in feed.events] == [4, 5]
+    assert feed.floor == 3
+    assert _events(feed.since(2))[0][0] == "snapshot"
+    assert _events(feed.since(3))[0][0] == "update"
+
+
+def _request(port, path, origin=None):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as s:
+        s.sendall((f"GET {path} HTTP/1.1\r\nHost: x\r\n" + (f"Origin: {origin}\r\n" if origin else "") + "\r\n").encode())
+        s.settimeout(5)
+        head = s.recv(4096).decode("latin-1")
+    return head.split("\r\n")
+
+
+@pytest.fixture
+def server(sd):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    feed = sd.LiveFeed("127.0.0.1", port, origins={"http://localhost:3000"}, token="s3cret")
+    feed.start()
+    return feed
+
+
+def test_unknown_origin_is_refused(server):
+    status, *headers = _request(server.port, "/snapshot?token=s3cret", origin="https://evil.example")
+    assert status == "HTTP/1.1 403 Forbidden"
+    assert not any(h.lower().startswith("access-control-allow-origin") for h in headers)
+
+
+def test_token_is_required(server):
+    assert _request(server.port, "/snapshot", origin="http://localhost:3000")[0] == "HTTP/1.1 401 Unauthorized"
+    status, *headers = _request(server.port, "/snapshot?token=s3cret", origin="http://localhost:3000")
+    assert status == "HTTP/1.1 200 OK"
+    assert "Access-Control-Allow-Origin: http://localhost:3000" in headers
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Index des codes de connexion: expirations naïves, avec décalage ou invalides."""
+
+from datetime import datetime, timezone, timedelta
+
+NOW = datetime(2026, 5, 1, 12, 0)
+
+
+def _code(code, expires, telegram_id=1):
+    return {"code": code, "expires": expires, "telegram_id": telegram_id, "name": "Abonné", "plan": "vip"}
+
+
+def test_offset_aware_expiry_is_compared_in_local_time(sd):
+    aware = (NOW + timedelta(hours=2)).astimezone(timezone.utc).isoformat()
+    expired = (NOW - timedelta(hours=2)).astimezone(timezone.utc).isoformat()
+    index = sd.build_login_index([_code("AAA", aware), _code("BBB", expired)], now=NOW)
+    assert list(index["codes"]) == [sd.hash_login_code("AAA")]
+    assert index["next_expiry"] == aware
+
+
+def test_invalid_or_missing_expiry_is_skipped(sd):
+    codes = [_code("AAA", None), _code("BBB", "bientôt"), _code("CCC", 12), _code("DDD", (NOW + timedelta(days=1)).isoformat())]
+    index = sd.build_login_index(codes, now=NOW)
+    assert list(index["codes"]) == [sd.hash_login_code("DDD")]
+
+
+def test_duplicate_code_keeps_latest_expiry(sd):
+    soon = (NOW + timedelta(hours=1)).isoformat()
+    later = (NOW + timedelta(days=1)).astimezone(timezone.utc).isoformat()
+    index = sd.build_login_index([_code("AAA", later, 1), _code("AAA", soon, 2)], now=NOW)
+    assert index["codes"][sd.hash_login_code("AAA")]["telegram_id"] == 1
+    assert index["next_expiry"] == later
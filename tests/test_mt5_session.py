@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""MT5Session: connexion unique, cache TTL, contrôle de santé et délai de reconnexion (module MT5 simulé)."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeMT5:
+    """Module MetaTrader5 minimal qui compte les appels."""
+
+    def __init__(self, accounts=None, initialize_ok=True):
+        self.accounts = list(accounts or [SimpleNamespace(balance=1000.0)])
+        self.initialize_ok = initialize_ok
+        self.calls = {"initialize": 0, "shutdown": 0, "account_info": 0, "positions_get": 0, "history_deals_get": 0}
+
+    def initialize(self):
+        self.calls["initialize"] += 1
+        return self.initialize_ok
+
+    def shutdown(self):
+        self.calls["shutdown"] += 1
+
+    def last_error(self):
+        return (-10004, "No IPC connection")
+
+    def account_info(self):
+        self.calls["account_info"] += 1
+        return self.accounts.pop(0) if len(self.accounts) > 1 else self.accounts[0]
+
+    def positions_get(self):
+        self.calls["positions_get"] += 1
+        return ()
+
+    def history_deals_get(self, date_from, date_to):
+        self.calls["history_deals_get"] += 1
+        return ()
+
+
+def test_initializes_once_for_successive_requests(sd):
+    mt5 = FakeMT5()
+    session = sd.MT5Session(module=mt5, ttl=0)
+    session.account_info()
+    session.positions_get()
+    session.account_info()
+    assert mt5.calls["initialize"] == 1
+    assert mt5.calls["account_info"] == 2
+    session.close()
+    assert mt5.calls["shutdown"] == 1
+
+
+def test_responses_are_cached_for_ttl(sd):
+    mt5 = FakeMT5()
+    session = sd.MT5Session(module=mt5, ttl=60)
+    first = session.account_info()
+    assert session.account_info() is first
+    assert mt5.calls["account_info"] == 1
+    since = datetime(2026, 1, 1)
+    session.history_deals_get(since, datetime(2026, 1, 2))
+    session.history_deals_get(since, datetime(2026, 1, 3))
+    assert mt5.calls["history_deals_get"] == 1
+
+
+def test_lost_connection_reconnects_once(sd):
+    account = SimpleNamespace(balance=1000.0)
+    mt5 = FakeMT5(accounts=[None, account])
+    session = sd.MT5Session(module=mt5, ttl=0)
+    assert session.account_info() is account
+    assert mt5.calls["initialize"] == 2
+    assert mt5.calls["shutdown"] == 1
+
+
+def test_failed_initialize_backs_off(sd, monkeypatch):
+    mt5 = FakeMT5(initialize_ok=False)
+    session = sd.MT5Session(module=mt5, ttl=0)
+    clock = [100.0]
+    monkeypatch.setattr(sd.time, "monotonic", lambda: clock[0])
+    with pytest.raises(ConnectionError):
+        session.account_info()
+    with pytest.raises(ConnectionError):
+        session.positions_get()
+    assert mt5.calls["initialize"] == 1
+    clock[0] += sd.MT5_RECONNECT_BACKOFF
+    mt5.initialize_ok = True
+    session.positions_get()
+    assert mt5.calls["initialize"] == 2
+    assert session.failures == 0
+
+
+def test_exception_closes_connection(sd):
+    mt5 = FakeMT5()
+
+    def broken():
+        raise RuntimeError("terminal fermé")
+
+    mt5.positions_get = broken
+    session = sd.MT5Session(module=mt5, ttl=0)
+    with pytest.raises(RuntimeError):
+        session.positions_get()
+    assert not session.connected
+    assert mt5.calls["shutdown"] == 1
+
+
+def test_unreachable_terminal_degrades_mt5_collector(sd, monkeypatch):
+    mt5 = FakeMT5(initialize_ok=False)
+    monkeypatch.setattr(sd, "_MT5_SESSION", sd.MT5Session(module=mt5, ttl=0))
+    collector = next(c for c in sd.COLLECTORS if c.name == "mt5")
+    results, status = sd.run_collectors([collector], verbose=False)
+    assert results["mt5"]["status"] == "offline"
+    assert status["mt5"]["status"] == "degraded"
+    assert "No IPC connection" in status["mt5"]["error"]
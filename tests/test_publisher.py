@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Publication: backend git vers un dépôt nu, regroupement par intervalle minimal."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git absent")
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(dashboard, tmp_path):
+    """Dépôt du dashboard relié à un dépôt nu, avec des sorties de sync (.gz, delta.json, section orpheline)."""
+    remote = tmp_path / "remote.git"
+    _git(tmp_path, "init", "-q", "--bare", str(remote))
+    _git(dashboard, "init", "-q")
+    _git(dashboard, "config", "user.email", "sync@example.com")
+    _git(dashboard, "config", "user.name", "sync")
+    _git(dashboard, "remote", "add", "origin", str(remote))
+    _git(dashboard, "commit", "-q", "--allow-empty", "-m", "init")
+    _git(dashboard, "push", "-q", "-u", "origin", "HEAD")
+    public = dashboard / "public"
+    for name in ("data.json", "delta.json", "sections/crm.json", "sections/login_codes.json"):
+        (public / name).write_text('{"v": 1}', encoding="utf-8")
+    (public / "manifest.json").write_text(json.dumps({"version": 1, "sections": {
+        "crm": {"file": "sections/crm.json", "hash": "h", "version": 1, "bytes": 8}}}), encoding="utf-8")
+    (public / "sections" / "crm.json.gz").write_bytes(b"gz")
+    return remote
+
+
+def test_git_backend_pushes_served_json_only(sd, dashboard, repo):
+    backend = sd.GitBackend(dashboard)
+    assert backend.publish(sd.published_files(backend.extras), "sync") is True
+    pushed = _git(repo, "ls-tree", "-r", "--name-only", "HEAD").splitlines()
+    assert pushed == ["public/data.json", "public/manifest.json", "public/sections/crm.json"]
+    # Arbre inchangé: ni commit ni push
+    assert backend.publish(sd.published_files(backend.extras), "sync") is False
+
+
+def test_git_backend_extras(sd, dashboard, repo):
+    backend = sd.GitBackend(dashboard, extras=True)
+    backend.publish(sd.published_files(backend.extras), "sync")
+    pushed = _git(repo, "ls-tree", "-r", "--name-only", "HEAD").splitlines()
+    assert "public/delta.json" in pushed
+    assert "public/sections/crm.json.gz" in pushed
+    assert "public/sections/login_codes.json" not in pushed  # Absente du manifest
+
+
+def test_publisher_batches_snapshots(sd, dashboard, repo, tmp_path):
+    publisher = sd.Publisher(sd.GitBackend(dashboard), min_interval=3600, state_file=tmp_path / "publish.json")
+    publisher.submit()
+    assert publisher.flush(verbose=False) is True
+    (dashboard / "public" / "data.json").write_text('{"v": 2}', encoding="utf-8")
+    publisher.submit()
+    publisher.submit()
+    assert publisher.flush(verbose=False) is False  # Intervalle minimal non écoulé
+    assert sd.Publisher(publisher.backend, state_file=tmp_path / "publish.json").state["pending"] == 2
+    assert publisher.flush(force=True, verbose=False) is True
+    assert _git(repo, "log", "-1", "--format=%s").endswith("(2 snapshot(s))")
+    assert _git(repo, "rev-list", "--count", "HEAD") == "3"
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Records typés: valeurs numériques pour les calculs, JSON d'origine restitué par to_dict."""
+
+import pytest
+
+
+@pytest.mark.parametrize("value, number", [
+    ("100", 100.0), ("1500.50", 1500.5), ("n/a", None), (None, None), (250, 250), (99.9, 99.9),
+])
+def test_deal_value_round_trips_unchanged(sd, value, number):
+    data = {"id": "d1", "title": "Deal", "client": "c1", "value": value, "stage": "proposal", "owner": "x"}
+    deal = sd.Deal.from_dict(data)
+    assert deal.value == number
+    out = deal.to_dict()
+    assert out == data
+    assert type(out["value"]) is type(value)
+
+
+def test_signal_pnl_round_trips_unchanged(sd):
+    data = {"id": 7, "status": "win", "pnl": "12.50", "published_at": "2026-03-01T10:00:00"}
+    signal = sd.Signal.from_dict(data)
+    assert signal.pnl == 12.5
+    assert signal.to_dict() == data
+
+
+def test_string_value_reaches_pipeline_unchanged(sd):
+    deals = sd.decode_records(sd.Deal, [{"id": "d1", "value": "100", "stage": "won"}])
+    assert sum(d.value for d in deals) == 100.0
+    assert deals[0].to_dict()["value"] == "100"
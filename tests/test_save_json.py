@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""save_json: écriture atomique, compacte, sans écriture quand le contenu est inchangé."""
+
+import gzip
+import json
+
+
+def test_compact_write_and_compressed_copy(sd, tmp_path, monkeypatch):
+    monkeypatch.setattr(sd, "PRETTY_JSON", False)
+    path = tmp_path / "out" / "data.json"
+    assert sd.save_json(path, {"é": [1, 2]}, compress=True) is True
+    assert path.read_bytes() == '{"é":[1,2]}'.encode("utf-8")
+    assert gzip.decompress(path.with_name("data.json.gz").read_bytes()) == path.read_bytes()
+    assert not [p for p in path.parent.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_unchanged_payload_is_not_written(sd, tmp_path, monkeypatch):
+    path = tmp_path / "index.json"
+    sd.save_json(path, {"codes": {"a": 1}})
+    writes = []
+    atomic = sd.write_bytes_atomic
+    monkeypatch.setattr(sd, "write_bytes_atomic", lambda p, raw: writes.append(p) or atomic(p, raw))
+    monkeypatch.setattr(sd, "_file_sha256", lambda p: (_ for _ in ()).throw(AssertionError("cible relue")))
+    assert sd.save_json(path, {"codes": {"a": 1}}) is False
+    assert writes == []
+    assert sd.save_json(path, {"codes": {"a": 2}}) is True
+    assert writes == [path]
+
+
+def test_file_changed_by_another_writer_is_compared_by_content(sd, tmp_path):
+    path = tmp_path / "state.json"
+    sd.save_json(path, {"v": 1})
+    path.write_text('{"v":2}', encoding="utf-8")
+    assert sd.save_json(path, {"v": 2}) is False
+    assert sd.save_json(path, {"v": 1}) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == {"v": 1}
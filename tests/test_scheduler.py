@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Ordonnanceur des collecteurs: dépendances, délais, valeurs de repli et collecteurs bloqués."""
+
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(sd, monkeypatch):
+    """Valeurs de repli et collecteurs en retard propres à chaque test."""
+    monkeypatch.setattr(sd, "_LAST_GOOD", {})
+    monkeypatch.setattr(sd, "_IN_FLIGHT", {})
+
+
+def test_dependencies_receive_results(sd):
+    collectors = [
+        sd.Collector("total", lambda a, b: a + b, "total", deps=("a", "b")),
+        sd.Collector("a", lambda: 1, "a"),
+        sd.Collector("b", lambda: 2, "b"),
+    ]
+    results, status = sd.run_collectors(collectors, verbose=False)
+    assert results == {"a": 1, "b": 2, "total": 3}
+    assert {name: st["status"] for name, st in status.items()} == {"a": "ok", "b": "ok", "total": "ok"}
+
+
+def test_unknown_dependency_is_rejected(sd):
+    with pytest.raises(ValueError):
+        sd.run_collectors([sd.Collector("a", lambda x: x, "a", deps=("missing",))], verbose=False)
+
+
+def test_error_falls_back_to_last_good_value(sd):
+    values = iter([{"v": 1}])
+
+    def flaky():
+        return next(values)
+
+    collectors = [sd.Collector("flaky", flaky, "flaky")]
+    sd.run_collectors(collectors, verbose=False)
+    results, status = sd.run_collectors(collectors, verbose=False)
+    assert results["flaky"] == {"v": 1}
+    assert status["flaky"]["status"] == "error"
+    assert status["flaky"]["exception"] == "StopIteration"
+
+
+def test_timeout_serves_fallback_and_hung_collector_is_not_resubmitted(sd):
+    release = threading.Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+        return "late"
+
+    collectors = [sd.Collector("hung", hung, "hung", timeout=0.1, default=lambda: "default"),
+                  sd.Collector("fast", lambda: "fast", "fast")]
+    started = time.monotonic()
+    results, status = sd.run_collectors(collectors, verbose=False)
+    assert time.monotonic() - started < 1.0
+    assert results == {"hung": "default", "fast": "fast"}
+    assert status["hung"]["status"] == "stale"
+
+    results, status = sd.run_collectors(collectors, verbose=False)
+    assert len(calls) == 1
+    assert status["hung"]["status"] == "stale"
+    assert "toujours en cours" in status["hung"]["error"]
+
+    release.set()
+    sd._IN_FLIGHT["hung"][0].result(timeout=5)
+    results, status = sd.run_collectors(collectors, verbose=False)
+    assert len(calls) == 2
+    assert results["hung"] == "late"
+    assert status["hung"]["status"] == "ok"
+
+
+def test_only_reruns_selected_collectors_and_dependents(sd):
+    calls = []
+
+    def make(name, value):
+        def collect(*deps):
+            calls.append(name)
+            return value + sum(deps)
+        return collect
+
+    collectors = [sd.Collector("a", make("a", 1), "a"), sd.Collector("b", make("b", 10), "b"),
+                  sd.Collector("c", make("c", 100), "c", deps=("a",))]
+    sd.run_collectors(collectors, verbose=False)
+    calls.clear()
+    results, status = sd.run_collectors(collectors, verbose=False, only={"a"})
+    assert sorted(calls) == ["a", "c"]
+    assert status["b"]["status"] == "cached"
+    assert results == {"a": 1, "b": 10, "c": 101}
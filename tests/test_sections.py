@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Sortie par sections: JSON Patch, manifest versionné, sections passives et fichiers orphelins."""
+
+import json
+
+import pytest
+
+
+def _apply(doc, ops):
+    """Applique un JSON Patch produit par json_diff (add/remove/replace)."""
+    doc = json.loads(json.dumps(doc))
+    for op in ops:
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        if not parts:
+            doc = op["value"]
+            continue
+        parent = doc
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        key = int(parts[-1]) if isinstance(parent, list) else parts[-1]
+        if op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = op["value"]
+    return doc
+
+
+@pytest.mark.parametrize("old, new", [
+    ({"a": 1, "b": [1, 2]}, {"a": 2, "b": [1, 3], "c": {"x/y": "~"}}),
+    ({"a": [1, 2, 3]}, {"a": [1]}),
+    ([{"id": 1}], [{"id": 1, "v": None}]),
+    ({"a": 1}, "texte"),
+])
+def test_json_diff_round_trip(sd, old, new):
+    assert _apply(old, sd.json_diff(old, new)) == new
+
+
+def test_json_diff_escapes_pointer_and_skips_equal(sd):
+    assert sd.json_diff({"a": 1}, {"a": 1}) == []
+    assert sd.json_diff({}, {"x/y": 1}) == [{"op": "add", "path": "/x~1y", "value": 1}]
+
+
+@pytest.fixture
+def sections(sd, dashboard, monkeypatch):
+    monkeypatch.setattr(sd, "_PREVIOUS_SNAPSHOT", None)
+    monkeypatch.setattr(sd, "_SECTION_HASHES", {})
+    monkeypatch.setattr(sd, "COMPRESS_OUTPUT", False)
+    return sd.SECTIONS_DIR
+
+
+def _data(sd, **values):
+    data = {key: {} for keys in sd.DASHBOARD_SECTIONS.values() for key in keys}
+    data.update(values)
+    return data
+
+
+def _manifest(sd):
+    return json.loads(sd.MANIFEST_FILE.read_text(encoding="utf-8"))
+
+
+def test_manifest_versions_only_changed_sections(sd, sections):
+    first = sd.write_sections(_data(sd, kpis={"pnb": 1}, meta={"duration": 1.0}))
+    assert first["version"] == 1
+    assert set(first["changed"]) == set(sd.DASHBOARD_SECTIONS)
+
+    second = sd.write_sections(_data(sd, kpis={"pnb": 2}, meta={"duration": 2.0}))
+    assert second["version"] == 2
+    assert second["changed"] == ["kpis", "meta"]
+    assert second["sections"]["kpis"]["version"] == 2
+    assert second["sections"]["planning"]["version"] == 1
+    assert json.loads((sections / "meta.json").read_text(encoding="utf-8")) == {"meta": {"duration": 2.0}}
+    delta = json.loads(sd.DELTA_FILE.read_text(encoding="utf-8"))
+    assert (delta["from"], delta["to"]) == (1, 2)
+    assert {"op": "replace", "path": "/kpis/pnb", "value": 2} in delta["ops"]
+
+
+def test_passive_and_volatile_changes_alone_are_a_no_op(sd, sections):
+    sd.write_sections(_data(sd, kpis={"pnb": 1}, meta={"duration": 1.0}))
+    again = sd.write_sections(_data(sd, kpis={"pnb": 1, "last_update": "x"}, meta={"duration": 9.0},
+                                    alerts_delta={"new": [1]}))
+    assert again["changed"] == []
+    assert _manifest(sd)["version"] == 1
+    assert json.loads((sections / "meta.json").read_text(encoding="utf-8")) == {"meta": {"duration": 1.0}}
+
+
+def test_removed_section_files_are_deleted(sd, sections, monkeypatch):
+    sd.write_sections(_data(sd, kpis={"pnb": 1}))
+    (sections / "login_codes.json").write_text("[]", encoding="utf-8")
+    (sections / "login_codes.json.gz").write_bytes(b"gz")
+    reduced = {name: keys for name, keys in sd.DASHBOARD_SECTIONS.items() if name != "planning"}
+    monkeypatch.setattr(sd, "DASHBOARD_SECTIONS", reduced)
+    manifest = sd.write_sections(_data(sd, kpis={"pnb": 1}))
+    assert manifest["version"] == 2
+    assert "planning" not in manifest["sections"]
+    assert sorted(p.name for p in sections.iterdir()) == sorted(f"{name}.json" for name in reduced)
+    published = {p.name for p in sd.published_files(extras=False)}
+    assert "login_codes.json" not in published and "planning.json" not in published
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Mode --watch: détection des sources modifiées et anti-rebond des rafales d'écritures."""
+
+import pytest
+
+
+@pytest.fixture
+def clock(sd, monkeypatch):
+    """Horloge simulée: sleep avance le temps et exécute les écritures prévues à cet instant."""
+    state = {"now": 0.0, "writes": []}
+
+    def sleep(seconds):
+        state["now"] += seconds
+        for at, action in list(state["writes"]):
+            if at <= state["now"]:
+                state["writes"].remove((at, action))
+                action()
+
+    monkeypatch.setattr(sd.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(sd.time, "sleep", sleep)
+    return state
+
+
+@pytest.fixture
+def watcher(sd, tmp_path):
+    sources = {"clients": tmp_path / "clients.json", "deals": tmp_path / "deals.json"}
+    for path in sources.values():
+        path.write_text("[]", encoding="utf-8")
+    collectors = [sd.Collector(name, dict, name, sources=lambda p=path: [p]) for name, path in sources.items()]
+    collectors.append(sd.Collector("crm", dict, "crm", sources=lambda: [sources["clients"], sources["deals"]]))
+    return sd.SourceWatcher(collectors), sources
+
+
+def _append(path, text="x"):
+    def write():
+        path.write_text(path.read_text(encoding="utf-8") + text, encoding="utf-8")
+    return write
+
+
+def test_poll_reports_owners_of_changed_files(watcher):
+    w, sources = watcher
+    assert w.poll() == set()
+    _append(sources["deals"])()
+    assert w.poll() == {"deals", "crm"}
+    assert w.poll() == set()
+    sources["clients"].unlink()
+    assert w.poll() == {"clients", "crm"}
+
+
+def test_burst_is_coalesced_until_quiet(sd, watcher, clock):
+    w, sources = watcher
+    clock["writes"] = [(0.25, _append(sources["clients"])), (0.5, _append(sources["deals"]))]
+    changed = w.wait_quiet({"clients"}, debounce=0.3, max_delay=5.0)
+    assert changed == {"clients", "deals", "crm"}
+    # Dernière écriture à 0.5 s, puis `debounce` sans changement
+    assert 0.8 <= clock["now"] < 1.2
+
+
+def test_continuous_writes_are_capped_by_max_delay(sd, watcher, clock):
+    w, sources = watcher
+    clock["writes"] = [(0.25 * i, _append(sources["clients"], str(i))) for i in range(1, 100)]
+    w.wait_quiet({"clients"}, debounce=0.3, max_delay=2.0)
+    assert 2.0 <= clock["now"] < 2.5